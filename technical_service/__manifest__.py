@@ -27,7 +27,7 @@
     'author': "Technical Service Team",
     'website': "https://www.example.com",
     'category': 'Services/Field Service',
-    'version': '18.0.1.0.0',
+    'version': '18.0.1.7.0',
 
     # Dependencies - Using standard Odoo modules for inheritance
     'depends': [
@@ -49,6 +49,7 @@
         'data/sequence_data.xml',
         'data/technical_service_stages.xml',  # Task 07: Service request stages
         'data/root_team_data.xml',  # Task 06: Root team for hierarchy
+        'data/ir_cron_data.xml',  # Scheduled actions (SLA monitor)
         'views/technical_service_actions.xml',  # Load actions first
         'views/menu_actions.xml',  # Additional menu actions
         'views/missing_actions.xml',  # Missing actions for complete menu structure
@@ -66,6 +67,10 @@
         'views/technical_service_dashboard.xml',
         'views/technical_service_reports.xml',
         'views/technical_service_menu.xml',  # Menu definitions must be loaded first
+        'views/technical_service_stage_interval_views.xml',  # Stage dwell time analytics (after menu)
+        'views/technical_service_request_history_views.xml',  # History over hot + archived tiers (after menu)
+        'views/technical_service_checklist_template_views.xml',  # Work order checklist templates (after menu)
+        'views/technical_service_labor_views.xml',  # Labor ledger reporting (after menu)
         'views/res_config_settings_views.xml',  # Settings configuration (after menu)
         'views/technical_service_menu_override.xml',  # Override maintenance module menus
     ],
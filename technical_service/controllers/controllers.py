@@ -1,22 +1,80 @@
 # -*- coding: utf-8 -*-
-# from odoo import http
 
+from odoo import http, _
+from odoo.exceptions import UserError
+from odoo.http import request
 
-# class TechnicalService(http.Controller):
-#     @http.route('/technical_service/technical_service', auth='public')
-#     def index(self, **kw):
-#         return "Hello, world"
 
-#     @http.route('/technical_service/technical_service/objects', auth='public')
-#     def list(self, **kw):
-#         return http.request.render('technical_service.listing', {
-#             'root': '/technical_service/technical_service',
-#             'objects': http.request.env['technical_service.technical_service'].search([]),
-#         })
+class TechnicalServiceApi(http.Controller):
+    """
+    Service Request Intake API (JSON over HTTP)
 
-#     @http.route('/technical_service/technical_service/objects/<model("technical_service.technical_service"):obj>', auth='public')
-#     def object(self, obj, **kw):
-#         return http.request.render('technical_service.object', {
-#             'object': obj
-#         })
+    POST /technical_service/api/requests
+    Authorization: Bearer <API key>
+    Body: {"requests": [{"idempotency_key": "...", "name": "...", ...}, ...]}
+          (a bare list is accepted too)
 
+    Response: {"results": [{"index", "idempotency_key", "status", "id", "number", "error"}],
+               "created": n, "duplicates": n, "errors": n}
+    Retrying a call with the same idempotency keys returns the requests
+    created the first time (status "duplicate") instead of new ones.
+
+    POST /technical_service/api/sync/pull   {"cursor": "<cursor of the previous pull>"}
+    POST /technical_service/api/sync/push   {"mutations": [...]}
+    Mobile field technician sync, see technical_service.sync.
+    """
+
+    def _get_json_body(self):
+        """Decoded JSON body of the request, None if it is not valid JSON"""
+        try:
+            return request.get_json_data()
+        except ValueError:
+            return None
+
+    def _error_response(self, message, status=400):
+        return request.make_json_response({'error': message}, status=status)
+
+    @http.route('/technical_service/api/requests', type='http', auth='bearer',
+                methods=['POST'], csrf=False, save_session=False)
+    def create_requests(self, **kwargs):
+        data = self._get_json_body()
+        if data is None:
+            return self._error_response(_('Invalid JSON body'))
+        payloads = data.get('requests') if isinstance(data, dict) else data
+
+        try:
+            results = request.env['maintenance.request'].api_create_requests(payloads)
+        except UserError as error:
+            return self._error_response(error.args[0])
+
+        statuses = [result.get('status') for result in results]
+        return request.make_json_response({
+            'results': results,
+            'created': statuses.count('created'),
+            'duplicates': statuses.count('duplicate'),
+            'errors': statuses.count('error'),
+        })
+
+    @http.route('/technical_service/api/sync/pull', type='http', auth='bearer',
+                methods=['POST'], csrf=False, save_session=False)
+    def sync_pull(self, **kwargs):
+        data = self._get_json_body()
+        if not isinstance(data, dict):
+            return self._error_response(_('Invalid JSON body'))
+        try:
+            result = request.env['technical_service.sync'].pull(cursor=data.get('cursor'))
+        except (UserError, ValueError) as error:
+            return self._error_response(str(error.args[0]))
+        return request.make_json_response(result)
+
+    @http.route('/technical_service/api/sync/push', type='http', auth='bearer',
+                methods=['POST'], csrf=False, save_session=False)
+    def sync_push(self, **kwargs):
+        data = self._get_json_body()
+        if not isinstance(data, dict):
+            return self._error_response(_('Invalid JSON body'))
+        try:
+            results = request.env['technical_service.sync'].push(data.get('mutations'))
+        except UserError as error:
+            return self._error_response(error.args[0])
+        return request.make_json_response({'results': results})
@@ -0,0 +1,11 @@
+# -*- coding: utf-8 -*-
+
+from odoo import api, SUPERUSER_ID
+
+
+def migrate(cr, version):
+    """Backfill stage durations and x_stage_entered_at markers of existing history"""
+    if not version:
+        return
+    env = api.Environment(cr, SUPERUSER_ID, {})
+    env['technical_service.request.history']._backfill_stage_durations()
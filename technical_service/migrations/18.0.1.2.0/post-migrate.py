@@ -0,0 +1,11 @@
+# -*- coding: utf-8 -*-
+
+from odoo import api, SUPERUSER_ID
+
+
+def migrate(cr, version):
+    """Build the stage interval fact table from the existing request history"""
+    if not version:
+        return
+    env = api.Environment(cr, SUPERUSER_ID, {})
+    env['technical_service.stage.interval']._rebuild_from_history()
@@ -0,0 +1,8 @@
+# -*- coding: utf-8 -*-
+
+
+def migrate(cr, version):
+    """History descriptions are rendered on read: drop the former stored column"""
+    if not version:
+        return
+    cr.execute("ALTER TABLE technical_service_request_history DROP COLUMN IF EXISTS description")
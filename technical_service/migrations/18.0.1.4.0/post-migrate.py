@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+
+from odoo import api, SUPERUSER_ID
+
+# Record rules are noupdate: apply the indexed-predicate domains explicitly
+RULE_DOMAINS = {
+    'rule_request_yeni_stage_visibility': """[
+                '|',
+                    ('x_stage_code', '!=', 'new'),
+                    ('create_uid', '=', user.id)
+            ]""",
+    'rule_request_senior_technician': """[
+                '|', '|',
+                    ('technician_user_id', '=', user.id),
+                    ('maintenance_team_id.x_member_user_ids', 'in', [user.id]),
+                    ('create_uid', '=', user.id)
+            ]""",
+    'rule_request_team_leader': """[
+                '|',
+                    ('maintenance_team_id.x_leader_user_id', '=', user.id),
+                    ('create_uid', '=', user.id)
+            ]""",
+    'rule_work_order_team_leader': """[
+                ('x_request_id.maintenance_team_id.x_leader_user_id', '=', user.id)
+            ]""",
+}
+
+
+def migrate(cr, version):
+    """Switch request/work order record rules to the denormalized team users"""
+    if not version:
+        return
+    env = api.Environment(cr, SUPERUSER_ID, {})
+    for xmlid, domain in RULE_DOMAINS.items():
+        rule = env.ref(f'technical_service.{xmlid}', raise_if_not_found=False)
+        if rule:
+            rule.domain_force = domain
@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+
+from odoo import api, SUPERUSER_ID
+
+# Thumbnail field -> original photo field of technical_service.work_order
+PHOTO_THUMBNAILS = {
+    'x_before_photo_128': 'x_before_photo',
+    'x_after_photo_128': 'x_after_photo',
+}
+
+
+def migrate(cr, version):
+    """Generate the thumbnails of the work order photos stored before 18.0.1.5.0"""
+    if not version:
+        return
+    env = api.Environment(cr, SUPERUSER_ID, {})
+    WorkOrder = env['technical_service.work_order'].with_context(active_test=False)
+    for thumbnail, photo in PHOTO_THUMBNAILS.items():
+        work_orders = WorkOrder.search([(photo, '!=', False)])
+        env.add_to_compute(WorkOrder._fields[thumbnail], work_orders)
+    WorkOrder.flush_model()
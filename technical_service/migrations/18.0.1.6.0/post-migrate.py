@@ -0,0 +1,11 @@
+# -*- coding: utf-8 -*-
+
+from odoo import api, SUPERUSER_ID
+
+
+def migrate(cr, version):
+    """Build the labor ledger from the time logs recorded before 18.0.1.6.0"""
+    if not version:
+        return
+    env = api.Environment(cr, SUPERUSER_ID, {})
+    env['technical_service.labor.ledger']._rebuild()
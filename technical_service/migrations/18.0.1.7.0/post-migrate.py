@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+
+from odoo import api, SUPERUSER_ID
+
+# Filled by pre-migrate
+CLOSED_TIMERS_TABLE = 'technical_service_migration_closed_timers'
+
+
+def migrate(cr, version):
+    """Refresh the work orders whose duplicate running timers were closed"""
+    if not version:
+        return
+    cr.execute("SELECT to_regclass(%s)", [CLOSED_TIMERS_TABLE])
+    if not cr.fetchone()[0]:
+        return
+    cr.execute(f"SELECT work_order_id FROM {CLOSED_TIMERS_TABLE}")
+    work_order_ids = [row[0] for row in cr.fetchall()]
+    cr.execute(f"DROP TABLE {CLOSED_TIMERS_TABLE}")
+    if not work_order_ids:
+        return
+    env = api.Environment(cr, SUPERUSER_ID, {})
+    WorkOrder = env['technical_service.work_order']
+    env.add_to_compute(WorkOrder._fields['x_actual_duration'], WorkOrder.browse(work_order_ids))
+    WorkOrder.flush_model()
+    env['technical_service.labor.ledger']._refresh(work_order_ids)
@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+
+# Work orders whose duplicate running timers were closed, refreshed in post-migrate
+CLOSED_TIMERS_TABLE = 'technical_service_migration_closed_timers'
+
+
+def migrate(cr, version):
+    """
+    Close duplicate running timers before the unique index on open time logs
+    is created: every open log but the latest of a work order ends when the
+    next one started
+    """
+    if not version:
+        return
+    cr.execute(f"""
+        CREATE TABLE {CLOSED_TIMERS_TABLE} AS
+        WITH ranked AS (
+            SELECT id, start_time,
+                   LEAD(start_time) OVER (PARTITION BY work_order_id ORDER BY start_time, id) AS next_start
+              FROM technical_service_work_order_timelog
+             WHERE end_time IS NULL
+        ), closed AS (
+            UPDATE technical_service_work_order_timelog log
+               SET end_time = ranked.next_start,
+                   duration = EXTRACT(EPOCH FROM ranked.next_start - ranked.start_time) / 3600.0
+              FROM ranked
+             WHERE log.id = ranked.id
+               AND ranked.next_start IS NOT NULL
+         RETURNING log.work_order_id
+        )
+        SELECT DISTINCT work_order_id FROM closed
+    """)
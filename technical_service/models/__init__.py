@@ -3,12 +3,20 @@
 from . import technical_service_organization  # Yeni - İzole teknik organizasyon yapısı
 from . import technical_service_role_sync  # Automatic role and security group sync
 from . import technical_service_location
+from . import technical_service_stage  # Workflow stage codes and registry
 from . import technical_service_request_history  # Task 07: History tracking
+from . import technical_service_request_history_archive  # Archived history tier
+from . import technical_service_stage_interval  # Stage dwell time analytics
 from . import technical_service_request
+from . import technical_service_request_api  # Batch intake API (idempotency keys)
 from . import technical_service_work_order
+from . import technical_service_sync  # Mobile field technician delta sync
+from . import technical_service_checklist_template  # Checklist templates for work orders
+from . import technical_service_labor  # Labor ledger rolled up from time logs
 from . import technical_service_asset
 from . import technical_service_sla
 from . import technical_service_team
+from . import technical_service_workload  # Materialized team/technician workload counters
 from . import technical_service_priority
 from . import technical_service_invoice
 from . import technical_service_satisfaction
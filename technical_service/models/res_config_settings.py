@@ -74,6 +74,12 @@ class ResConfigSettings(models.TransientModel):
        help="Method for assigning service requests to teams"
     )
 
+    technical_service_auto_dispatch = fields.Boolean(
+        string="Auto-dispatch Requests",
+        config_parameter='technical_service.auto_dispatch',
+        help="Assign a technician to new requests of teams with auto assignment (skills, coverage, shift and workload)"
+    )
+
     # Notification Configuration
     technical_service_notify_customer = fields.Boolean(
         string="Notify Customers",
@@ -89,6 +95,13 @@ class ResConfigSettings(models.TransientModel):
         help="Send email notifications to technicians on new assignments"
     )
 
+    technical_service_history_archive_days = fields.Integer(
+        string="Archive History After (days)",
+        default=365,
+        config_parameter='technical_service.history_archive_days',
+        help="Request history older than this is moved to the archive (0 = never)"
+    )
+
     # Report Configuration
     technical_service_include_internal_notes = fields.Boolean(
         string="Include Internal Notes in Reports",
@@ -123,9 +136,11 @@ class ResConfigSettings(models.TransientModel):
             technical_service_track_asset_history=params.get_param('technical_service.track_asset_history', True),
             technical_service_preventive_maintenance_days=int(params.get_param('technical_service.preventive_maintenance_days', 30)),
             technical_service_team_assignment_method=params.get_param('technical_service.team_assignment_method', 'manual'),
+            technical_service_auto_dispatch=params.get_param('technical_service.auto_dispatch', False),
             technical_service_notify_customer=params.get_param('technical_service.notify_customer', True),
             technical_service_notify_technician=params.get_param('technical_service.notify_technician', True),
             technical_service_include_internal_notes=params.get_param('technical_service.include_internal_notes', False),
+            technical_service_history_archive_days=int(params.get_param('technical_service.history_archive_days', 365)),
             stock_move_sms_validation=params.get_param('stock.move_sms_validation', False),
             stock_sms_confirmation_template_id=int(params.get_param('stock.stock_sms_confirmation_template_id', 0)) or False,
         )
@@ -142,8 +157,10 @@ class ResConfigSettings(models.TransientModel):
         params.set_param('technical_service.track_asset_history', self.technical_service_track_asset_history)
         params.set_param('technical_service.preventive_maintenance_days', self.technical_service_preventive_maintenance_days)
         params.set_param('technical_service.team_assignment_method', self.technical_service_team_assignment_method)
+        params.set_param('technical_service.auto_dispatch', self.technical_service_auto_dispatch)
         params.set_param('technical_service.notify_customer', self.technical_service_notify_customer)
         params.set_param('technical_service.notify_technician', self.technical_service_notify_technician)
         params.set_param('technical_service.include_internal_notes', self.technical_service_include_internal_notes)
+        params.set_param('technical_service.history_archive_days', self.technical_service_history_archive_days)
         params.set_param('stock.move_sms_validation', self.stock_move_sms_validation)
         params.set_param('stock.stock_sms_confirmation_template_id', self.stock_sms_confirmation_template_id.id if self.stock_sms_confirmation_template_id else False)
\ No newline at end of file
@@ -90,7 +90,8 @@ class TechnicalServiceAsset(models.Model):
     x_requires_calibration = fields.Boolean(string='Requires Calibration')
     x_last_calibration_date = fields.Date(string='Last Calibration Date')
     x_next_calibration_date = fields.Date(string='Next Calibration Date')
-    x_calibration_certificate = fields.Binary(string='Calibration Certificate')
+    x_calibration_certificate = fields.Binary(string='Calibration Certificate', attachment=True)
+    x_calibration_certificate_filename = fields.Char(string='Calibration Certificate Filename')
 
     # Statistics
     x_total_maintenance_cost = fields.Float(string='Total Maintenance Cost', compute='_compute_maintenance_stats')
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models, fields, api
+
+
+class TechnicalServiceChecklistTemplate(models.Model):
+    """
+    Checklist Template
+    Purpose: Standard checklist items copied into new work orders
+
+    A template applies to a work order when every criterion it sets
+    (work type, asset category, preventive plan) matches; empty criteria
+    match any work order. Items of all applicable templates are copied,
+    in template sequence order, with one batched create for a whole batch
+    of work orders.
+    """
+    _name = 'technical_service.checklist.template'
+    _description = 'Checklist Template'
+    _order = 'sequence, id'
+
+    name = fields.Char(string='Template Name', required=True)
+    sequence = fields.Integer(string='Sequence', default=10)
+    active = fields.Boolean(string='Active', default=True)
+
+    x_work_type = fields.Selection(
+        selection=lambda self: self.env['technical_service.work_order']._fields['x_work_type'].selection,
+        string='Work Type',
+        help='Empty: any work type'
+    )
+    category_id = fields.Many2one(
+        'maintenance.equipment.category',
+        string='Asset Category',
+        help='Empty: any asset category'
+    )
+    preventive_maintenance_id = fields.Many2one(
+        'technical.service.preventive.maintenance',
+        string='Preventive Plan',
+        ondelete='cascade',
+        help='Empty: any preventive plan (or none)'
+    )
+
+    line_ids = fields.One2many(
+        'technical_service.checklist.template.line',
+        'template_id',
+        string='Checklist Items',
+        copy=True
+    )
+    line_count = fields.Integer(string='Items', compute='_compute_line_count')
+
+    @api.depends('line_ids')
+    def _compute_line_count(self):
+        for template in self:
+            template.line_count = len(template.line_ids)
+
+    def _matches(self, work_order):
+        """True if this template applies to work_order"""
+        self.ensure_one()
+        return (
+            (not self.x_work_type or self.x_work_type == work_order.x_work_type)
+            and (not self.category_id or self.category_id == work_order.asset_id.category_id)
+            and (not self.preventive_maintenance_id
+                 or self.preventive_maintenance_id == work_order.preventive_maintenance_id)
+        )
+
+    @api.model
+    def _prepare_checklist_vals(self, work_orders):
+        """
+        Checklist line create values of the templates applicable to each
+        work order (templates and their items are read once)
+        """
+        templates = self.search([('line_ids', '!=', False)])
+        vals_list = []
+        for work_order in work_orders:
+            sequence = 0
+            for template in templates:
+                if not template._matches(work_order):
+                    continue
+                for line in template.line_ids:
+                    sequence += 1
+                    vals_list.append({
+                        'work_order_id': work_order.id,
+                        'sequence': sequence,
+                        'name': line.name,
+                        'description': line.description,
+                    })
+        return vals_list
+
+    @api.model
+    def _instantiate(self, work_orders):
+        """Copy the applicable templates into work_orders with one batched create"""
+        vals_list = self._prepare_checklist_vals(work_orders)
+        if not vals_list:
+            return self.env['technical_service.work_order.checklist']
+        return self.env['technical_service.work_order.checklist'].create(vals_list)
+
+
+class TechnicalServiceChecklistTemplateLine(models.Model):
+    """Items of a checklist template"""
+    _name = 'technical_service.checklist.template.line'
+    _description = 'Checklist Template Item'
+    _order = 'sequence, id'
+
+    template_id = fields.Many2one(
+        'technical_service.checklist.template',
+        string='Template',
+        required=True,
+        ondelete='cascade',
+        index=True
+    )
+    sequence = fields.Integer(string='Sequence', default=10)
+    name = fields.Char(string='Checklist Item', required=True)
+    description = fields.Text(string='Description')
@@ -0,0 +1,258 @@
+# -*- coding: utf-8 -*-
+
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+import pytz
+
+from odoo import models, fields, api, tools, _
+from odoo.tools import split_every
+
+# Key used in cr.precommit.data to collect work orders whose labor changed
+LABOR_DIRTY_KEY = 'technical_service.labor.dirty'
+
+# technical_service.work_order.timelog fields the ledger is computed from
+LABOR_FIELDS = ('work_order_id', 'technician_id', 'start_time', 'end_time')
+
+# Timers running longer than this are reported to the technician
+LABOR_OPEN_TIMER_LIMIT = timedelta(hours=12)
+
+# Work orders refreshed per batch by a full rebuild
+LABOR_REBUILD_BATCH = 1000
+
+
+class TechnicalServiceLaborLedger(models.Model):
+    """
+    Labor Ledger
+    Purpose: Closed time logs rolled up per work order, technician and day
+
+    One row per (work order, technician, day). Logs spanning midnight are
+    split at midnight in the technician's timezone; running timers (no
+    end_time) are not counted until they are closed. Rows are refreshed at
+    the end of every transaction that changed time logs (only the work
+    orders concerned), so utilization reports group the ledger instead of
+    scanning the time logs. Request and team follow the work order.
+
+    _rebuild() recomputes every row (upgrade, data repair).
+    """
+    _name = 'technical_service.labor.ledger'
+    _description = 'Labor Ledger'
+    _order = 'date desc, id desc'
+    _rec_name = 'work_order_id'
+
+    work_order_id = fields.Many2one(
+        'technical_service.work_order',
+        string='Work Order',
+        required=True,
+        ondelete='cascade',
+        index=True
+    )
+    request_id = fields.Many2one(
+        related='work_order_id.x_request_id',
+        string='Service Request',
+        store=True,
+        index=True
+    )
+    team_id = fields.Many2one(
+        related='request_id.maintenance_team_id',
+        string='Team',
+        store=True,
+        index=True
+    )
+    technician_id = fields.Many2one(
+        'hr.employee',
+        string='Technician',
+        required=True,
+        ondelete='cascade',
+        index=True
+    )
+    date = fields.Date(string='Date', required=True, index=True)
+    hours = fields.Float(string='Hours', help='Closed time logged on this day')
+    log_count = fields.Integer(string='Time Logs', help='Closed time logs overlapping this day')
+
+    _sql_constraints = [
+        ('work_order_technician_date_unique', 'UNIQUE(work_order_id, technician_id, date)',
+         'Labor ledger row must be unique per work order, technician and day!'),
+    ]
+
+    def init(self):
+        # Utilization queries filter on a period and group by technician
+        tools.create_index(
+            self.env.cr, 'technical_service_labor_ledger_technician_date_idx',
+            self._table, ['technician_id', 'date'],
+        )
+
+    # ============================================
+    # READ API
+    # ============================================
+
+    @api.model
+    def _get_technician_hours(self, employee_ids, date_from, date_to):
+        """
+        Hours logged by technicians per day (single grouped query)
+        Returns: {employee id: {date: hours}}
+        """
+        hours = defaultdict(dict)
+        for employee, day, total in self.sudo()._read_group(
+            [('technician_id', 'in', list(employee_ids)), ('date', '>=', date_from), ('date', '<=', date_to)],
+            ['technician_id', 'date:day'], ['hours:sum'],
+        ):
+            hours[employee.id][day] = total
+        return hours
+
+    # ============================================
+    # INCREMENTAL MAINTENANCE
+    # ============================================
+
+    @api.model
+    def _mark_dirty(self, work_order_ids):
+        """Schedule a refresh of the given work orders at the end of the transaction"""
+        work_order_ids = {work_order_id for work_order_id in work_order_ids if work_order_id}
+        if not work_order_ids:
+            return
+        data = self.env.cr.precommit.data
+        if LABOR_DIRTY_KEY not in data:
+            data[LABOR_DIRTY_KEY] = set()
+            self.env.cr.precommit.add(self._refresh_dirty)
+        data[LABOR_DIRTY_KEY].update(work_order_ids)
+
+    @api.model
+    def _refresh_dirty(self):
+        """Precommit hook: refresh the work orders marked dirty during the transaction"""
+        dirty = self.env.cr.precommit.data.pop(LABOR_DIRTY_KEY, None)
+        if dirty:
+            self._refresh(dirty)
+
+    @api.model
+    def _rebuild(self):
+        """Recompute the ledger of every work order with time logs"""
+        Ledger = self.sudo()
+        self.env.cr.execute("DELETE FROM technical_service_labor_ledger")
+        Ledger.invalidate_model()
+        self.env.cr.execute("""
+            SELECT DISTINCT work_order_id
+              FROM technical_service_work_order_timelog
+             WHERE end_time IS NOT NULL
+        """)
+        work_order_ids = [row[0] for row in self.env.cr.fetchall()]
+        for batch in split_every(LABOR_REBUILD_BATCH, work_order_ids):
+            self._refresh(batch)
+            # Keep the cache small over months of time logs
+            self.env.invalidate_all()
+        return True
+
+    @api.model
+    def _refresh(self, work_order_ids):
+        """Recompute the ledger rows of the given work orders from their closed time logs"""
+        Ledger = self.sudo()
+        work_order_ids = list(work_order_ids)
+        logs = self.env['technical_service.work_order.timelog'].sudo().search([
+            ('work_order_id', 'in', work_order_ids),
+            ('end_time', '!=', False),
+        ])
+
+        totals = defaultdict(lambda: [0.0, 0])  # (work order, technician, date) -> [hours, logs]
+        for log in logs:
+            tz = pytz.timezone(log.technician_id.tz or 'UTC')
+            for day, hours in self._split_by_day(log.start_time, log.end_time, tz):
+                key = (log.work_order_id.id, log.technician_id.id, day)
+                totals[key][0] += hours
+                totals[key][1] += 1
+
+        stale = Ledger.browse()
+        for row in Ledger.search([('work_order_id', 'in', work_order_ids)]):
+            key = (row.work_order_id.id, row.technician_id.id, row.date)
+            row_totals = totals.pop(key, None)
+            if row_totals is None:
+                stale |= row
+            elif tools.float_compare(row.hours, row_totals[0], precision_digits=6) \
+                    or row.log_count != row_totals[1]:
+                row.write({'hours': row_totals[0], 'log_count': row_totals[1]})
+        stale.unlink()
+        if totals:
+            Ledger.create([{
+                'work_order_id': work_order_id,
+                'technician_id': technician_id,
+                'date': day,
+                'hours': hours,
+                'log_count': log_count,
+            } for (work_order_id, technician_id, day), (hours, log_count) in totals.items()])
+        # Called at precommit: make sure the row updates reach the database
+        Ledger.flush_model()
+
+    @api.model
+    def _split_by_day(self, start, end, tz):
+        """
+        Split a UTC time range at local midnight
+        Yields: (local date, hours) for each day the range overlaps
+        """
+        if not start or not end or end <= start:
+            return
+        current = pytz.utc.localize(start).astimezone(tz)
+        end = pytz.utc.localize(end).astimezone(tz)
+        while current < end:
+            next_day = tz.localize(datetime.combine(current.date() + timedelta(days=1), time.min))
+            chunk_end = min(next_day, end)
+            yield current.date(), (chunk_end - current).total_seconds() / 3600.0
+            current = chunk_end
+
+
+class WorkOrderTimeLogLabor(models.Model):
+    """Keep the labor ledger in step with the time logs and report forgotten timers"""
+    _inherit = 'technical_service.work_order.timelog'
+
+    x_open_timer_notified = fields.Boolean(
+        string='Open Timer Reported',
+        copy=False,
+        readonly=True,
+        help='The technician was asked to close this timer (running longer than 12 hours)'
+    )
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        logs = super().create(vals_list)
+        # Running timers count once they are closed
+        logs.filtered('end_time')._mark_labor_dirty()
+        return logs
+
+    def write(self, vals):
+        if set(LABOR_FIELDS) & set(vals):
+            # Ledger of the old and the new work order is refreshed at commit
+            self._mark_labor_dirty(vals)
+        return super().write(vals)
+
+    def unlink(self):
+        self._mark_labor_dirty()
+        return super().unlink()
+
+    def _mark_labor_dirty(self, vals=None):
+        """Schedule a labor ledger refresh of the work orders of these time logs"""
+        work_order_ids = set(self.work_order_id.ids)
+        if vals and vals.get('work_order_id'):
+            work_order_ids.add(vals['work_order_id'])
+        self.env['technical_service.labor.ledger']._mark_dirty(work_order_ids)
+
+    @api.model
+    def _cron_check_open_timers(self):
+        """
+        Report timers running longer than LABOR_OPEN_TIMER_LIMIT: one to-do
+        activity per work order for its technician, once per timer
+        """
+        open_logs = self.search([
+            ('end_time', '=', False),
+            ('start_time', '<', fields.Datetime.now() - LABOR_OPEN_TIMER_LIMIT),
+            ('x_open_timer_notified', '=', False),
+        ])
+        for work_order, logs in open_logs.grouped('work_order_id').items():
+            work_order.activity_schedule(
+                'mail.mail_activity_data_todo',
+                user_id=work_order.x_technician_user_id.id or work_order.create_uid.id,
+                summary=_('Open timer'),
+                note=_(
+                    'A timer of this work order has been running since %s. '
+                    'Pause or complete the work order, or correct the time log.',
+                    ', '.join(tools.format_datetime(self.env, log.start_time) for log in logs),
+                ),
+            )
+        open_logs.write({'x_open_timer_notified': True})
+        return True
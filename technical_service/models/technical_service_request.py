@@ -1,9 +1,53 @@
 # -*- coding: utf-8 -*-
 
-from odoo import models, fields, api, _
+from odoo import models, fields, api, tools, _, Command
 from odoo.exceptions import ValidationError, UserError, RedirectWarning
+from odoo.osv import expression
 from datetime import datetime, timedelta
 
+from .technical_service_stage import FINAL_STAGE_CODES
+from .technical_service_workload import WORKLOAD_FIELDS
+
+# Time before the resolution deadline a request is considered at risk
+SLA_AT_RISK_DELTA = timedelta(hours=1)
+
+# Priority level by (impact, urgency)
+# Reference: customer_req.md section 7 - Priority Matrix
+PRIORITY_MATRIX = {
+    ('low', 'low'): 'p4',
+    ('low', 'medium'): 'p3',
+    ('low', 'high'): 'p2',
+    ('low', 'critical'): 'p2',
+    ('medium', 'low'): 'p3',
+    ('medium', 'medium'): 'p2',
+    ('medium', 'high'): 'p1',
+    ('medium', 'critical'): 'p1',
+    ('high', 'low'): 'p2',
+    ('high', 'medium'): 'p1',
+    ('high', 'high'): 'p1',
+    ('high', 'critical'): 'p1',
+    ('critical', 'low'): 'p1',
+    ('critical', 'medium'): 'p1',
+    ('critical', 'high'): 'p1',
+    ('critical', 'critical'): 'p1',
+}
+
+# Code of the request number sequence (data/sequence_data.xml)
+REQUEST_SEQUENCE_CODE = 'technical.service.request'
+
+# Skipped requests listed in the notification of a bulk workflow action
+BULK_ACTION_REPORT_LIMIT = 20
+
+# Technical service roles evaluated by the workflow permission computes
+WORKFLOW_ROLE_GROUPS = {
+    'cto': 'technical_service_presentation.group_technical_cto',
+    'dept_manager': 'technical_service_presentation.group_technical_department_manager',
+    'team_leader': 'technical_service_presentation.group_technical_team_leader',
+    'dispatcher': 'technical_service_presentation.group_technical_dispatcher',
+    'senior_technician': 'technical_service_presentation.group_technical_senior_technician',
+    'technician': 'technical_service_presentation.group_technical_technician',
+}
+
 class TechnicalServiceRequest(models.Model):
     """
     Main Service Request Model
@@ -90,7 +134,7 @@ class TechnicalServiceRequest(models.Model):
     # SLA Management
     x_sla_policy_id = fields.Many2one('technical_service.sla', string='SLA Policy')
     x_response_deadline = fields.Datetime(string='Response Deadline', compute='_compute_sla_deadlines', store=True)
-    x_resolution_deadline = fields.Datetime(string='Resolution Deadline', compute='_compute_sla_deadlines', store=True)
+    x_resolution_deadline = fields.Datetime(string='Resolution Deadline', compute='_compute_sla_deadlines', store=True, index=True)
     x_response_time = fields.Float(string='Response Time (Hours)', compute='_compute_response_time', store=True)
     x_resolution_time = fields.Float(string='Resolution Time (Hours)', compute='_compute_resolution_time', store=True)
     x_sla_status = fields.Selection([
@@ -210,6 +254,19 @@ class TechnicalServiceRequest(models.Model):
     x_escalation_level = fields.Integer(string='Escalation Level', default=0)
     x_escalated_to = fields.Many2one('res.users', string='Escalated To')
     x_escalation_date = fields.Datetime(string='Escalation Date')
+    x_stage_entered_at = fields.Datetime(
+        string='Stage Entered At',
+        readonly=True,
+        copy=False,
+        help='When the request entered its current stage (maintained by the request history)'
+    )
+    x_next_escalation_at = fields.Datetime(
+        string='Next Escalation',
+        compute='_compute_next_escalation_at',
+        store=True,
+        index=True,
+        help='When the next SLA escalation rule of the policy is due (used by the SLA monitor)'
+    )
 
     # History Tracking (Task 07)
     x_history_ids = fields.One2many(
@@ -235,6 +292,15 @@ class TechnicalServiceRequest(models.Model):
         help='Stage to return to if cancel request is rejected'
     )
 
+    # Workflow stage code (resolved from the cached stage registry)
+    x_stage_code = fields.Char(
+        string='Stage Code',
+        compute='_compute_stage_code',
+        store=True,
+        index=True,
+        help='Technical code of the current stage (independent of the stage name)'
+    )
+
     # ============================================
     # PERMISSION COMPUTED FIELDS (Task 07 - Phase 1D)
     # ============================================
@@ -311,24 +377,58 @@ class TechnicalServiceRequest(models.Model):
 
     # _compute_validation_warning removed - now handled by wizard
 
+    def _get_workflow_user_context(self, with_teams=False):
+        """
+        Evaluate the current user's roles once for a whole recordset
+        Used by the permission computes instead of per-record has_group calls
+        and team member searches.
+
+        Args:
+            with_teams: Also resolve the teams the user is a member of
+                        (only needed by team-scoped permissions)
+
+        Returns: dict with keys
+            user: res.users record
+            is_superuser: Boolean
+            roles: frozenset of WORKFLOW_ROLE_GROUPS keys the user belongs to
+            team_ids: set of maintenance.team ids (empty unless with_teams)
+            department_id: hr.department id of the user's employee (or False)
+        """
+        user = self.env.user
+        is_superuser = user._is_superuser()
+        roles = frozenset() if is_superuser else frozenset(
+            role for role, group in WORKFLOW_ROLE_GROUPS.items() if user.has_group(group)
+        )
+        employee = user.employee_id
+
+        # Get user's team membership (for team leaders)
+        team_ids = set()
+        if with_teams and employee and 'team_leader' in roles:
+            team_members = self.env['technical_service.team.member'].search([
+                ('employee_id', '=', employee.id)
+            ])
+            team_ids = set(team_members.team_id.ids)
+
+        return {
+            'user': user,
+            'is_superuser': is_superuser,
+            'roles': roles,
+            'team_ids': team_ids,
+            'department_id': employee.department_id.id if employee else False,
+        }
+
     def _default_can_assign_technician(self):
         """Default value for can assign technician permission"""
-        user = self.env.user
-        return user._is_superuser() or \
-               user.has_group('technical_service_presentation.group_technical_cto') or \
-               user.has_group('technical_service_presentation.group_technical_department_manager') or \
-               user.has_group('technical_service_presentation.group_technical_team_leader')
+        user_ctx = self._get_workflow_user_context()
+        return user_ctx['is_superuser'] or bool(user_ctx['roles'] & {'cto', 'dept_manager', 'team_leader'})
 
     @api.depends_context('uid')
     def _compute_can_assign_technician(self):
         """Check if current user can assign technician"""
+        # Allow superusers (admin) and specific roles
+        can_assign = self._default_can_assign_technician()
         for record in self:
-            user = self.env.user
-            # Allow superusers (admin) and specific roles
-            record.x_can_assign_technician = user._is_superuser() or \
-                                              user.has_group('technical_service_presentation.group_technical_cto') or \
-                                              user.has_group('technical_service_presentation.group_technical_department_manager') or \
-                                              user.has_group('technical_service_presentation.group_technical_team_leader')
+            record.x_can_assign_technician = can_assign
 
     @api.depends('stage_id', 'maintenance_team_id')
     def _compute_effective_team(self):
@@ -336,45 +436,40 @@ class TechnicalServiceRequest(models.Model):
         TASK 07 - PHASE 6: Compute effective team for default routing
         If stage is 'Yeni', use default assignment team; otherwise use assigned team
         """
+        stage_new_id = self._get_stage_by_code('new').id
+        default_team = None
         for record in self:
-            if record.stage_id and record.stage_id.name == 'Yeni':
-                # Find default assignment team
-                default_team = self.env['maintenance.team'].search([
-                    ('x_is_default_assignment_team', '=', True)
-                ], limit=1)
+            if record.stage_id and record.stage_id.id == stage_new_id:
+                # Find default assignment team (once for the recordset)
+                if default_team is None:
+                    default_team = self.env['maintenance.team'].search([
+                        ('x_is_default_assignment_team', '=', True)
+                    ], limit=1)
                 record.x_effective_team_id = default_team.id if default_team else record.maintenance_team_id.id
             else:
                 # Use assigned team for other stages
                 record.x_effective_team_id = record.maintenance_team_id.id
 
+    def init(self):
+        # Predicates of the record rules (see security/record_rules.xml)
+        for column in ('maintenance_team_id', 'technician_user_id', 'create_uid'):
+            tools.create_index(self.env.cr, f'maintenance_request_{column}_index', self._table, [column])
+
+    @api.depends('stage_id', 'stage_id.x_code')
+    def _compute_stage_code(self):
+        stage_codes = self.env['maintenance.stage']._get_stage_code_map()
+        for record in self:
+            record.x_stage_code = record.stage_id.x_code or stage_codes.get(record.stage_id.id, False)
+
     @api.depends('x_impact', 'x_urgency')
     def _compute_priority_level(self):
         """
         Compute priority based on impact × urgency matrix
         Reference: customer_req.md section 7 - Priority Matrix
         """
-        priority_matrix = {
-            ('low', 'low'): 'p4',
-            ('low', 'medium'): 'p3',
-            ('low', 'high'): 'p2',
-            ('low', 'critical'): 'p2',
-            ('medium', 'low'): 'p3',
-            ('medium', 'medium'): 'p2',
-            ('medium', 'high'): 'p1',
-            ('medium', 'critical'): 'p1',
-            ('high', 'low'): 'p2',
-            ('high', 'medium'): 'p1',
-            ('high', 'high'): 'p1',
-            ('high', 'critical'): 'p1',
-            ('critical', 'low'): 'p1',
-            ('critical', 'medium'): 'p1',
-            ('critical', 'high'): 'p1',
-            ('critical', 'critical'): 'p1',
-        }
-
         for record in self:
             if record.x_impact and record.x_urgency:
-                record.x_priority_level = priority_matrix.get(
+                record.x_priority_level = PRIORITY_MATRIX.get(
                     (record.x_impact, record.x_urgency), 'p3'
                 )
             else:
@@ -382,21 +477,24 @@ class TechnicalServiceRequest(models.Model):
 
     @api.depends('x_priority_level', 'x_sla_policy_id', 'create_date')
     def _compute_sla_deadlines(self):
-        """Calculate SLA response and resolution deadlines"""
+        """
+        Calculate SLA response and resolution deadlines
+        Deadlines honor the policy's business hours, weekends, holidays and
+        timezone (see technical_service.sla._get_sla_deadlines). SLA lines of
+        all policies are prefetched once for the recordset.
+        """
+        policies = self.x_sla_policy_id
+        lines_by_key = {
+            (line.sla_id.id, line.x_priority): line
+            for line in policies.x_line_ids
+        }
         for record in self:
-            if record.create_date and record.x_sla_policy_id:
-                # Get SLA times based on priority
-                sla_line = record.x_sla_policy_id.x_line_ids.filtered(
-                    lambda l: l.x_priority == record.x_priority_level
-                )
-                if sla_line:
-                    # Calculate deadlines from creation date
-                    create_dt = fields.Datetime.to_datetime(record.create_date)
-                    record.x_response_deadline = create_dt + timedelta(hours=sla_line[0].x_response_time)
-                    record.x_resolution_deadline = create_dt + timedelta(hours=sla_line[0].x_resolution_time)
-                else:
-                    record.x_response_deadline = False
-                    record.x_resolution_deadline = False
+            sla_line = lines_by_key.get((record.x_sla_policy_id.id, record.x_priority_level))
+            if record.create_date and sla_line:
+                # Calculate deadlines from creation date
+                create_dt = fields.Datetime.to_datetime(record.create_date)
+                record.x_response_deadline, record.x_resolution_deadline = \
+                    record.x_sla_policy_id._get_sla_deadlines(sla_line, create_dt)
             else:
                 record.x_response_deadline = False
                 record.x_resolution_deadline = False
@@ -444,15 +542,166 @@ class TechnicalServiceRequest(models.Model):
         for record in self:
             if not record.stage_id or record.stage_id.done:
                 record.x_sla_status = 'on_track'
-            elif record.x_resolution_deadline:
-                if now > record.x_resolution_deadline:
-                    record.x_sla_status = 'breached'
-                elif now > (record.x_resolution_deadline - timedelta(hours=1)):
-                    record.x_sla_status = 'at_risk'
-                else:
-                    record.x_sla_status = 'on_track'
             else:
-                record.x_sla_status = 'on_track'
+                record.x_sla_status = self._get_sla_status(record.x_resolution_deadline, now)
+
+    @api.model
+    def _get_sla_status(self, resolution_deadline, now):
+        """SLA status of an open request with the given resolution deadline at `now`"""
+        if not resolution_deadline:
+            return 'on_track'
+        if now > resolution_deadline:
+            return 'breached'
+        if now > resolution_deadline - SLA_AT_RISK_DELTA:
+            return 'at_risk'
+        return 'on_track'
+
+    @api.depends('create_date', 'x_resolution_deadline', 'x_escalation_level', 'stage_id',
+                 'x_sla_policy_id.x_enable_escalation',
+                 'x_sla_policy_id.x_escalation_rules_ids.x_level',
+                 'x_sla_policy_id.x_escalation_rules_ids.x_trigger_after')
+    def _compute_next_escalation_at(self):
+        """
+        Due date of the next escalation rule (level above the current one)
+        Rules trigger at x_trigger_after % of the time between creation and
+        the resolution deadline.
+        """
+        for record in self:
+            policy = record.x_sla_policy_id
+            if not (policy.x_enable_escalation and record.create_date and record.x_resolution_deadline) \
+                    or record.stage_id.done:
+                record.x_next_escalation_at = False
+                continue
+
+            next_rules = policy.x_escalation_rules_ids.filtered(
+                lambda rule: rule.x_level > record.x_escalation_level
+            ).sorted('x_level')
+            if next_rules:
+                record.x_next_escalation_at = next_rules[0]._get_trigger_datetime(record)
+            else:
+                record.x_next_escalation_at = False
+
+    # ============================================
+    # SLA MONITOR (scheduled action)
+    # ============================================
+
+    @api.model
+    def _cron_sla_monitor(self, batch_size=5000):
+        """
+        Scheduled SLA monitor
+        1. Flip x_sla_status of open requests whose at-risk or breach boundary
+           was crossed since the last run (time passing does not trigger the
+           stored compute by itself)
+        2. Fire due escalation rules, exactly once per level
+
+        Only requests with a resolution deadline in (last run, now + at-risk
+        window] are considered, which the x_resolution_deadline index serves
+        as a range scan. Work is done in batches; the cron is re-triggered
+        while batches remain.
+        """
+        now = fields.Datetime.now()
+        params = self.env['ir.config_parameter'].sudo()
+        last_run = params.get_param('technical_service.sla_monitor_last_run')
+
+        domain = [
+            ('stage_id.done', '=', False),
+            ('x_resolution_deadline', '<=', now + SLA_AT_RISK_DELTA),
+            '|',
+                '&', ('x_resolution_deadline', '<=', now), ('x_sla_status', '!=', 'breached'),
+                '&', ('x_resolution_deadline', '>', now), ('x_sla_status', '=', 'on_track'),
+        ]
+        if last_run:
+            domain.append(('x_resolution_deadline', '>', fields.Datetime.to_datetime(last_run)))
+
+        requests = self.search(domain, limit=batch_size)
+        ids_by_status = {}
+        for request in requests:
+            status = self._get_sla_status(request.x_resolution_deadline, now)
+            if status != request.x_sla_status:
+                ids_by_status.setdefault(status, []).append(request.id)
+        for status, request_ids in ids_by_status.items():
+            self.browse(request_ids).write({'x_sla_status': status})
+
+        escalated = self._process_sla_escalations(now, batch_size)
+
+        remaining = len(requests) == batch_size or escalated == batch_size
+        if remaining:
+            self.env['ir.cron']._notify_progress(done=len(requests) + escalated, remaining=1)
+        else:
+            params.set_param('technical_service.sla_monitor_last_run', fields.Datetime.to_string(now))
+        return True
+
+    @api.model
+    def _process_sla_escalations(self, now, batch_size=5000):
+        """
+        Execute the escalation rules due at `now`
+        Every rule whose level is above the request's escalation level and
+        whose trigger time has passed is executed once, in level order.
+        Returns: number of requests processed
+        """
+        requests = self.search([
+            ('x_next_escalation_at', '<=', now),
+            ('stage_id.done', '=', False),
+        ], limit=batch_size)
+
+        requests_by_rule = {}
+        for request in requests:
+            due_rules = request.x_sla_policy_id.x_escalation_rules_ids.filtered(
+                lambda rule: rule.x_level > request.x_escalation_level
+                and rule._get_trigger_datetime(request) <= now
+            )
+            for rule in due_rules:
+                requests_by_rule.setdefault(rule, self.browse())
+                requests_by_rule[rule] |= request
+
+        for rule in sorted(requests_by_rule, key=lambda rule: rule.x_level):
+            rule.execute_escalation(requests_by_rule[rule])
+
+        return len(requests)
+
+    @api.model
+    def _reserve_request_numbers(self, count):
+        """
+        Reserve `count` request numbers with a single sequence round-trip
+
+        Standard sequences fetch the block with one nextval() over
+        generate_series, no-gap sequences move number_next once for the
+        block (same row lock as ir.sequence). Sequences with date ranges
+        fall back to one call per number.
+
+        Returns: list of `count` formatted numbers (False if the sequence is missing)
+        """
+        if count <= 0:
+            return []
+        sequence = self.env['ir.sequence'].sudo().search([
+            ('code', '=', REQUEST_SEQUENCE_CODE),
+            ('company_id', 'in', [self.env.company.id, False]),
+        ], order='company_id', limit=1)
+        if not sequence:
+            return [False] * count
+        if count == 1 or sequence.use_date_range:
+            return [sequence._next() for _i in range(count)]
+
+        if sequence.implementation == 'standard':
+            self.env.cr.execute(
+                "SELECT nextval(%s) FROM generate_series(1, %s)",
+                ['ir_sequence_%03d' % sequence.id, count]
+            )
+            numbers = sorted(row[0] for row in self.env.cr.fetchall())
+        else:
+            self.env.cr.execute(
+                "SELECT number_next FROM ir_sequence WHERE id = %s FOR UPDATE NOWAIT",
+                [sequence.id]
+            )
+            first = self.env.cr.fetchone()[0]
+            self.env.cr.execute(
+                "UPDATE ir_sequence SET number_next = number_next + %s WHERE id = %s",
+                [sequence.number_increment * count, sequence.id]
+            )
+            sequence.invalidate_recordset(['number_next'])
+            numbers = [first + index * sequence.number_increment for index in range(count)]
+
+        return [sequence.get_next_char(number) for number in numbers]
 
     def _get_default_team_custom(self):
         """Get default team based on x_is_default_assignment_team field"""
@@ -489,41 +738,62 @@ class TechnicalServiceRequest(models.Model):
     # HELPER METHODS FOR STAGE MANAGEMENT (Task 07 - Phase 2)
     # ============================================
 
-    def _get_stage_by_name(self, stage_name):
+    def _get_stage_by_code(self, stage_code):
         """
-        Get stage by name (helper for automatic transitions)
-        Returns: maintenance.stage record or False
+        Get workflow stage by technical code (helper for automatic transitions)
+        Resolved from the cached stage registry, no query is issued.
+        Returns: maintenance.stage record (empty if the stage does not exist)
         """
-        return self.env['maintenance.stage'].search([('name', '=', stage_name)], limit=1)
+        stage_id = self.env['maintenance.stage']._get_stage_registry().get(stage_code)
+        return self.env['maintenance.stage'].browse(stage_id or [])
 
-    def _transition_to_stage(self, new_stage_name, reason=None, is_auto=True):
+    def _transition_to_stage(self, new_stage_code, reason=None, is_auto=True, vals=None):
         """
-        Transition request to new stage and log history
+        Transition requests to a new stage and log history
+        Works on a recordset (bulk workflow actions), see _apply_stage().
         Args:
-            new_stage_name: Name of target stage (e.g., 'Yeni', 'Ekip Atandı')
+            new_stage_code: Technical code of target stage (e.g., 'new', 'team_assigned')
             reason: Optional reason for transition
             is_auto: Whether this is automatic (True) or manual (False)
+            vals: Optional side fields written together with the stage
+                  (e.g. x_assigned_date, x_previous_stage_id, x_pending_cancel)
+        Returns: False if the target stage does not exist, True otherwise
         """
-        self.ensure_one()
-        new_stage = self._get_stage_by_name(new_stage_name)
+        new_stage = self._get_stage_by_code(new_stage_code)
         if not new_stage:
             return False
+        self._apply_stage(new_stage, reason=reason, is_auto=is_auto, vals=vals)
+        return True
 
-        old_stage = self.stage_id
-
-        # Update stage with context flag to skip duplicate history logging
-        self.with_context(skip_stage_history=True).write({'stage_id': new_stage.id})
-
-        # Log history
-        self.env['technical_service.request.history'].log_stage_change(
-            request=self,
-            old_stage=old_stage,
-            new_stage=new_stage,
-            reason=reason,
-            is_auto=is_auto
-        )
+    def _apply_stage(self, new_stage, reason=None, is_auto=True, vals=None):
+        """
+        Move the requests to new_stage with a single low-level write
 
-        return True
+        The stage and the side fields in `vals` are written at once for the
+        whole recordset, bypassing the write() override on purpose: no
+        auto-transition is evaluated and no "manual stage change" is logged.
+        Workload counters are marked dirty and one stage change entry per
+        request is logged in bulk instead.
+        """
+        if not self:
+            return
+        old_stages = {record.id: record.stage_id for record in self}
+        write_vals = dict(vals or {}, stage_id=new_stage.id)
+
+        self._mark_workload_dirty()
+        super(TechnicalServiceRequest, self).write(write_vals)
+
+        History = self.env['technical_service.request.history']
+        History.log_events_bulk([
+            History._prepare_stage_change_vals(
+                request=record,
+                old_stage=old_stages[record.id],
+                new_stage=new_stage,
+                reason=reason,
+                is_auto=is_auto
+            )
+            for record in self
+        ])
 
     # ============================================
     # CREATE/WRITE HOOKS (Task 07 - Phase 2)
@@ -538,53 +808,120 @@ class TechnicalServiceRequest(models.Model):
         3. Auto-transition to 'Yeni' stage (Task 07 - Phase 2A)
         4. Log creation in history
         """
-        for vals in vals_list:
-            # Generate request number
-            if vals.get('x_request_number', 'New') == 'New':
-                vals['x_request_number'] = self.env['ir.sequence'].next_by_code('technical.service.request') or 'REQ-001'
+        stage_new = self._get_stage_by_code('new')
+
+        # Request numbers are reserved as one block for the batch
+        to_number = [vals for vals in vals_list if vals.get('x_request_number', 'New') == 'New']
+        for vals, number in zip(to_number, self._reserve_request_numbers(len(to_number))):
+            vals['x_request_number'] = number or 'REQ-001'
 
+        # Employee of the logged-in user and default team are resolved once per batch
+        employee = default_team = None
+
+        for vals in vals_list:
             # Auto-set employee_id to logged-in user's employee if not specified
             if not vals.get('employee_id'):
-                employee = self.env['hr.employee'].search([
-                    ('user_id', '=', self.env.uid)
-                ], limit=1)
+                if employee is None:
+                    employee = self.env['hr.employee'].search([
+                        ('user_id', '=', self.env.uid)
+                    ], limit=1)
                 if employee:
                     vals['employee_id'] = employee.id
 
             # Auto-set maintenance_team_id to default team if not specified
             if not vals.get('maintenance_team_id'):
-                default_team = self.env['maintenance.team'].search([
-                    ('x_is_default_assignment', '=', True)
-                ], limit=1)
+                if default_team is None:
+                    default_team = self.env['maintenance.team'].search([
+                        ('x_is_default_assignment_team', '=', True)
+                    ], limit=1)
                 if default_team:
                     vals['maintenance_team_id'] = default_team.id
 
             # Task 07 - Phase 2A: Force initial stage to 'Yeni' if not specified
-            if not vals.get('stage_id'):
-                stage_new = self.env['maintenance.stage'].search([('name', '=', 'Yeni')], limit=1)
-                if stage_new:
-                    vals['stage_id'] = stage_new.id
+            if not vals.get('stage_id') and stage_new:
+                vals['stage_id'] = stage_new.id
+
+        # Resolve priority, SLA policy and deadlines before insert
+        self._prepare_sla_values(vals_list)
 
         # Create records
         records = super().create(vals_list)
-
-        # Task 07 - Phase 2A: Log creation in history for each record
-        for record in records:
-            self.env['technical_service.request.history'].create({
-                'request_id': record.id,
-                'event_type': 'stage_change',
-                'new_stage_id': record.stage_id.id,
-                'note': _('Request created'),
-                'is_automatic': True,
-            })
-
-            # Task 07 - Business Logic Fix: Do NOT auto-transition on create()
-            # Team assignment during creation should NOT trigger stage change
-            # Only Dispatcher can move request from 'Yeni' to 'Ekip Atandı'
-            # (This logic remains in write() for when team is changed AFTER creation)
+        records._mark_workload_dirty(created=True)
+
+        # Task 07 - Phase 2A: Log creation in history for all records at once
+        # Task 07 - Business Logic Fix: Do NOT auto-transition on create()
+        # Team assignment during creation should NOT trigger stage change
+        # Only Dispatcher can move request from 'Yeni' to 'Ekip Atandı'
+        # (This logic remains in write() for when team is changed AFTER creation)
+        self.env['technical_service.request.history'].log_events_bulk([{
+            'request_id': record.id,
+            'event_type': 'stage_change',
+            'new_stage_id': record.stage_id.id,
+            'note': _('Request created'),
+            'is_automatic': True,
+        } for record in records])
+
+        # Dispatch the new requests to technicians (batch, when enabled)
+        if self.env['ir.config_parameter'].sudo().get_param('technical_service.auto_dispatch'):
+            self.env['maintenance.team'].sudo().dispatch_requests(records)
 
         return records
 
+    @api.model
+    def _prepare_sla_values(self, vals_list):
+        """
+        Set priority level, SLA policy and deadlines in create values
+        The whole batch is resolved up front (cached policy matcher, one query
+        for the SLA lines of all matched policies) so the values are stored by
+        the INSERT itself instead of a recompute pass after it.
+        Deadlines start at the transaction time, which is the create_date.
+        """
+        defaults = self.default_get(['company_id', 'x_impact', 'x_urgency'])
+        now = self.env.cr.now()
+        SLA = self.env['technical_service.sla'].sudo()
+
+        equipment_ids = {vals['equipment_id'] for vals in vals_list if vals.get('equipment_id')}
+        category_by_equipment = {
+            equipment.id: equipment.category_id.id
+            for equipment in self.env['maintenance.equipment'].sudo().browse(equipment_ids)
+        }
+
+        for vals in vals_list:
+            if 'x_priority_level' not in vals:
+                impact = vals.get('x_impact', defaults.get('x_impact'))
+                urgency = vals.get('x_urgency', defaults.get('x_urgency'))
+                vals['x_priority_level'] = PRIORITY_MATRIX.get((impact, urgency), 'p3')
+            if 'x_sla_policy_id' not in vals:
+                vals['x_sla_policy_id'] = SLA._match_policy_id(
+                    vals.get('company_id', defaults.get('company_id')),
+                    category_id=vals.get('category_id') or category_by_equipment.get(vals.get('equipment_id')),
+                    campus_id=vals.get('x_campus_id') or False,
+                    partner_id=vals.get('partner_id') or False,
+                )
+
+        policy_ids = {vals['x_sla_policy_id'] for vals in vals_list if vals.get('x_sla_policy_id')}
+        lines = self.env['technical_service.sla.line'].sudo().search([('sla_id', 'in', list(policy_ids))])
+        lines_by_key = {(line.sla_id.id, line.x_priority): line for line in lines}
+
+        for vals in vals_list:
+            if 'x_response_deadline' in vals or 'x_resolution_deadline' in vals:
+                continue
+            sla_line = lines_by_key.get((vals.get('x_sla_policy_id'), vals['x_priority_level']))
+            if sla_line:
+                vals['x_response_deadline'], vals['x_resolution_deadline'] = \
+                    sla_line.sla_id._get_sla_deadlines(sla_line, now)
+            else:
+                vals['x_response_deadline'] = False
+                vals['x_resolution_deadline'] = False
+
+    def unlink(self):
+        self._mark_workload_dirty()
+        return super().unlink()
+
+    def _mark_workload_dirty(self, created=False):
+        """Snapshot the workload contributions of these requests before they change (applied at commit)"""
+        self.env['technical_service.workload']._track(self, created=created)
+
     @api.onchange('x_service_category')
     def _onchange_service_category(self):
         """Clear subcategory when main category changes"""
@@ -599,66 +936,104 @@ class TechnicalServiceRequest(models.Model):
         1. Track assignment date
         2. Auto-transition stages based on field changes (Task 07 - Phase 2B)
         3. Log changes in history
+
+        The recordset is handled as a set: old team/technician/stage values are
+        snapshotted in one read, the write is issued once for all records, and
+        the resulting transitions and history rows are applied in batch.
         """
-        result = True
+        if set(WORKLOAD_FIELDS) & set(vals):
+            # Counters of the old and the new team/technician are updated at commit
+            self._mark_workload_dirty()
 
-        for record in self:
-            # Store old values for history tracking
-            old_team = record.maintenance_team_id
-            old_technician = record.technician_user_id
-            old_stage = record.stage_id
+        if not {'maintenance_team_id', 'technician_user_id', 'stage_id'} & set(vals):
+            return super().write(vals)
 
-            # Perform the write
-            result = super(TechnicalServiceRequest, record).write(vals) and result
+        # Store old values for history tracking (single prefetch for the recordset)
+        old_values = {
+            record.id: (record.maintenance_team_id, record.technician_user_id, record.stage_id)
+            for record in self
+        }
+
+        # Perform the write once for the whole recordset
+        result = super().write(vals)
 
-            # Task 07 - Phase 2B: Automatic stage transitions after write
+        History = self.env['technical_service.request.history']
+        stage_new = self._get_stage_by_code('new')
+        stage_team_assigned = self._get_stage_by_code('team_assigned')
 
-            # 1. Team Assignment → 'Ekip Atandı'
+        # Task 07 - Phase 2B: 1. Team Assignment → 'Ekip Atandı'
+        to_assign = self.filtered(
+            lambda r: r.maintenance_team_id
+            and r.maintenance_team_id != old_values[r.id][0]
+            and stage_new and r.stage_id == stage_new
+        )
+        if to_assign:
+            assign_vals = {'x_assigned_date': fields.Datetime.now()}
+            if stage_team_assigned:
+                to_assign._apply_stage(
+                    stage_team_assigned, reason=_('Team assigned'), vals=assign_vals
+                )
+            else:
+                super(TechnicalServiceRequest, to_assign).write(assign_vals)
+        to_assign_ids = set(to_assign.ids)
+
+        history_vals_list = []
+        for record in self:
+            old_team, old_technician, old_stage = old_values[record.id]
             new_team = record.maintenance_team_id
-            if new_team and new_team != old_team and record.stage_id.name == 'Yeni':
-                # Set assigned date when transitioning to 'Ekip Atandı'
-                record.write({'x_assigned_date': fields.Datetime.now()})
-                record._transition_to_stage('Ekip Atandı', reason=_('Team assigned'))
+            new_technician = record.technician_user_id
 
+            if record.id in to_assign_ids:
                 # Log assignment change
-                self.env['technical_service.request.history'].log_assignment(
+                history_vals_list.append(History._prepare_assignment_vals(
                     request=record,
                     old_team=old_team,
                     new_team=new_team,
                     old_tech=old_technician,
-                    new_tech=record.technician_user_id,
+                    new_tech=new_technician,
                     note=_('Team assignment changed')
-                )
+                ))
 
             # 2. Technician Assignment (log only, no stage change)
-            new_technician = record.technician_user_id
             if new_technician != old_technician:
-                self.env['technical_service.request.history'].log_assignment(
+                history_vals_list.append(History._prepare_assignment_vals(
                     request=record,
                     old_team=old_team if old_team != new_team else False,
                     new_team=new_team if old_team != new_team else False,
                     old_tech=old_technician,
                     new_tech=new_technician,
                     note=_('Technician assignment changed')
-                )
+                ))
 
             # 3. Manual stage change (log if stage changed manually)
+            # Transitions made by _transition_to_stage are logged there
             if 'stage_id' in vals and record.stage_id != old_stage:
-                # Check if this is a manual change (not from _transition_to_stage)
-                # If it's manual, it won't have been logged yet
-                if not self.env.context.get('skip_stage_history'):
-                    self.env['technical_service.request.history'].log_stage_change(
-                        request=record,
-                        old_stage=old_stage,
-                        new_stage=record.stage_id,
-                        reason=_('Manual stage change'),
-                        is_auto=False
-                    )
+                history_vals_list.append(History._prepare_stage_change_vals(
+                    request=record,
+                    old_stage=old_stage,
+                    new_stage=record.stage_id,
+                    reason=_('Manual stage change'),
+                    is_auto=False
+                ))
+
+        History.log_events_bulk(history_vals_list)
 
         return result
 
     # Warning system - only informative, doesn't block save
 
+    def action_view_full_history(self):
+        """Open the full history of the request, including archived entries"""
+        self.ensure_one()
+        return {
+            'type': 'ir.actions.act_window',
+            'name': _('History'),
+            'res_model': 'technical_service.request.history.report',
+            'view_mode': 'list,pivot',
+            'domain': [('request_id', '=', self.id)],
+            'context': {'create': False},
+        }
+
     def action_create_work_order(self):
         """Create work order from request"""
         self.ensure_one()
@@ -695,183 +1070,268 @@ class TechnicalServiceRequest(models.Model):
 
     def action_put_on_hold(self):
         """
-        Open wizard to put request on hold
+        Open wizard to put request(s) on hold
         Task 07 - Phase 3A
         """
-        self.ensure_one()
-        return {
-            'type': 'ir.actions.act_window',
-            'name': _('Put Request On Hold'),
-            'res_model': 'technical_service.request.put.on.hold.wizard',
-            'view_mode': 'form',
-            'target': 'new',
-            'context': {'default_request_id': self.id}
-        }
+        return self._action_open_workflow_wizard(
+            _('Put Request On Hold'), 'technical_service.request.put.on.hold.wizard'
+        )
 
     def action_send_for_approval(self):
         """
-        Send request for approval (manual button)
+        Send request(s) for approval (manual button, list view bulk action)
         Task 07 - Phase 3B
         Transitions from 'Devam Ediyor' to 'Onayda'
         """
-        self.ensure_one()
-
-        # Check permission
-        if not self.x_can_send_for_approval:
-            raise UserError(_('You do not have permission to send this request for approval'))
-
-        # Check if in correct stage
-        if self.stage_id.name != 'Devam Ediyor':
-            raise UserError(_('Request must be in "Devam Ediyor" stage to send for approval'))
+        requests, errors = self._check_workflow_action('send_for_approval')
+        requests._send_for_approval()
+        if len(self) == 1:
+            return True
+        return self._workflow_action_notification(_('Send for Approval'), requests, errors)
 
-        # Check if all work orders are completed
-        if self.x_work_order_ids:
-            incomplete_wos = self.x_work_order_ids.filtered(
-                lambda wo: wo.x_work_status != 'completed'
-            )
-            if incomplete_wos:
-                raise UserError(_('All work orders must be completed before sending for approval. '
-                                 'Incomplete work orders: %s', ', '.join(incomplete_wos.mapped('name'))))
+    def _send_for_approval(self):
+        """Transition validated requests to 'Onayda' and notify department managers"""
+        if not self:
+            return
 
         # Transition to 'Onayda'
         self._transition_to_stage(
-            'Onayda',
+            'pending_approval',
             reason=_('Sent for approval by %s', self.env.user.name),
             is_auto=False
         )
 
-        # Notify department manager
-        if self.x_department_id and self.x_department_id.manager_id:
-            self.activity_schedule(
+        # Notify department manager (one activity batch per manager)
+        for manager, requests in self.grouped(lambda r: r.x_department_id.manager_id).items():
+            if not manager:
+                continue
+            requests.activity_schedule(
                 activity_type_xmlid='mail.mail_activity_data_todo',
                 summary=_('Approve Service Request'),
                 note=_('Please review and approve/reject this service request.'),
-                user_id=self.x_department_id.manager_id.user_id.id
-            )
-
-            self.message_post(
-                body=_('Request sent for approval to %s', self.x_department_id.manager_id.name),
-                message_type='notification',
-                subtype_xmlid='mail.mt_note',
-                partner_ids=[self.x_department_id.manager_id.user_id.partner_id.id]
+                user_id=manager.user_id.id
             )
-
-        return True
+            for request in requests:
+                request.message_post(
+                    body=_('Request sent for approval to %s', manager.name),
+                    message_type='notification',
+                    subtype_xmlid='mail.mt_note',
+                    partner_ids=[manager.user_id.partner_id.id]
+                )
 
     def action_approve(self):
         """
-        Approve request (manual button)
+        Approve request(s) (manual button, list view bulk action)
         Task 07 - Phase 3C & Phase 4B
         - If x_pending_cancel=True: Approve cancellation → 'İptal Edildi'
         - Otherwise: Approve completion → 'Tamamlandı'
         """
-        self.ensure_one()
-
-        # Check permission
-        if not self.x_can_approve:
-            raise UserError(_('You do not have permission to approve this request'))
-
-        # Check if in correct stage
-        if self.stage_id.name != 'Onayda':
-            raise UserError(_('Request must be in "Pending Approval" stage to approve'))
+        requests, errors = self._check_workflow_action('approve')
+        requests._approve()
+        if len(self) == 1:
+            return True
+        return self._workflow_action_notification(_('Approve'), requests, errors)
+
+    def _approve(self):
+        """Approve validated requests: cancellations and completions are applied in bulk"""
+        if not self:
+            return
+        History = self.env['technical_service.request.history']
 
         # Phase 4B: Check if this is a cancel approval or completion approval
-        if self.x_pending_cancel:
-            # CANCEL APPROVAL: Transition to 'İptal Edildi'
-            self._transition_to_stage(
-                'İptal Edildi',
-                reason=self.x_cancel_reason or _('Cancelled (approved by %s)', self.env.user.name),
-                is_auto=False
-            )
+        cancel_requests = self.filtered('x_pending_cancel')
+        complete_requests = self - cancel_requests
+        cancel_reasons = {request.id: request.x_cancel_reason for request in cancel_requests}
+
+        with History.buffered():
+            # CANCEL APPROVAL: Transition to 'İptal Edildi' and clear cancel tracking fields
+            for cancel_reason, requests in cancel_requests.grouped(lambda r: r.x_cancel_reason).items():
+                requests._transition_to_stage(
+                    'cancelled',
+                    reason=cancel_reason or _('Cancelled (approved by %s)', self.env.user.name),
+                    is_auto=False,
+                    vals={
+                        'x_pending_cancel': False,
+                        'x_cancel_reason': False,
+                        'x_previous_stage_id': False,
+                    }
+                )
 
             # Cancel all pending work orders
-            pending_wos = self.x_work_order_ids.filtered(
+            cancel_requests.x_work_order_ids.filtered(
                 lambda wo: wo.x_work_status in ['pending', 'in_progress', 'paused']
-            )
-            for wo in pending_wos:
-                wo.write({'x_work_status': 'cancelled'})
-
-            # Log cancellation approval
-            self.env['technical_service.request.history'].log_approval(
-                request=self,
-                status='cancelled',
-                reason=self.x_cancel_reason
-            )
-
-            # Notify requester
-            if self.create_uid:
-                self.message_post(
-                    body=_('✓ Your cancellation request has been approved by %s.<br/>Request cancelled.',
-                           self.env.user.name),
-                    message_type='notification',
-                    subtype_xmlid='mail.mt_note',
-                    partner_ids=[self.create_uid.partner_id.id]
-                )
-
-            # Clear cancel tracking fields
-            self.write({
-                'x_pending_cancel': False,
-                'x_cancel_reason': False,
-                'x_previous_stage_id': False,
-            })
+            ).write({'x_work_status': 'cancelled'})
 
-        else:
             # COMPLETION APPROVAL: Transition to 'Tamamlandı'
-            self._transition_to_stage(
-                'Tamamlandı',
+            complete_requests._transition_to_stage(
+                'completed',
                 reason=_('Approved by %s', self.env.user.name),
                 is_auto=False
             )
 
-            # Log approval
-            self.env['technical_service.request.history'].log_approval(
-                request=self,
-                status='approved',
-                reason=None
+            # Log approvals
+            History.log_events_bulk(
+                [
+                    History._prepare_approval_vals(request, 'cancelled', reason=cancel_reasons[request.id])
+                    for request in cancel_requests
+                ] + [
+                    History._prepare_approval_vals(request, 'approved', reason=None)
+                    for request in complete_requests
+                ]
             )
 
-            # Notify requester
-            if self.create_uid:
-                self.message_post(
-                    body=_('✓ Your service request has been approved and completed.'),
-                    message_type='notification',
-                    subtype_xmlid='mail.mt_note',
-                    partner_ids=[self.create_uid.partner_id.id]
-                )
+        # Notify requester
+        for request in self.filtered('create_uid'):
+            if request in cancel_requests:
+                body = _('✓ Your cancellation request has been approved by %s.<br/>Request cancelled.',
+                         self.env.user.name)
+            else:
+                body = _('✓ Your service request has been approved and completed.')
+            request.message_post(
+                body=body,
+                message_type='notification',
+                subtype_xmlid='mail.mt_note',
+                partner_ids=[request.create_uid.partner_id.id]
+            )
 
         # Close any pending activities
         self.activity_ids.action_done()
 
-        return True
-
     def action_reject(self):
         """
-        Open wizard to reject request
+        Open wizard to reject request(s)
         Task 07 - Phase 3D
         """
-        self.ensure_one()
-        return {
-            'type': 'ir.actions.act_window',
-            'name': _('Reject Request'),
-            'res_model': 'technical_service.request.reject.wizard',
-            'view_mode': 'form',
-            'target': 'new',
-            'context': {'default_request_id': self.id}
-        }
+        return self._action_open_workflow_wizard(
+            _('Reject Request'), 'technical_service.request.reject.wizard'
+        )
 
     def action_cancel(self):
         """
-        Open wizard to cancel request
+        Open wizard to cancel request(s)
         Task 07 - Phase 3E
         """
-        self.ensure_one()
+        return self._action_open_workflow_wizard(
+            _('Cancel Request'), 'technical_service.request.cancel.wizard'
+        )
+
+    # ============================================
+    # BULK WORKFLOW ACTIONS
+    # ============================================
+
+    def _action_open_workflow_wizard(self, name, wizard_model):
+        """Open a workflow wizard for the request (form) or the selected requests (list)"""
+        if not self:
+            raise UserError(_('No request specified'))
+        context = {'default_request_id': self[:1].id}
+        if len(self) > 1:
+            context['default_request_ids'] = [Command.set(self.ids)]
         return {
             'type': 'ir.actions.act_window',
-            'name': _('Cancel Request'),
-            'res_model': 'technical_service.request.cancel.wizard',
+            'name': name,
+            'res_model': wizard_model,
             'view_mode': 'form',
             'target': 'new',
-            'context': {'default_request_id': self.id}
+            'context': context,
+        }
+
+    def _get_workflow_action_errors(self, action):
+        """
+        Validate a workflow action for the whole recordset in one pass
+        (permission fields are computed in batch)
+
+        Args:
+            action: 'put_on_hold', 'send_for_approval', 'approve', 'reject' or 'cancel'
+
+        Returns:
+            {request id: error message} of the requests the action cannot be applied to
+        """
+        errors = {}
+        stage_codes = self.env['maintenance.stage']._get_stage_code_map()
+        for request in self:
+            stage_code = stage_codes.get(request.stage_id.id)
+            if action == 'put_on_hold':
+                if not request.x_can_put_on_hold:
+                    errors[request.id] = _(
+                        'You do not have permission to put this request on hold.\n'
+                        'Only Team Leaders, Senior Technicians, and Technicians can perform this action.'
+                    )
+            elif action == 'send_for_approval':
+                incomplete_wos = request.x_work_order_ids.filtered(
+                    lambda wo: wo.x_work_status != 'completed'
+                )
+                if not request.x_can_send_for_approval:
+                    errors[request.id] = _('You do not have permission to send this request for approval')
+                elif stage_code != 'in_progress':
+                    errors[request.id] = _('Request must be in "Devam Ediyor" stage to send for approval')
+                elif incomplete_wos:
+                    errors[request.id] = _('All work orders must be completed before sending for approval. '
+                                           'Incomplete work orders: %s', ', '.join(incomplete_wos.mapped('name')))
+            elif action == 'approve':
+                if not request.x_can_approve:
+                    errors[request.id] = _('You do not have permission to approve this request')
+                elif stage_code != 'pending_approval':
+                    errors[request.id] = _('Request must be in "Pending Approval" stage to approve')
+            elif action == 'reject':
+                if not request.x_can_reject:
+                    errors[request.id] = _('You do not have permission to reject this request')
+            elif action == 'cancel':
+                if not request.x_can_cancel:
+                    errors[request.id] = _(
+                        'You do not have permission to cancel this request.\n'
+                        'Requests can only be cancelled when in "Yeni" (New) or "Ekip Atandı" (Team Assigned) stages.'
+                    )
+        return errors
+
+    def _check_workflow_action(self, action):
+        """
+        Split the recordset into the requests a workflow action can be applied to
+        and the failing ones. A single request (form button) raises instead.
+
+        Returns:
+            (valid requests, {request id: error message})
+        """
+        errors = self._get_workflow_action_errors(action)
+        if len(self) == 1 and errors:
+            raise UserError(errors[self.id])
+        return self.filtered(lambda r: r.id not in errors), errors
+
+    def _workflow_action_notification(self, title, done, errors, close=False):
+        """
+        Client notification summarizing a bulk workflow action: number of
+        processed requests and the reason each skipped request failed
+
+        Args:
+            title: Notification title
+            done: Processed requests
+            errors: {request id: error message} of the skipped requests
+            close: Close the wizard dialog (True) or reload the list view (False)
+        """
+        failed = self.browse(list(errors))
+        lines = [_('%s request(s) processed.', len(done))]
+        if failed:
+            lines.append(_('%s request(s) skipped:', len(failed)))
+            lines += [
+                f"{request.display_name}: {errors[request.id]}"
+                for request in failed[:BULK_ACTION_REPORT_LIMIT]
+            ]
+            if len(failed) > BULK_ACTION_REPORT_LIMIT:
+                lines.append(_('... and %s more', len(failed) - BULK_ACTION_REPORT_LIMIT))
+
+        if close:
+            next_action = {'type': 'ir.actions.act_window_close'}
+        else:
+            next_action = {'type': 'ir.actions.client', 'tag': 'soft_reload'}
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': title,
+                'message': '\n'.join(lines),
+                'type': 'warning' if failed else 'success',
+                'sticky': bool(failed),
+                'next': next_action,
+            }
         }
 
     @api.depends('create_uid', 'employee_id')
@@ -900,129 +1360,96 @@ class TechnicalServiceRequest(models.Model):
         - Technician: Can update work orders they're assigned to
         - Standard User: Can only cancel their own requests (if not started)
         """
-        for record in self:
-            user = self.env.user
-
-            # Admin has all permissions
-            if user._is_superuser():
-                record.x_can_put_on_hold = True
-                record.x_can_send_for_approval = True
-                record.x_can_approve = True
-                record.x_can_reject = True
-                record.x_can_cancel = True
-                record.x_can_create_work_order = True
-                continue
+        permission_fields = (
+            'x_can_put_on_hold', 'x_can_send_for_approval', 'x_can_approve',
+            'x_can_reject', 'x_can_cancel', 'x_can_create_work_order',
+        )
 
-            # Get user roles
-            is_cto = user.has_group('technical_service_presentation.group_technical_cto')
-            is_dept_manager = user.has_group('technical_service_presentation.group_technical_department_manager')
-            is_team_leader = user.has_group('technical_service_presentation.group_technical_team_leader')
-            is_dispatcher = user.has_group('technical_service_presentation.group_technical_dispatcher')
-            is_senior_technician = user.has_group('technical_service_presentation.group_technical_senior_technician')
-            is_technician = user.has_group('technical_service_presentation.group_technical_technician')
+        # Roles and team membership are evaluated once for the whole recordset
+        user_ctx = self._get_workflow_user_context(with_teams=True)
+        user = user_ctx['user']
+
+        # Admin has all permissions
+        if user_ctx['is_superuser']:
+            self.update(dict.fromkeys(permission_fields, True))
+            return
+
+        roles = user_ctx['roles']
+        user_team_ids = user_ctx['team_ids']
+        user_department_id = user_ctx['department_id']
+        is_cto = 'cto' in roles
+        is_dept_manager = 'dept_manager' in roles
+        is_team_leader = 'team_leader' in roles
+        is_dispatcher = 'dispatcher' in roles
+        is_senior_technician = 'senior_technician' in roles
+        is_technician = 'technician' in roles
+        is_manager = is_cto or is_dept_manager or is_dispatcher
+
+        stage_codes = self.env['maintenance.stage']._get_stage_code_map()
+        for record in self:
             is_owner = record.create_uid == user
-
-            # Get user's team membership (for team leaders)
-            user_team_ids = []
-            if user.employee_id:
-                team_members = self.env['technical_service.team.member'].search([
-                    ('employee_id', '=', user.employee_id.id)
-                ])
-                user_team_ids = team_members.mapped('team_id').ids
+            is_team_lead_of_record = is_team_leader and record.maintenance_team_id.id in user_team_ids
+            is_assigned_technician = record.technician_user_id == user
+            is_department_manager_of_record = is_dept_manager and bool(record.x_department_id) \
+                and record.x_department_id.id == user_department_id
 
             # Get stage info
-            stage_name = record.stage_id.name if record.stage_id else ''
-            is_new = stage_name == 'Yeni'
-            is_team_assigned = stage_name == 'Ekip Atandı'
-            is_on_hold = stage_name == 'Beklemede'
-            is_wo_created = stage_name == 'İş Emri Oluşturuldu'
-            is_in_progress = stage_name == 'Devam Ediyor'
-            is_pending_approval = stage_name == 'Onayda'
-            is_completed = stage_name == 'Tamamlandı'
-            is_rejected = stage_name == 'Reddedildi'
-            is_cancelled = stage_name == 'İptal Edildi'
-
-            # Initialize all to False
-            record.x_can_put_on_hold = False
-            record.x_can_send_for_approval = False
-            record.x_can_approve = False
-            record.x_can_reject = False
-            record.x_can_cancel = False
-            record.x_can_create_work_order = False
+            stage_code = stage_codes.get(record.stage_id.id)
+            is_new = stage_code == 'new'
+            is_team_assigned = stage_code == 'team_assigned'
+            is_wo_created = stage_code == 'work_order_created'
+            is_in_progress = stage_code == 'in_progress'
+            is_pending_approval = stage_code == 'pending_approval'
+            is_closed = stage_code in ('completed', 'rejected', 'cancelled')
 
             # Put On Hold - Team Leader, Senior Technician, Technician ONLY
             # Dispatcher alone does NOT have this permission
             # Can put on hold if not already completed/rejected/cancelled
-            if not (is_completed or is_rejected or is_cancelled):
-                # Team Leader can put on hold for their team
-                if is_team_leader and record.maintenance_team_id.id in user_team_ids:
-                    record.x_can_put_on_hold = True
-                # Senior Technician can put on hold
-                elif is_senior_technician:
-                    record.x_can_put_on_hold = True
-                # Technician can put on hold if assigned to them
-                elif is_technician and record.technician_user_id == user:
-                    record.x_can_put_on_hold = True
+            # (Team Leader for their team, Senior Technician, assigned Technician)
+            can_put_on_hold = not is_closed and (
+                is_team_lead_of_record
+                or is_senior_technician
+                or (is_technician and is_assigned_technician)
+            )
 
             # Send for Approval - Technician (assigned), Team Leader, Dispatcher
             # Can send for approval when in "Devam Ediyor" stage
-            if is_in_progress:
-                if is_cto or is_dept_manager or is_dispatcher:
-                    record.x_can_send_for_approval = True
-                elif is_team_leader and record.maintenance_team_id.id in user_team_ids:
-                    record.x_can_send_for_approval = True
-                elif is_technician and record.technician_user_id == user:
-                    record.x_can_send_for_approval = True
-
-            # Approve - Department Manager, CTO, OR Owner (for cancel approval)
-            # Can approve when in "Onayda" stage
-            # PHASE 4B: Owner can approve if x_pending_cancel=True (cancel approval)
-            if is_pending_approval:
-                if is_cto:
-                    record.x_can_approve = True
-                elif is_dept_manager:
-                    # Check if this is their department
-                    if record.x_department_id and user.employee_id and \
-                       record.x_department_id == user.employee_id.department_id:
-                        record.x_can_approve = True
-                elif is_owner and record.x_pending_cancel:
-                    # Owner can approve cancellation requests
-                    record.x_can_approve = True
-
-            # Reject - Department Manager, CTO, OR Owner (for cancel rejection)
-            # Can reject when in "Onayda" stage
-            # PHASE 4B: Owner can reject if x_pending_cancel=True (cancel rejection)
-            if is_pending_approval:
-                if is_cto:
-                    record.x_can_reject = True
-                elif is_dept_manager:
-                    # Check if this is their department
-                    if record.x_department_id and user.employee_id and \
-                       record.x_department_id == user.employee_id.department_id:
-                        record.x_can_reject = True
-                elif is_owner and record.x_pending_cancel:
-                    # Owner can reject cancellation requests
-                    record.x_can_reject = True
+            can_send_for_approval = is_in_progress and (
+                is_manager
+                or is_team_lead_of_record
+                or (is_technician and is_assigned_technician)
+            )
+
+            # Approve / Reject - Department Manager, CTO, OR Owner (for cancel approval)
+            # Can approve/reject when in "Onayda" stage
+            # PHASE 4B: Owner can approve/reject if x_pending_cancel=True (cancel approval)
+            can_decide = is_pending_approval and (
+                is_cto
+                or is_department_manager_of_record
+                or (not is_dept_manager and is_owner and record.x_pending_cancel)
+            )
 
             # Cancel - Different rules for owner vs other roles
             # Standard User (owner): Can ONLY cancel in "Yeni" stage (before team assignment)
             # Other roles (Team Leader, Dispatcher, Dept Manager, CTO): Can cancel in "Yeni" or "Ekip Atandı"
-            if is_new or is_team_assigned:
-                if is_cto or is_dept_manager or is_dispatcher:
-                    record.x_can_cancel = True
-                elif is_team_leader and record.maintenance_team_id.id in user_team_ids:
-                    record.x_can_cancel = True
-                elif is_owner and is_new:
-                    # Owner can ONLY cancel in "Yeni" stage (not after team assigned)
-                    record.x_can_cancel = True
+            can_cancel = (is_new or is_team_assigned) and (
+                is_manager
+                or is_team_lead_of_record
+                or (is_owner and is_new)
+            )
 
             # Create Work Order - Team Leader, Dispatcher, Dept Manager, CTO
             # Can create work order when in "Ekip Atandı" or "Devam Ediyor" stages
-            if is_team_assigned or is_in_progress or is_wo_created:
-                if is_cto or is_dept_manager or is_dispatcher:
-                    record.x_can_create_work_order = True
-                elif is_team_leader and record.maintenance_team_id.id in user_team_ids:
-                    record.x_can_create_work_order = True
+            can_create_work_order = (is_team_assigned or is_in_progress or is_wo_created) and (
+                is_manager or is_team_lead_of_record
+            )
+
+            record.x_can_put_on_hold = can_put_on_hold
+            record.x_can_send_for_approval = can_send_for_approval
+            record.x_can_approve = can_decide
+            record.x_can_reject = can_decide
+            record.x_can_cancel = can_cancel
+            record.x_can_create_work_order = can_create_work_order
 
     @api.depends_context('uid')
     @api.depends('stage_id', 'create_uid')
@@ -1049,42 +1476,26 @@ class TechnicalServiceRequest(models.Model):
 
         Returns True (readonly) if user CANNOT edit, False if user CAN edit
         """
+        # Roles are evaluated once for the whole recordset
+        user_ctx = self._get_workflow_user_context()
+        user = user_ctx['user']
+        roles = user_ctx['roles']
+
+        # Superuser always has access (except in final stages)
+        # CTO and Department Manager always have edit access (except final stages)
+        can_edit_any = user_ctx['is_superuser'] or bool(roles & {'cto', 'dept_manager'})
+        is_dispatcher = 'dispatcher' in roles
+
         for record in self:
             # FIRST CHECK: Final stage lockdown - NO ONE can edit
             if record.x_is_final_stage:
                 record.x_is_standard_user = True
-                continue
-
-            user = self.env.user
-
-            # Superuser always has access (except in final stages, already checked above)
-            if user._is_superuser():
-                record.x_is_standard_user = False
-                continue
-
-            # Check user roles
-            is_cto = user.has_group('technical_service_presentation.group_technical_cto')
-            is_dept_manager = user.has_group('technical_service_presentation.group_technical_department_manager')
-            is_dispatcher = user.has_group('technical_service_presentation.group_technical_dispatcher')
-
-            # CTO and Department Manager always have edit access (except final stages)
-            if is_cto or is_dept_manager:
+            elif can_edit_any:
                 record.x_is_standard_user = False
-                continue
-
-            # Get stage name
-            stage_name = record.stage_id.name if record.stage_id else ''
-
-            # If stage is "Yeni" (New)
-            if stage_name == 'Yeni':
-                # Creator can edit in "Yeni" stage
-                is_creator = (record.create_uid.id == user.id if record.create_uid else False)
-
-                # Dispatcher can edit in "Yeni" stage
-                if is_creator or is_dispatcher:
-                    record.x_is_standard_user = False
-                else:
-                    record.x_is_standard_user = True
+            elif record.x_stage_code == 'new':
+                # Creator and Dispatcher can edit in "Yeni" stage
+                is_creator = record.create_uid == user
+                record.x_is_standard_user = not (is_creator or is_dispatcher)
             else:
                 # Beyond "Yeni" stage: only CTO and Dept Manager can edit (already handled above)
                 # Everyone else is readonly
@@ -1103,11 +1514,8 @@ class TechnicalServiceRequest(models.Model):
 
         Returns True if in final stage, False otherwise
         """
-        final_stage_names = ['Onayda', 'Tamamlandı', 'Reddedildi', 'İptal Edildi']
-
         for record in self:
-            stage_name = record.stage_id.name if record.stage_id else ''
-            record.x_is_final_stage = stage_name in final_stage_names
+            record.x_is_final_stage = record.x_stage_code in FINAL_STAGE_CODES
 
     @api.depends_context('uid')
     @api.depends('stage_id')
@@ -1121,98 +1529,44 @@ class TechnicalServiceRequest(models.Model):
 
         Returns True if user CAN edit Work Orders/Resolution, False otherwise
         """
-        for record in self:
-            user = self.env.user
+        # Roles are evaluated once for the whole recordset
+        user_ctx = self._get_workflow_user_context()
 
-            # Superuser always has access
-            if user._is_superuser():
-                record.x_can_edit_work_orders = not record.x_is_final_stage
-                continue
+        # Superuser always has access; otherwise grant access if user has
+        # Team Leader, Senior Technician or Technician role
+        has_role = user_ctx['is_superuser'] or bool(
+            user_ctx['roles'] & {'team_leader', 'senior_technician', 'technician'}
+        )
 
+        for record in self:
             # Check if in final stage - NO ONE can edit
-            if record.x_is_final_stage:
-                record.x_can_edit_work_orders = False
-                continue
-
-            # Check user roles
-            is_team_leader = user.has_group('technical_service_presentation.group_technical_team_leader')
-            is_senior_tech = user.has_group('technical_service_presentation.group_technical_senior_technician')
-            is_technician = user.has_group('technical_service_presentation.group_technical_technician')
-
-            # Grant access if user has any of these roles
-            if is_team_leader or is_senior_tech or is_technician:
-                record.x_can_edit_work_orders = True
-            else:
-                record.x_can_edit_work_orders = False
+            record.x_can_edit_work_orders = has_role and not record.x_is_final_stage
 
     @api.model
-    def search_read(self, domain=None, fields=None, offset=0, limit=None, order=None):
-        """Override search_read to filter by department when context flag is set"""
+    def _search(self, domain, offset=0, limit=None, order=None, **kwargs):
+        """
+        Filter by department when the context flag is set
+        _search is shared by search, search_read, search_count and read_group,
+        the scope is added as a subquery (no hr.employee query in Python).
+        """
         if self.env.context.get('search_default_department'):
-            current_employee = self.env.user.employee_id
-            if current_employee:
-                dept_employee_ids = []
-
-                # 1. Current user's employee
-                dept_employee_ids.append(current_employee.id)
-
-                # 2. Subordinates
-                subordinates = self.env['hr.employee'].search([
-                    ('parent_id', '=', current_employee.id)
-                ])
-                dept_employee_ids.extend(subordinates.ids)
-
-                # 3. Department colleagues
-                if current_employee.department_id:
-                    dept_colleagues = self.env['hr.employee'].search([
-                        ('department_id', '=', current_employee.department_id.id)
-                    ])
-                    dept_employee_ids.extend(dept_colleagues.ids)
-
-                # Add to domain
-                dept_employee_ids = list(set(dept_employee_ids))
-                dept_domain = [('employee_id', 'in', dept_employee_ids)]
-
-                if domain:
-                    domain = ['&'] + dept_domain + domain
-                else:
-                    domain = dept_domain
-
-        return super(TechnicalServiceRequest, self).search_read(domain, fields, offset, limit, order)
+            dept_domain = self._get_department_scope_domain()
+            if dept_domain:
+                domain = expression.AND([dept_domain, domain or []])
+        return super()._search(domain, offset=offset, limit=limit, order=order, **kwargs)
 
     @api.model
-    def search(self, args, offset=0, limit=None, order=None, count=False):
-        """Override search to filter by department when context flag is set"""
-        if self.env.context.get('search_default_department'):
-            current_employee = self.env.user.employee_id
-            if current_employee:
-                dept_employee_ids = []
-
-                # 1. Current user's employee
-                dept_employee_ids.append(current_employee.id)
-
-                # 2. Subordinates
-                subordinates = self.env['hr.employee'].search([
-                    ('parent_id', '=', current_employee.id)
-                ])
-                dept_employee_ids.extend(subordinates.ids)
-
-                # 3. Department colleagues
-                if current_employee.department_id:
-                    dept_colleagues = self.env['hr.employee'].search([
-                        ('department_id', '=', current_employee.department_id.id)
-                    ])
-                    dept_employee_ids.extend(dept_colleagues.ids)
-
-                # Add to domain
-                dept_employee_ids = list(set(dept_employee_ids))
-                dept_domain = [('employee_id', 'in', dept_employee_ids)]
-
-                if args:
-                    args = ['&'] + dept_domain + list(args)
-                else:
-                    args = dept_domain
-
-        if count:
-            return super(TechnicalServiceRequest, self).search_count(args)
-        return super(TechnicalServiceRequest, self).search(args, offset=offset, limit=limit, order=order)
+    def _get_department_scope_domain(self):
+        """
+        Requests of the current user's employee, their subordinates and
+        their department colleagues
+        Returns: domain (empty if the user has no employee)
+        """
+        current_employee = self.env.user.employee_id
+        if not current_employee:
+            return []
+
+        employee_domain = [('id', '=', current_employee.id), ('parent_id', '=', current_employee.id)]
+        if current_employee.department_id:
+            employee_domain.append(('department_id', '=', current_employee.department_id.id))
+        return [('employee_id', 'any', expression.OR([[leaf] for leaf in employee_domain]))]
@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+
+import logging
+
+from odoo import models, fields, api, _
+from odoo.exceptions import AccessError, ValidationError, UserError
+
+_logger = logging.getLogger(__name__)
+
+# Maximum number of requests accepted in one API call
+API_MAX_BATCH = 1000
+
+# maintenance.request fields a client may set through the intake API
+API_REQUEST_FIELDS = (
+    'name', 'description', 'x_request_type',
+    'x_service_category', 'x_it_category', 'x_technical_category',
+    'x_impact', 'x_urgency',
+    'x_campus_id', 'x_building_id', 'x_floor', 'x_room', 'x_location_details',
+    'maintenance_team_id', 'category_id', 'equipment_id', 'employee_id',
+)
+
+# Payload key carrying the client idempotency key
+API_IDEMPOTENCY_KEY = 'idempotency_key'
+
+
+class MaintenanceRequestApi(models.Model):
+    """
+    Service Request Intake API
+    Purpose: Batch creation of requests by external systems (monitoring, BMS)
+
+    Used by the /technical_service/api/requests endpoint: a batch is
+    validated in one pass, retries are deduplicated on the client
+    idempotency key and the valid requests are inserted with a single
+    create(vals_list) (batched numbering, SLA and history).
+    """
+    _inherit = 'maintenance.request'
+
+    x_idempotency_key = fields.Char(
+        string='Idempotency Key',
+        copy=False,
+        readonly=True,
+        help='Client key of the API call that created this request (retries return the same request)'
+    )
+
+    _sql_constraints = [
+        ('idempotency_key_unique', 'UNIQUE(x_idempotency_key)',
+         'A request with this idempotency key already exists!'),
+    ]
+
+    @api.model
+    def api_create_requests(self, payloads):
+        """
+        Create service requests from an API batch
+
+        Args:
+            payloads: list of dicts with API_REQUEST_FIELDS values and an
+                      optional 'idempotency_key'
+
+        Returns:
+            list of result dicts, in the order of `payloads`:
+            {'index', 'idempotency_key', 'status': 'created'|'duplicate'|'error',
+             'id', 'number', 'error'}
+        """
+        self._api_check_access()
+        if not isinstance(payloads, list):
+            raise UserError(_('The request batch must be a list'))
+        if len(payloads) > API_MAX_BATCH:
+            raise UserError(_('At most %s requests can be sent in one call', API_MAX_BATCH))
+
+        results = [{'index': index, 'idempotency_key': None} for index in range(len(payloads))]
+        valid = {}  # index -> create values
+        for index, payload in enumerate(payloads):
+            try:
+                vals = self._api_prepare_values(payload)
+            except (ValidationError, UserError) as error:
+                results[index].update(status='error', error=str(error.args[0]))
+                continue
+            results[index]['idempotency_key'] = vals.get('x_idempotency_key')
+            valid[index] = vals
+        self._api_check_references(valid, results)
+        created = self._api_create_deduplicated(valid, results)
+
+        _logger.info("Intake API: %s requests created, %s payloads received", len(created), len(payloads))
+        return results
+
+    def _api_create_deduplicated(self, valid, results):
+        """
+        Create the valid payloads whose idempotency key is not used yet
+        (one key reservation, one search for the known keys, one create for
+        the new requests)
+        Returns: created requests
+        """
+        ApiKey = self.env['technical_service.request.api.key'].sudo()
+        keys = {vals['x_idempotency_key'] for vals in valid.values() if vals.get('x_idempotency_key')}
+        reserved = ApiKey._reserve(keys)
+        existing = {}
+        if keys - reserved:
+            for api_key in ApiKey.search([('name', 'in', list(keys - reserved))]):
+                existing[api_key.name] = api_key.request_id
+
+        to_create = {}  # index -> create values
+        repeated = []   # (index, key) of keys sent twice in the batch
+        seen = set()
+        for index, vals in valid.items():
+            key = vals.get('x_idempotency_key')
+            if key in existing:
+                results[index].update(self._api_result(existing[key], 'duplicate'))
+            elif key in seen:
+                repeated.append((index, key))
+            else:
+                if key:
+                    seen.add(key)
+                to_create[index] = vals
+
+        records = self.create(list(to_create.values())) if to_create else self.browse()
+        created_by_key = {}
+        for index, record in zip(to_create, records):
+            results[index].update(self._api_result(record, 'created'))
+            created_by_key[to_create[index].get('x_idempotency_key')] = record
+        for index, key in repeated:
+            results[index].update(self._api_result(created_by_key[key], 'duplicate'))
+        created_by_key.pop(None, None)
+        ApiKey._link(created_by_key)
+        return records
+
+    @api.model
+    def _api_result(self, record, status):
+        """Result entry of a created or deduplicated request"""
+        return {
+            'status': status,
+            'id': record.id,
+            'number': record.x_request_number,
+            'error': None,
+        }
+
+    @api.model
+    def _api_prepare_values(self, payload):
+        """
+        Validate one API payload and convert it to create values
+        Raises: ValidationError with a message for the client
+        """
+        if not isinstance(payload, dict):
+            raise ValidationError(_('Each request must be an object'))
+
+        payload = dict(payload)
+        key = payload.pop(API_IDEMPOTENCY_KEY, None)
+        unknown = set(payload) - set(API_REQUEST_FIELDS)
+        if unknown:
+            raise ValidationError(_('Unknown fields: %s', ', '.join(sorted(unknown))))
+        if not payload.get('name'):
+            raise ValidationError(_('The request title (name) is required'))
+
+        vals = {}
+        for fname, value in payload.items():
+            field = self._fields[fname]
+            if field.type == 'selection' and value:
+                if value not in field.get_values(self.env):
+                    raise ValidationError(_('Invalid value for %s: %s', fname, value))
+            elif field.type == 'many2one' and value:
+                if not isinstance(value, int) or isinstance(value, bool):
+                    raise ValidationError(_('%s must be a record id', fname))
+            elif field.type in ('char', 'text', 'html') and value and not isinstance(value, str):
+                raise ValidationError(_('%s must be a string', fname))
+            vals[fname] = value
+
+        if key is not None:
+            if not isinstance(key, str) or not key.strip() or len(key) > 255:
+                raise ValidationError(_('The idempotency key must be a non-empty string (max 255 characters)'))
+            vals['x_idempotency_key'] = key.strip()
+        return vals
+
+    @api.model
+    def _api_check_references(self, valid, results):
+        """
+        Reject payloads referring to missing records or to records the API
+        user cannot read (e.g. teams of another company), with one query per
+        many2one field, so a single bad id does not fail the whole insert
+        """
+        for fname in API_REQUEST_FIELDS:
+            field = self._fields[fname]
+            if field.type != 'many2one':
+                continue
+            ids = {vals[fname] for vals in valid.values() if vals.get(fname)}
+            if not ids:
+                continue
+            found = set(self.env[field.comodel_name].browse(ids).exists()._filtered_access('read').ids)
+            for index, vals in list(valid.items()):
+                if vals.get(fname) and vals[fname] not in found:
+                    results[index].update(
+                        status='error',
+                        error=_('%s: record %s does not exist or is not accessible', fname, vals[fname]),
+                    )
+                    del valid[index]
+
+    @api.model
+    def _api_check_access(self):
+        """The API user must be allowed to create requests"""
+        try:
+            self.check_access('create')
+        except AccessError:
+            raise UserError(_('You are not allowed to create service requests'))
+
+
+class TechnicalServiceRequestApiKey(models.Model):
+    """
+    Intake API Idempotency Key
+    Purpose: Reserve client idempotency keys across concurrent API calls
+
+    Keys are reserved with INSERT ... ON CONFLICT DO NOTHING before the
+    requests are searched or created. A concurrent call holding the same key
+    blocks the insert until it ends; if it committed, PostgreSQL raises a
+    serialization failure (REPEATABLE READ) and the framework retries the
+    whole call, which then sees the key and returns the existing request.
+    Rows are deleted with their request, freeing the key.
+    """
+    _name = 'technical_service.request.api.key'
+    _description = 'Intake API Idempotency Key'
+    _log_access = False
+
+    name = fields.Char(string='Idempotency Key', required=True)
+    request_id = fields.Many2one('maintenance.request', string='Service Request', ondelete='cascade', index=True)
+
+    _sql_constraints = [
+        ('name_unique', 'UNIQUE(name)', 'This idempotency key is already used!'),
+    ]
+
+    @api.model
+    def _reserve(self, keys):
+        """
+        Reserve keys (single INSERT ... ON CONFLICT DO NOTHING)
+        Returns: set of the keys reserved by this call (the others are known)
+        """
+        if not keys:
+            return set()
+        self.env.cr.execute("""
+            INSERT INTO technical_service_request_api_key (name)
+            SELECT key FROM unnest(%s::varchar[]) AS key ORDER BY key
+                ON CONFLICT (name) DO NOTHING
+            RETURNING name
+        """, [list(keys)])
+        return {row[0] for row in self.env.cr.fetchall()}
+
+    @api.model
+    def _link(self, requests_by_key):
+        """Attach reserved keys to the requests created for them (single UPDATE)"""
+        if not requests_by_key:
+            return
+        self.env.cr.execute("""
+            UPDATE technical_service_request_api_key AS api_key
+               SET request_id = created.request_id
+              FROM unnest(%s::varchar[], %s::int[]) AS created(name, request_id)
+             WHERE api_key.name = created.name
+        """, [list(requests_by_key), [request.id for request in requests_by_key.values()]])
+        self.invalidate_model(['request_id'])
@@ -1,8 +1,14 @@
 # -*- coding: utf-8 -*-
 
+from contextlib import contextmanager
+
 from odoo import models, fields, api, _
 from datetime import datetime
 
+# Keys used in cr.precommit.data to buffer history events of the transaction
+HISTORY_BUFFER_KEY = 'technical_service.request.history.buffer'
+HISTORY_BUFFER_DEPTH_KEY = 'technical_service.request.history.buffer_depth'
+
 class TechnicalServiceRequestHistory(models.Model):
     """
     Service Request History Tracking
@@ -93,9 +99,9 @@ class TechnicalServiceRequestHistory(models.Model):
 
     stage_change_duration = fields.Float(
         string='Duration in Previous Stage (Hours)',
-        compute='_compute_stage_duration',
-        store=True,
-        help='How long the request was in the previous stage'
+        readonly=True,
+        help='How long the request was in the previous stage '
+             '(set on insert from the request\'s x_stage_entered_at marker)'
     )
 
     # ============================================
@@ -175,11 +181,10 @@ class TechnicalServiceRequestHistory(models.Model):
         help='True if this event was triggered automatically by the system'
     )
 
-    # Computed display field for better readability
+    # Computed display field for better readability (rendered on read, not stored)
     description = fields.Html(
         string='Description',
         compute='_compute_description',
-        store=True,
         help='Human-readable description of this history entry'
     )
 
@@ -187,92 +192,250 @@ class TechnicalServiceRequestHistory(models.Model):
     # COMPUTED METHODS
     # ============================================
 
-    @api.depends('old_stage_id', 'new_stage_id', 'timestamp')
-    def _compute_stage_duration(self):
-        """Calculate how long the request was in the previous stage"""
-        for record in self:
-            if record.event_type == 'stage_change' and record.old_stage_id:
-                # Find previous stage change to this stage
-                previous_entry = self.search([
-                    ('request_id', '=', record.request_id.id),
-                    ('event_type', '=', 'stage_change'),
-                    ('new_stage_id', '=', record.old_stage_id.id),
-                    ('timestamp', '<', record.timestamp),
-                ], order='timestamp desc', limit=1)
-
-                if previous_entry:
-                    delta = record.timestamp - previous_entry.timestamp
-                    record.stage_change_duration = delta.total_seconds() / 3600.0
+    @api.model_create_multi
+    def create(self, vals_list):
+        """Set the stage durations of stage change rows (O(1) per row) and append stage intervals"""
+        self._set_stage_durations(vals_list)
+        records = super().create(vals_list)
+        self.env['technical_service.stage.interval']._track_stage_changes(records)
+        return records
+
+    @api.model
+    def _set_stage_durations(self, vals_list):
+        """
+        Duration in the previous stage = row timestamp - the request's
+        x_stage_entered_at marker (when it entered its current stage);
+        the marker then moves to the row timestamp.
+        Markers of all requests in vals_list are read and written at once.
+        """
+        stage_vals = [
+            vals for vals in vals_list
+            if vals.get('event_type') == 'stage_change' and vals.get('request_id')
+        ]
+        if not stage_vals:
+            return
+
+        now = fields.Datetime.now()
+        for vals in stage_vals:
+            vals.setdefault('timestamp', now)
+
+        requests = self.env['maintenance.request'].sudo().browse({vals['request_id'] for vals in stage_vals})
+        entered_at = {request.id: request.x_stage_entered_at for request in requests}
+
+        for vals in sorted(stage_vals, key=lambda v: fields.Datetime.to_datetime(v['timestamp'])):
+            timestamp = fields.Datetime.to_datetime(vals['timestamp'])
+            previous = entered_at.get(vals['request_id'])
+            if 'stage_change_duration' not in vals:
+                if vals.get('old_stage_id') and previous and previous < timestamp:
+                    vals['stage_change_duration'] = (timestamp - previous).total_seconds() / 3600.0
                 else:
-                    record.stage_change_duration = 0.0
-            else:
-                record.stage_change_duration = 0.0
+                    vals['stage_change_duration'] = 0.0
+            if not previous or previous <= timestamp:
+                entered_at[vals['request_id']] = timestamp
+
+        request_ids_by_marker = {}
+        for request in requests:
+            if entered_at[request.id] != request.x_stage_entered_at:
+                request_ids_by_marker.setdefault(entered_at[request.id], []).append(request.id)
+        for marker, request_ids in request_ids_by_marker.items():
+            requests.browse(request_ids).write({'x_stage_entered_at': marker})
 
-    @api.depends('event_type', 'old_stage_id', 'new_stage_id', 'old_team_id',
-                 'new_team_id', 'approval_status', 'work_order_id', 'user_id')
+    @api.model
+    def _backfill_stage_durations(self):
+        """
+        Recompute stage durations of all existing history and the requests'
+        x_stage_entered_at markers with set-based SQL (window function)
+        Used once by the 18.0.1.1.0 migration.
+        """
+        self.env.flush_all()
+        self.env.cr.execute("""
+            WITH ordered AS (
+                SELECT id, old_stage_id, timestamp,
+                       LAG(timestamp) OVER (PARTITION BY request_id ORDER BY timestamp, id) AS previous_timestamp
+                  FROM technical_service_request_history
+                 WHERE event_type = 'stage_change'
+            )
+            UPDATE technical_service_request_history history
+               SET stage_change_duration = CASE
+                       WHEN ordered.old_stage_id IS NOT NULL AND ordered.previous_timestamp IS NOT NULL
+                       THEN EXTRACT(EPOCH FROM ordered.timestamp - ordered.previous_timestamp) / 3600.0
+                       ELSE 0.0
+                   END
+              FROM ordered
+             WHERE ordered.id = history.id
+        """)
+        self.env.cr.execute("""
+            UPDATE maintenance_request request
+               SET x_stage_entered_at = markers.entered_at
+              FROM (SELECT request_id, MAX(timestamp) AS entered_at
+                      FROM technical_service_request_history
+                     WHERE event_type = 'stage_change'
+                  GROUP BY request_id) markers
+             WHERE markers.request_id = request.id
+        """)
+        self.invalidate_model(['stage_change_duration'])
+        self.env['maintenance.request'].invalidate_model(['x_stage_entered_at'])
+        return True
+
+    @api.depends('event_type', 'old_stage_id', 'new_stage_id', 'old_team_id', 'new_team_id',
+                 'old_technician_id', 'new_technician_id', 'approval_status', 'work_order_id',
+                 'work_order_status', 'user_id', 'note', 'reason', 'is_automatic', 'stage_change_duration')
     def _compute_description(self):
-        """Generate human-readable description of the history event"""
+        """
+        Generate human-readable description of the history event
+        Rendered from the structured fields when read; rows with the same
+        values (e.g. the same automatic transition by the same user) share
+        one rendering within the call.
+        """
+        render_cache = {}
         for record in self:
-            desc = []
-
-            if record.event_type == 'stage_change':
-                old = record.old_stage_id.name if record.old_stage_id else 'Yok'
-                new = record.new_stage_id.name if record.new_stage_id else 'Yok'
-                desc.append(f"<b>Stage:</b> {old} → {new}")
-                if record.stage_change_duration > 0:
-                    desc.append(f"<br/><b>Önceki stage'de geçen süre:</b> {record.stage_change_duration:.2f} saat")
-
-            elif record.event_type == 'assignment':
-                if record.new_team_id:
-                    old_team = record.old_team_id.name if record.old_team_id else 'Yok'
-                    desc.append(f"<b>Ekip:</b> {old_team} → {record.new_team_id.name}")
-                if record.new_technician_id:
-                    old_tech = record.old_technician_id.name if record.old_technician_id else 'Yok'
-                    desc.append(f"<b>Teknisyen:</b> {old_tech} → {record.new_technician_id.name}")
-
-            elif record.event_type == 'work_order':
-                if record.work_order_id:
-                    desc.append(f"<b>İş Emri:</b> {record.work_order_id.name}")
-                    if record.work_order_status:
-                        desc.append(f" - {record.work_order_status}")
-
-            elif record.event_type == 'approval':
-                if record.approval_status == 'approved':
-                    desc.append("<b>Durum:</b> Talep onaylandı ✓")
-                elif record.approval_status == 'rejected':
-                    desc.append("<b>Durum:</b> Talep reddedildi ✗")
-                elif record.approval_status == 'cancelled':
-                    desc.append("<b>Durum:</b> Talep iptal edildi")
-
-            elif record.event_type == 'cancellation':
-                desc.append("<b>İptal işlemi</b>")
-                if record.reason:
-                    desc.append(f"<br/><b>Sebep:</b> {record.reason}")
-
-            elif record.event_type == 'hold':
-                desc.append("<b>Talep bekletmeye alındı</b>")
-                if record.reason:
-                    desc.append(f"<br/><b>Sebep:</b> {record.reason}")
-
-            elif record.event_type == 'comment':
-                desc.append("<b>Yorum eklendi</b>")
-
-            elif record.event_type == 'field_change':
-                desc.append("<b>Alan değişikliği</b>")
-
-            # Add user info
-            if record.user_id:
-                desc.append(f"<br/><b>Kullanıcı:</b> {record.user_id.name}")
-
-            # Add notes if available
-            if record.note:
-                desc.append(f"<br/><i>{record.note}</i>")
-
-            # Add automatic flag
-            if record.is_automatic:
-                desc.append("<br/><span style='color: gray;'>(Otomatik)</span>")
-
-            record.description = "<br/>".join(desc) if desc else "Bilgi yok"
+            key = (
+                record.event_type, record.old_stage_id, record.new_stage_id,
+                record.old_team_id, record.new_team_id, record.old_technician_id,
+                record.new_technician_id, record.approval_status, record.work_order_id,
+                record.work_order_status, record.user_id, record.note, record.reason,
+                record.is_automatic, record.stage_change_duration,
+            )
+            if key not in render_cache:
+                render_cache[key] = record._render_description()
+            record.description = render_cache[key]
+
+    def _render_description(self):
+        """HTML description of one history entry"""
+        self.ensure_one()
+        desc = []
+
+        if self.event_type == 'stage_change':
+            old = self.old_stage_id.name if self.old_stage_id else 'Yok'
+            new = self.new_stage_id.name if self.new_stage_id else 'Yok'
+            desc.append(f"<b>Stage:</b> {old} → {new}")
+            if self.stage_change_duration > 0:
+                desc.append(f"<br/><b>Önceki stage'de geçen süre:</b> {self.stage_change_duration:.2f} saat")
+
+        elif self.event_type == 'assignment':
+            if self.new_team_id:
+                old_team = self.old_team_id.name if self.old_team_id else 'Yok'
+                desc.append(f"<b>Ekip:</b> {old_team} → {self.new_team_id.name}")
+            if self.new_technician_id:
+                old_tech = self.old_technician_id.name if self.old_technician_id else 'Yok'
+                desc.append(f"<b>Teknisyen:</b> {old_tech} → {self.new_technician_id.name}")
+
+        elif self.event_type == 'work_order':
+            if self.work_order_id:
+                desc.append(f"<b>İş Emri:</b> {self.work_order_id.name}")
+                if self.work_order_status:
+                    desc.append(f" - {self.work_order_status}")
+
+        elif self.event_type == 'approval':
+            if self.approval_status == 'approved':
+                desc.append("<b>Durum:</b> Talep onaylandı ✓")
+            elif self.approval_status == 'rejected':
+                desc.append("<b>Durum:</b> Talep reddedildi ✗")
+            elif self.approval_status == 'cancelled':
+                desc.append("<b>Durum:</b> Talep iptal edildi")
+
+        elif self.event_type == 'cancellation':
+            desc.append("<b>İptal işlemi</b>")
+            if self.reason:
+                desc.append(f"<br/><b>Sebep:</b> {self.reason}")
+
+        elif self.event_type == 'hold':
+            desc.append("<b>Talep bekletmeye alındı</b>")
+            if self.reason:
+                desc.append(f"<br/><b>Sebep:</b> {self.reason}")
+
+        elif self.event_type == 'comment':
+            desc.append("<b>Yorum eklendi</b>")
+
+        elif self.event_type == 'field_change':
+            desc.append("<b>Alan değişikliği</b>")
+
+        # Add user info
+        if self.user_id:
+            desc.append(f"<br/><b>Kullanıcı:</b> {self.user_id.name}")
+
+        # Add notes if available
+        if self.note:
+            desc.append(f"<br/><i>{self.note}</i>")
+
+        # Add automatic flag
+        if self.is_automatic:
+            desc.append("<br/><span style='color: gray;'>(Otomatik)</span>")
+
+        return "<br/>".join(desc) if desc else "Bilgi yok"
+
+    # ============================================
+    # BULK LOGGING
+    # ============================================
+
+    @api.model
+    def log_events_bulk(self, events):
+        """
+        Log several history events at once
+
+        Args:
+            events: list of dicts with history create values
+                    (e.g. built by the _prepare_*_vals helpers)
+
+        Returns:
+            Created history records (empty recordset if the events were
+            queued by an active buffered() block)
+        """
+        events = [dict(event) for event in events if event]
+        if not events:
+            return self.browse()
+
+        data = self.env.cr.precommit.data
+        if data.get(HISTORY_BUFFER_DEPTH_KEY):
+            # Freeze timestamp and user now, the rows are inserted later
+            now = fields.Datetime.now()
+            for event in events:
+                event.setdefault('timestamp', now)
+                event.setdefault('user_id', self.env.uid)
+            data.setdefault(HISTORY_BUFFER_KEY, []).extend(events)
+            return self.browse()
+
+        return self.create(events)
+
+    @contextmanager
+    def buffered(self):
+        """
+        Accumulate history events logged inside the block and insert them
+        with a single create(vals_list)
+
+        Usage:
+            with self.env['technical_service.request.history'].buffered():
+                for request in requests:
+                    request._transition_to_stage(...)
+
+        The queue is flushed when the outermost block exits; a precommit hook
+        guarantees nothing queued is lost if the transaction commits first.
+        Blocks can be nested. If the block raises, queued events are dropped.
+        """
+        data = self.env.cr.precommit.data
+        if not data.get(HISTORY_BUFFER_DEPTH_KEY):
+            self.env.cr.precommit.add(self._flush_buffered_events)
+        data[HISTORY_BUFFER_DEPTH_KEY] = data.get(HISTORY_BUFFER_DEPTH_KEY, 0) + 1
+        failed = False
+        try:
+            yield self
+        except Exception:
+            failed = True
+            raise
+        finally:
+            data[HISTORY_BUFFER_DEPTH_KEY] -= 1
+            if not data[HISTORY_BUFFER_DEPTH_KEY]:
+                if failed:
+                    data.pop(HISTORY_BUFFER_KEY, None)
+                else:
+                    self._flush_buffered_events()
+
+    def _flush_buffered_events(self):
+        """Insert all queued history events with one create()"""
+        events = self.env.cr.precommit.data.pop(HISTORY_BUFFER_KEY, None)
+        if events:
+            return self.create(events)
+        return self.browse()
 
     # ============================================
     # HELPER METHODS (to be called from request model)
@@ -291,16 +454,23 @@ class TechnicalServiceRequestHistory(models.Model):
             is_auto: Boolean indicating if this was automatic
 
         Returns:
-            Created history record
+            Created history record (empty while a buffered() block is active)
         """
-        return self.create({
+        return self.log_events_bulk([self._prepare_stage_change_vals(
+            request, old_stage, new_stage, reason=reason, is_auto=is_auto
+        )])
+
+    @api.model
+    def _prepare_stage_change_vals(self, request, old_stage, new_stage, reason=None, is_auto=False):
+        """Build the create values of a stage change entry (see log_stage_change)"""
+        return {
             'request_id': request.id,
             'event_type': 'stage_change',
             'old_stage_id': old_stage.id if old_stage else False,
             'new_stage_id': new_stage.id,
             'note': reason,
             'is_automatic': is_auto,
-        })
+        }
 
     @api.model
     def log_assignment(self, request, old_team, new_team, old_tech, new_tech, note=None):
@@ -316,8 +486,15 @@ class TechnicalServiceRequestHistory(models.Model):
             note: Optional note
 
         Returns:
-            Created history record(s)
+            Created history record(s) (empty while a buffered() block is active)
         """
+        return self.log_events_bulk([self._prepare_assignment_vals(
+            request, old_team, new_team, old_tech, new_tech, note=note
+        )])
+
+    @api.model
+    def _prepare_assignment_vals(self, request, old_team, new_team, old_tech, new_tech, note=None):
+        """Build the create values of an assignment entry (see log_assignment)"""
         vals = {
             'request_id': request.id,
             'event_type': 'assignment',
@@ -333,7 +510,7 @@ class TechnicalServiceRequestHistory(models.Model):
             vals['old_technician_id'] = old_tech.id if old_tech else False
             vals['new_technician_id'] = new_tech.id if new_tech else False
 
-        return self.create(vals)
+        return vals
 
     @api.model
     def log_work_order_event(self, request, work_order, status_text, note=None):
@@ -347,16 +524,23 @@ class TechnicalServiceRequestHistory(models.Model):
             note: Optional note
 
         Returns:
-            Created history record
+            Created history record (empty while a buffered() block is active)
         """
-        return self.create({
+        return self.log_events_bulk([self._prepare_work_order_event_vals(
+            request, work_order, status_text, note=note
+        )])
+
+    @api.model
+    def _prepare_work_order_event_vals(self, request, work_order, status_text, note=None):
+        """Build the create values of a work order entry (see log_work_order_event)"""
+        return {
             'request_id': request.id,
             'event_type': 'work_order',
             'work_order_id': work_order.id,
             'work_order_status': status_text,
             'note': note,
             'is_automatic': False,
-        })
+        }
 
     @api.model
     def log_approval(self, request, status, reason=None):
@@ -369,15 +553,20 @@ class TechnicalServiceRequestHistory(models.Model):
             reason: Reason for rejection/cancellation
 
         Returns:
-            Created history record
+            Created history record (empty while a buffered() block is active)
         """
-        return self.create({
+        return self.log_events_bulk([self._prepare_approval_vals(request, status, reason=reason)])
+
+    @api.model
+    def _prepare_approval_vals(self, request, status, reason=None):
+        """Build the create values of an approval entry (see log_approval)"""
+        return {
             'request_id': request.id,
             'event_type': 'approval',
             'approval_status': status,
             'reason': reason,
             'is_automatic': False,
-        })
+        }
 
     @api.model
     def log_hold(self, request, reason):
@@ -389,11 +578,17 @@ class TechnicalServiceRequestHistory(models.Model):
             reason: Reason for putting on hold
 
         Returns:
-            Created history record
+            Created history record (empty while a buffered() block is active)
         """
-        return self.create({
+        return self.log_events_bulk([self._prepare_hold_vals(request, reason)])
+
+    @api.model
+    def _prepare_hold_vals(self, request, reason):
+        """Build the create values of a hold entry (see log_hold)"""
+        return {
             'request_id': request.id,
             'event_type': 'hold',
             'reason': reason,
             'is_automatic': False,
-        })
+        }
+
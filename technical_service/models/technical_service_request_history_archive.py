@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+
+from datetime import timedelta
+
+from odoo import models, fields, api, tools
+
+# Columns moved from the hot history table to the archive (same names in both)
+HISTORY_ARCHIVE_COLUMNS = (
+    'request_id', 'timestamp', 'user_id', 'event_type',
+    'old_stage_id', 'new_stage_id', 'stage_change_duration',
+    'old_team_id', 'new_team_id', 'old_technician_id', 'new_technician_id',
+    'work_order_id', 'work_order_status', 'approval_status',
+    'note', 'reason', 'is_automatic',
+)
+
+# Default age (days) after which history rows are archived
+HISTORY_ARCHIVE_DEFAULT_DAYS = 365
+
+EVENT_TYPES = [
+    ('stage_change', 'Stage Değişikliği'),
+    ('assignment', 'Atama'),
+    ('work_order', 'İş Emri'),
+    ('comment', 'Yorum'),
+    ('approval', 'Onay/Red'),
+    ('cancellation', 'İptal'),
+    ('hold', 'Bekletme'),
+    ('field_change', 'Alan Değişikliği'),
+]
+
+
+class TechnicalServiceRequestHistoryArchive(models.Model):
+    """
+    Archived Service Request History (cold tier)
+    Purpose: Compact storage of history older than the archive horizon
+
+    Rows are moved here from technical_service.request.history by a cron
+    (one DELETE ... RETURNING / INSERT statement per batch), keeping the hot
+    table and the request form small. No audit columns, no stored
+    description; technical_service.request.history.report unions both tiers.
+    """
+    _name = 'technical_service.request.history.archive'
+    _description = 'Archived Service Request History'
+    _order = 'timestamp desc, id desc'
+    _rec_name = 'event_type'
+    _log_access = False
+
+    request_id = fields.Many2one('maintenance.request', string='Service Request',
+                                 required=True, ondelete='cascade', index=True)
+    timestamp = fields.Datetime(string='Timestamp', required=True, index=True)
+    user_id = fields.Many2one('res.users', string='User')
+    event_type = fields.Selection(EVENT_TYPES, string='Event Type', required=True)
+    old_stage_id = fields.Many2one('maintenance.stage', string='Old Stage')
+    new_stage_id = fields.Many2one('maintenance.stage', string='New Stage')
+    stage_change_duration = fields.Float(string='Duration in Previous Stage (Hours)')
+    old_team_id = fields.Many2one('maintenance.team', string='Old Team')
+    new_team_id = fields.Many2one('maintenance.team', string='New Team')
+    old_technician_id = fields.Many2one('res.users', string='Old Technician')
+    new_technician_id = fields.Many2one('res.users', string='New Technician')
+    work_order_id = fields.Many2one('technical_service.work_order', string='Work Order', ondelete='set null')
+    work_order_status = fields.Char(string='Work Order Status')
+    approval_status = fields.Selection([
+        ('approved', 'Onaylandı'),
+        ('rejected', 'Reddedildi'),
+        ('cancelled', 'İptal Edildi'),
+    ], string='Approval Status')
+    note = fields.Text(string='Not/Açıklama')
+    reason = fields.Text(string='Sebep')
+    is_automatic = fields.Boolean(string='Automatic')
+
+    @api.model
+    def _get_archive_cutoff(self):
+        """History older than this datetime belongs to the archive"""
+        days = int(self.env['ir.config_parameter'].sudo().get_param(
+            'technical_service.history_archive_days', HISTORY_ARCHIVE_DEFAULT_DAYS
+        ) or 0)
+        if days <= 0:
+            return False
+        return fields.Datetime.now() - timedelta(days=days)
+
+    @api.model
+    def _cron_archive_history(self, batch_size=50000):
+        """
+        Move history rows older than the archive horizon to the archive
+        Each batch is a single statement (DELETE ... RETURNING feeding the
+        INSERT), so rows are never lost or duplicated. The cron is
+        re-triggered while batches remain.
+        """
+        cutoff = self._get_archive_cutoff()
+        if not cutoff:
+            return True
+
+        self.env.flush_all()
+        columns = ', '.join(HISTORY_ARCHIVE_COLUMNS)
+        self.env.cr.execute(f"""
+            WITH moved AS (
+                DELETE FROM technical_service_request_history
+                 WHERE id IN (
+                        SELECT id FROM technical_service_request_history
+                         WHERE timestamp < %s
+                      ORDER BY id
+                         LIMIT %s
+                 )
+             RETURNING {columns}
+            )
+            INSERT INTO technical_service_request_history_archive ({columns})
+            SELECT {columns} FROM moved
+        """, [cutoff, batch_size])
+        moved = self.env.cr.rowcount
+
+        self.env['technical_service.request.history'].invalidate_model()
+        self.env['maintenance.request'].invalidate_model(['x_history_ids'])
+
+        if moved == batch_size:
+            self.env['ir.cron']._notify_progress(done=moved, remaining=1)
+        return True
+
+
+class TechnicalServiceRequestHistoryReport(models.Model):
+    """
+    Service Request History (all tiers)
+    Purpose: Reporting / full history over the hot and archived tiers
+
+    SQL view: UNION ALL of technical_service.request.history (positive ids)
+    and technical_service.request.history.archive (negative ids).
+    """
+    _name = 'technical_service.request.history.report'
+    _description = 'Service Request History (All)'
+    _auto = False
+    _order = 'timestamp desc, id desc'
+    _rec_name = 'event_type'
+
+    request_id = fields.Many2one('maintenance.request', string='Service Request', readonly=True)
+    timestamp = fields.Datetime(string='Timestamp', readonly=True)
+    user_id = fields.Many2one('res.users', string='User', readonly=True)
+    event_type = fields.Selection(EVENT_TYPES, string='Event Type', readonly=True)
+    old_stage_id = fields.Many2one('maintenance.stage', string='Old Stage', readonly=True)
+    new_stage_id = fields.Many2one('maintenance.stage', string='New Stage', readonly=True)
+    stage_change_duration = fields.Float(string='Duration in Previous Stage (Hours)', readonly=True, aggregator='avg')
+    old_team_id = fields.Many2one('maintenance.team', string='Old Team', readonly=True)
+    new_team_id = fields.Many2one('maintenance.team', string='New Team', readonly=True)
+    old_technician_id = fields.Many2one('res.users', string='Old Technician', readonly=True)
+    new_technician_id = fields.Many2one('res.users', string='New Technician', readonly=True)
+    work_order_id = fields.Many2one('technical_service.work_order', string='Work Order', readonly=True)
+    work_order_status = fields.Char(string='Work Order Status', readonly=True)
+    approval_status = fields.Selection([
+        ('approved', 'Onaylandı'),
+        ('rejected', 'Reddedildi'),
+        ('cancelled', 'İptal Edildi'),
+    ], string='Approval Status', readonly=True)
+    note = fields.Text(string='Not/Açıklama', readonly=True)
+    reason = fields.Text(string='Sebep', readonly=True)
+    is_automatic = fields.Boolean(string='Automatic', readonly=True)
+    is_archived = fields.Boolean(string='Archived', readonly=True)
+
+    def init(self):
+        tools.drop_view_if_exists(self.env.cr, self._table)
+        columns = ', '.join(HISTORY_ARCHIVE_COLUMNS)
+        self.env.cr.execute(f"""
+            CREATE OR REPLACE VIEW {self._table} AS (
+                SELECT id, {columns}, FALSE AS is_archived
+                  FROM technical_service_request_history
+                UNION ALL
+                SELECT -id AS id, {columns}, TRUE AS is_archived
+                  FROM technical_service_request_history_archive
+            )
+        """)
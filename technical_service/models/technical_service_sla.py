@@ -1,7 +1,18 @@
 # -*- coding: utf-8 -*-
 
-from odoo import models, fields, api, _
+from datetime import timedelta
+
+from odoo import models, fields, api, tools, _
 from odoo.exceptions import ValidationError
+from odoo.tools import frozendict
+
+from .technical_service_sla_calendar import SLABusinessCalendar
+
+# Fields the business calendar index of a policy is built from
+SLA_CALENDAR_FIELDS = ('x_business_hours_start', 'x_business_hours_end', 'x_include_weekends', 'x_timezone')
+
+# Fields the policy matcher tables of a company are built from
+SLA_MATCHER_FIELDS = ('active', 'company_id', 'x_apply_to', 'x_service_category_ids', 'x_campus_ids', 'x_partner_ids')
 
 class TechnicalServiceSLA(models.Model):
     """
@@ -48,6 +59,12 @@ class TechnicalServiceSLA(models.Model):
         ('Europe/Istanbul', 'Istanbul'),
         ('America/New_York', 'New York'),
     ], string='Timezone', default='Europe/Istanbul')
+    x_holiday_ids = fields.One2many(
+        'technical_service.sla.holiday',
+        'sla_id',
+        string='Holidays',
+        help='Days without business hours (SLA clocks are paused)'
+    )
 
     # SLA Lines by Priority
     x_line_ids = fields.One2many(
@@ -64,27 +81,168 @@ class TechnicalServiceSLA(models.Model):
         string='Escalation Rules'
     )
 
+    @api.constrains('x_business_hours_start', 'x_business_hours_end')
+    def _check_business_hours(self):
+        for record in self:
+            if not 0 <= record.x_business_hours_start < record.x_business_hours_end <= 24:
+                raise ValidationError(_('Business hours must be within 00:00-24:00 and start before they end!'))
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        self.env.registry.clear_cache()
+        return records
+
+    def write(self, vals):
+        result = super().write(vals)
+        if set(SLA_CALENDAR_FIELDS + SLA_MATCHER_FIELDS + ('x_holiday_ids',)) & set(vals):
+            self.env.registry.clear_cache()
+        return result
+
+    def unlink(self):
+        result = super().unlink()
+        self.env.registry.clear_cache()
+        return result
+
+    # ============================================
+    # BUSINESS CALENDAR / DEADLINES
+    # ============================================
+
+    @tools.ormcache('self.id')
+    def _get_business_calendar(self):
+        """
+        Business calendar index of this policy (cached per registry)
+        Invalidated when business hours, timezone or holidays change.
+        Returns: SLABusinessCalendar
+        """
+        self.ensure_one()
+        policy = self.sudo()
+        return SLABusinessCalendar(
+            hours_start=policy.x_business_hours_start,
+            hours_end=policy.x_business_hours_end,
+            include_weekends=policy.x_include_weekends,
+            holidays=policy.x_holiday_ids.mapped('date'),
+            tz=policy.x_timezone or 'UTC',
+        )
+
+    def _get_sla_deadlines(self, sla_line, start):
+        """
+        Response and resolution deadlines of a request opened at start
+
+        Business hours, weekends, holidays and the policy timezone are honored.
+        Requests opened outside business hours use the line's after hours
+        targets (wall-clock hours) when they are set.
+
+        Args:
+            sla_line: technical_service.sla.line of this policy
+            start: naive UTC datetime the SLA clock starts at
+
+        Returns:
+            (response_deadline, resolution_deadline) naive UTC datetimes
+        """
+        self.ensure_one()
+        calendar = self._get_business_calendar()
+        if calendar.is_empty:
+            # No business time configured: count wall-clock hours
+            return (start + timedelta(hours=sla_line.x_response_time),
+                    start + timedelta(hours=sla_line.x_resolution_time))
+
+        after_hours = not calendar.is_business_time(start)
+
+        if after_hours and sla_line.x_after_hours_response:
+            response = start + timedelta(hours=sla_line.x_after_hours_response)
+        else:
+            response = calendar.add_hours(start, sla_line.x_response_time)
+
+        if after_hours and sla_line.x_after_hours_resolution:
+            resolution = start + timedelta(hours=sla_line.x_after_hours_resolution)
+        else:
+            resolution = calendar.add_hours(start, sla_line.x_resolution_time)
+
+        return response, resolution
+
+    # ============================================
+    # POLICY MATCHING
+    # ============================================
+
     @api.model
-    def get_applicable_sla(self, request):
-        """Find applicable SLA policy for a request"""
-        domain = [('active', '=', True)]
+    @tools.ormcache('company_id')
+    def _get_policy_matcher(self, company_id):
+        """
+        Compiled policy lookup tables of a company (cached per registry)
+        Invalidated when a policy changes (SLA lines are not part of it).
+
+        Policies keep their search order (rank); a request gets the policy with
+        the lowest rank among the 'all' policy and the policies listed for its
+        category, campus or customer, which is what the former linear scan did.
+
+        Returns: frozendict {
+            'policies': tuple of policy ids by rank,
+            'all': rank of the first 'all' policy or None,
+            'category' / 'location' / 'customer': frozendict {record id: lowest rank},
+        }
+        """
+        policies = self.sudo().search([('company_id', 'in', [company_id, False])])
+        tables = {'category': {}, 'location': {}, 'customer': {}}
+        first_all = None
+        for rank, policy in enumerate(policies):
+            if policy.x_apply_to == 'all':
+                if first_all is None:
+                    first_all = rank
+                continue
+            if policy.x_apply_to not in tables:
+                # No scope set: the policy applies to nothing (as in the former scan)
+                continue
+            keys = {
+                'category': policy.x_service_category_ids,
+                'location': policy.x_campus_ids,
+                'customer': policy.x_partner_ids,
+            }[policy.x_apply_to]
+            table = tables[policy.x_apply_to]
+            for key_id in keys.ids:
+                table.setdefault(key_id, rank)
 
-        # Search for matching SLA policies
-        sla_policies = self.search(domain)
+        return frozendict({
+            'policies': tuple(policies.ids),
+            'all': first_all,
+            **{apply_to: frozendict(table) for apply_to, table in tables.items()},
+        })
 
-        for sla in sla_policies:
-            if sla.x_apply_to == 'all':
-                return sla
-            elif sla.x_apply_to == 'category' and request.category_id in sla.x_service_category_ids:
-                return sla
-            elif sla.x_apply_to == 'location' and request.x_campus_id in sla.x_campus_ids:
-                return sla
-            elif sla.x_apply_to == 'customer' and request.partner_id in sla.x_partner_ids:
-                return sla
+    @api.model
+    def _match_policy_id(self, company_id, category_id=False, campus_id=False, partner_id=False):
+        """SLA policy id for the given request values, or False (no query once cached)"""
+        matcher = self._get_policy_matcher(company_id or False)
+        ranks = [
+            matcher['all'],
+            matcher['category'].get(category_id),
+            matcher['location'].get(campus_id),
+            matcher['customer'].get(partner_id),
+        ]
+        ranks = [rank for rank in ranks if rank is not None]
+        return matcher['policies'][min(ranks)] if ranks else False
+
+    @api.model
+    def match_many(self, requests):
+        """
+        Find the applicable SLA policy of several requests at once
+        Returns: dict {request id: technical_service.sla record (may be empty)}
+        """
+        has_partner = 'partner_id' in requests._fields
+        result = {}
+        for request in requests:
+            policy_id = self._match_policy_id(
+                request.company_id.id,
+                category_id=request.category_id.id,
+                campus_id=request.x_campus_id.id,
+                partner_id=request.partner_id.id if has_partner else False,
+            )
+            result[request.id] = self.browse(policy_id)
+        return result
 
-        # Return default SLA if exists
-        default_sla = self.search([('x_apply_to', '=', 'all')], limit=1)
-        return default_sla
+    @api.model
+    def get_applicable_sla(self, request):
+        """Find applicable SLA policy for a request"""
+        return self.match_many(request)[request.id]
 
 
 class TechnicalServiceSLALine(models.Model):
@@ -121,6 +279,37 @@ class TechnicalServiceSLALine(models.Model):
                 raise ValidationError(_('Response time cannot be greater than resolution time!'))
 
 
+class TechnicalServiceSLAHoliday(models.Model):
+    """Days without business hours for an SLA policy"""
+    _name = 'technical_service.sla.holiday'
+    _description = 'SLA Holiday'
+    _order = 'date'
+
+    sla_id = fields.Many2one('technical_service.sla', string='SLA Policy', required=True, ondelete='cascade', index=True)
+    name = fields.Char(string='Description', required=True)
+    date = fields.Date(string='Date', required=True)
+
+    _sql_constraints = [
+        ('unique_date_per_sla', 'UNIQUE(sla_id, date)', 'Holiday date must be unique per SLA policy!'),
+    ]
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        self.env.registry.clear_cache()
+        return records
+
+    def write(self, vals):
+        result = super().write(vals)
+        self.env.registry.clear_cache()
+        return result
+
+    def unlink(self):
+        result = super().unlink()
+        self.env.registry.clear_cache()
+        return result
+
+
 class TechnicalServiceSLAEscalation(models.Model):
     """SLA escalation rules"""
     _name = 'technical_service.sla.escalation'
@@ -147,20 +336,39 @@ class TechnicalServiceSLAEscalation(models.Model):
             if not 0 < record.x_trigger_after <= 100:
                 raise ValidationError(_('Trigger percentage must be between 0 and 100!'))
 
+    def _get_trigger_datetime(self, request):
+        """When this rule triggers for a request (x_trigger_after % of its SLA time)"""
+        self.ensure_one()
+        start = fields.Datetime.to_datetime(request.create_date)
+        return start + (request.x_resolution_deadline - start) * (self.x_trigger_after / 100.0)
+
     def execute_escalation(self, request):
-        """Execute escalation actions for a request"""
+        """
+        Execute escalation actions for a request
+        `request` can hold several requests, updates are then written at once.
+        """
+        self.ensure_one()
+        requests = request
+
         # Send notifications
         if self.x_notify_users:
-            request.message_post(
-                body=_(f"SLA Escalation Level {self.x_level}: Request {request.name} needs attention"),
-                partner_ids=self.x_notify_users.mapped('partner_id').ids
-            )
+            partner_ids = self.x_notify_users.mapped('partner_id').ids
+            for req in requests:
+                req.message_post(
+                    body=_("SLA Escalation Level %(level)s: Request %(name)s needs attention",
+                           level=self.x_level, name=req.name),
+                    partner_ids=partner_ids
+                )
+
+        vals = {
+            # Mark escalation in request
+            'x_escalation_level': self.x_level,
+            'x_escalation_date': fields.Datetime.now(),
+            'x_escalated_to': self.x_reassign_to.id,
+        }
 
         # Auto reassign if configured
         if self.x_auto_reassign and self.x_reassign_to:
-            request.technician_user_id = self.x_reassign_to
+            vals['technician_user_id'] = self.x_reassign_to.id
 
-        # Mark escalation in request
-        request.x_escalation_level = self.x_level
-        request.x_escalation_date = fields.Datetime.now()
-        request.x_escalated_to = self.x_reassign_to
\ No newline at end of file
+        requests.write(vals)
@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+
+"""
+SLA Business Calendar
+Purpose: Answer "start + N business hours" for an SLA policy
+
+The calendar is an index built once per SLA policy:
+    - working interval of each weekday (business hours start/end)
+    - cumulative working seconds per weekday (weekly prefix sums)
+    - sorted ordinals of holidays falling on working days
+
+A timestamp maps to a position on the "business time axis" with integer
+arithmetic and the inverse mapping uses a bisect over the weekly prefix
+sums, holidays are skipped with a bisect over the holiday ordinals.
+Each deadline is therefore computed in O(log H) (H = number of holidays)
+regardless of the SLA duration.
+
+Computations are done in the policy's local time (naive local datetimes);
+inputs and outputs are naive UTC datetimes as stored by Odoo.
+"""
+
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timedelta
+
+import pytz
+
+# Reference Monday for the weekly index
+_EPOCH = date(2000, 1, 3)
+_EPOCH_ORDINAL = _EPOCH.toordinal()
+
+
+class SLABusinessCalendar:
+    """Immutable business calendar index of one SLA policy"""
+
+    def __init__(self, hours_start, hours_end, include_weekends=False, holidays=(), tz='UTC'):
+        """
+        Args:
+            hours_start: Business hours start (float hours, e.g. 8.5 = 08:30)
+            hours_end: Business hours end (float hours, 24.0 = midnight)
+            include_weekends: Saturday and Sunday are working days
+            holidays: iterable of datetime.date without business hours
+            tz: Timezone name the business hours are expressed in
+        """
+        self.day_start = int(round(max(hours_start, 0.0) * 3600))
+        self.day_end = int(round(min(hours_end, 24.0) * 3600))
+        self.day_length = max(self.day_end - self.day_start, 0)
+        self.working_weekdays = frozenset(range(7) if include_weekends else range(5))
+        self.tz = pytz.timezone(tz or 'UTC')
+
+        # Weekly prefix sums: cumulative[wd] = working seconds before weekday wd
+        self.cumulative = [0]
+        for weekday in range(7):
+            length = self.day_length if weekday in self.working_weekdays else 0
+            self.cumulative.append(self.cumulative[-1] + length)
+        self.week_length = self.cumulative[-1]
+
+        # Only holidays on working days remove business time
+        self.holidays = sorted({
+            day.toordinal() for day in holidays
+            if day.weekday() in self.working_weekdays
+        })
+
+    @property
+    def is_empty(self):
+        """True if the calendar has no business time at all"""
+        return self.week_length <= 0
+
+    # ------------------------------------------------------------------
+    # Timezone helpers
+    # ------------------------------------------------------------------
+
+    def _to_local(self, dt_utc):
+        return pytz.utc.localize(dt_utc).astimezone(self.tz).replace(tzinfo=None)
+
+    def _to_utc(self, dt_local):
+        return self.tz.localize(dt_local, is_dst=False).astimezone(pytz.utc).replace(tzinfo=None)
+
+    # ------------------------------------------------------------------
+    # Business time axis (local time, holidays not applied)
+    # ------------------------------------------------------------------
+
+    def _position(self, dt_local):
+        """Working seconds between _EPOCH and dt_local (weekly pattern only)"""
+        days = dt_local.toordinal() - _EPOCH_ORDINAL
+        weeks, weekday = divmod(days, 7)
+        position = weeks * self.week_length + self.cumulative[weekday]
+        if weekday in self.working_weekdays:
+            seconds = dt_local.hour * 3600 + dt_local.minute * 60 + dt_local.second
+            position += min(max(seconds - self.day_start, 0), self.day_length)
+        return position
+
+    def _locate(self, position):
+        """
+        Day ordinal and seconds since local midnight of the earliest moment
+        reaching position (inverse of _position)
+
+        Left-continuous: a position reached at the end of a working day maps
+        to that day's end (seconds may be 86400 with 24:00 business hours),
+        not to the next day's start.
+        """
+        if position <= 0:
+            weeks, remainder = divmod(position, self.week_length)
+        else:
+            weeks, remainder = divmod(position - 1, self.week_length)
+            remainder += 1
+        weekday = max(bisect_left(self.cumulative, remainder) - 1, 0)
+        while weekday not in self.working_weekdays:
+            weekday += 1
+        seconds = self.day_start + remainder - self.cumulative[weekday]
+        return _EPOCH_ORDINAL + weeks * 7 + weekday, seconds
+
+    def _from_position(self, position):
+        """Earliest local datetime reaching position (inverse of _position)"""
+        return self._to_datetime(*self._locate(position))
+
+    @staticmethod
+    def _to_datetime(ordinal, seconds):
+        return datetime.combine(date.fromordinal(ordinal), datetime.min.time()) + timedelta(seconds=seconds)
+
+    def _count_holidays(self, first_ordinal, last_ordinal):
+        """Number of holidays with first_ordinal <= ordinal <= last_ordinal"""
+        return bisect_right(self.holidays, last_ordinal) - bisect_left(self.holidays, first_ordinal)
+
+    def _skip_holidays(self, dt_local):
+        """Move dt_local to the start of the day after a holiday run it falls into"""
+        index = bisect_left(self.holidays, dt_local.toordinal())
+        ordinal = dt_local.toordinal()
+        moved = False
+        while index < len(self.holidays) and self.holidays[index] == ordinal:
+            index += 1
+            ordinal += 1
+            moved = True
+        if moved:
+            return datetime.combine(date.fromordinal(ordinal), datetime.min.time())
+        return dt_local
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def is_business_time(self, dt_utc):
+        """True if dt_utc falls within business hours on a working day"""
+        if self.is_empty:
+            return False
+        local = self._to_local(dt_utc)
+        if local.weekday() not in self.working_weekdays:
+            return False
+        if self.holidays and self._count_holidays(local.toordinal(), local.toordinal()):
+            return False
+        seconds = local.hour * 3600 + local.minute * 60 + local.second
+        return self.day_start <= seconds < self.day_end
+
+    def add_hours(self, start_utc, hours):
+        """
+        Deadline reached after `hours` business hours from start_utc
+        Returns: naive UTC datetime, or False if the calendar has no business time
+        """
+        if self.is_empty:
+            return False
+        local = self._skip_holidays(self._to_local(start_utc))
+        first_ordinal = local.toordinal()
+        target = self._position(local) + int(round(hours * 3600))
+
+        # Each holiday crossed pushes the target by one working day;
+        # the count only grows so the loop ends after a few bisects.
+        # Holidays are counted up to the day holding the last business
+        # second: a deadline at 24:00 belongs to that day, not the next one.
+        holiday_count = 0
+        ordinal, seconds = self._locate(target)
+        while self.holidays:
+            count = self._count_holidays(first_ordinal, ordinal)
+            if count == holiday_count:
+                break
+            holiday_count = count
+            ordinal, seconds = self._locate(target + count * self.day_length)
+
+        return self._to_utc(self._to_datetime(ordinal, seconds))
+
+    def add_hours_many(self, starts_utc, hours):
+        """Batch variant of add_hours() for a list of start datetimes"""
+        return [self.add_hours(start, hours) for start in starts_utc]
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models, fields, api, tools
+from odoo.tools import frozendict
+
+# Workflow stage codes and the XML ids they are shipped with
+# (data/technical_service_stages.xml). Codes never change, while stage names
+# can be renamed or translated by administrators.
+STAGE_XMLIDS = {
+    'new': 'stage_new',                                  # Yeni
+    'team_assigned': 'stage_team_assigned',              # Ekip Atandı
+    'on_hold': 'stage_on_hold',                          # Beklemede
+    'work_order_created': 'stage_work_order_created',    # İş Emri Oluşturuldu
+    'in_progress': 'stage_in_progress',                  # Devam Ediyor
+    'pending_approval': 'stage_pending_approval',        # Onayda
+    'completed': 'stage_completed',                      # Tamamlandı
+    'rejected': 'stage_rejected',                        # Reddedildi
+    'cancelled': 'stage_cancelled',                      # İptal Edildi
+}
+
+# Stages where NO ONE can edit the request
+FINAL_STAGE_CODES = ('pending_approval', 'completed', 'rejected', 'cancelled')
+
+
+class TechnicalServiceStage(models.Model):
+    """
+    Service Request Stage
+    Inherited from: maintenance.stage (/opt/odoo/odoo18/addons/maintenance/models/maintenance.py)
+    Purpose: Stable technical code per workflow stage and a cached code → stage registry
+
+    The registry is loaded once per Odoo registry (ormcache) and invalidated
+    whenever stage codes change, so workflow transitions resolve their target
+    stage without querying maintenance.stage.
+    """
+    _inherit = 'maintenance.stage'
+
+    x_code = fields.Char(
+        string='Technical Code',
+        copy=False,
+        index=True,
+        help='Stable workflow code used by the technical service workflow. '
+             'Independent of the stage name, which can be renamed or translated.'
+    )
+
+    _sql_constraints = [
+        ('x_code_unique', 'UNIQUE(x_code)', 'Stage technical code must be unique!'),
+    ]
+
+    @api.model
+    @tools.ormcache()
+    def _get_stage_registry(self):
+        """
+        Get the workflow stage registry
+        Returns: frozendict {code: maintenance.stage id}
+
+        Stages are resolved by their shipped XML id first, an explicit x_code
+        set on a stage takes precedence.
+        """
+        registry = {}
+        xmlid_codes = {name: code for code, name in STAGE_XMLIDS.items()}
+        imd_rows = self.env['ir.model.data'].sudo().search_read([
+            ('module', '=', 'technical_service'),
+            ('model', '=', 'maintenance.stage'),
+            ('name', 'in', list(xmlid_codes)),
+        ], ['name', 'res_id'])
+        for row in imd_rows:
+            registry[xmlid_codes[row['name']]] = row['res_id']
+
+        coded_stages = self.sudo().with_context(active_test=False).search_read(
+            [('x_code', '!=', False)], ['x_code']
+        )
+        for stage in coded_stages:
+            registry[stage['x_code']] = stage['id']
+
+        return frozendict(registry)
+
+    @api.model
+    def _get_stage_code_map(self):
+        """Reverse registry: {maintenance.stage id: code}"""
+        return {stage_id: code for code, stage_id in self._get_stage_registry().items()}
+
+    @api.model
+    def _sync_stage_codes(self):
+        """Set x_code on shipped stages that do not have one yet (module install/upgrade)"""
+        for code, xmlid in STAGE_XMLIDS.items():
+            stage = self.env.ref(f'technical_service.{xmlid}', raise_if_not_found=False)
+            if stage and not stage.x_code:
+                stage.write({'x_code': code})
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        if any(vals.get('x_code') for vals in vals_list):
+            self.env.registry.clear_cache()
+        return records
+
+    def write(self, vals):
+        result = super().write(vals)
+        if 'x_code' in vals:
+            self.env.registry.clear_cache()
+        return result
+
+    def unlink(self):
+        result = super().unlink()
+        self.env.registry.clear_cache()
+        return result
@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+
+from collections import defaultdict
+
+from odoo import models, fields, api, tools
+from odoo.tools import SQL
+
+
+class TechnicalServiceStageInterval(models.Model):
+    """
+    Stage Interval (dwell time fact table)
+    Purpose: One row per stay of a request in a stage
+
+    Rows are appended by the request history: every stage change closes the
+    request's open interval (left_at) and opens one for the new stage.
+    Team, category and priority are snapshotted when the stage is entered,
+    so read_group / pivot queries never join the request.
+    """
+    _name = 'technical_service.stage.interval'
+    _description = 'Stage Interval'
+    _order = 'entered_at desc, id desc'
+    _rec_name = 'stage_id'
+
+    request_id = fields.Many2one(
+        'maintenance.request',
+        string='Service Request',
+        required=True,
+        ondelete='cascade',
+        index=True
+    )
+    stage_id = fields.Many2one('maintenance.stage', string='Stage', required=True, index=True)
+    entered_at = fields.Datetime(string='Entered At', required=True, index=True)
+    left_at = fields.Datetime(string='Left At', index=True, help='Empty while the request is in this stage')
+    duration = fields.Float(
+        string='Dwell Time (Hours)',
+        compute='_compute_duration',
+        store=True,
+        aggregator='avg',
+        help='Time spent in the stage (closed intervals only)'
+    )
+
+    team_id = fields.Many2one('maintenance.team', string='Team', index=True)
+    category_id = fields.Many2one('maintenance.equipment.category', string='Category', index=True)
+    priority = fields.Selection([
+        ('p4', 'P4 - Low'),
+        ('p3', 'P3 - Medium'),
+        ('p2', 'P2 - High'),
+        ('p1', 'P1 - Critical'),
+    ], string='Priority Level', index=True)
+    company_id = fields.Many2one('res.company', string='Company', index=True)
+
+    def init(self):
+        # Dwell queries filter on a period and group by stage
+        tools.create_index(
+            self.env.cr, 'technical_service_stage_interval_stage_entered_idx',
+            self._table, ['stage_id', 'entered_at'],
+        )
+
+    @api.depends('entered_at', 'left_at')
+    def _compute_duration(self):
+        for interval in self:
+            if interval.entered_at and interval.left_at:
+                interval.duration = (interval.left_at - interval.entered_at).total_seconds() / 3600.0
+            else:
+                interval.duration = 0.0
+
+    # ============================================
+    # INCREMENTAL POPULATION
+    # ============================================
+
+    @api.model
+    def _track_stage_changes(self, history):
+        """
+        Close and open intervals for the stage change rows of `history`
+        (technical_service.request.history records), with one search for the
+        open intervals, one write per timestamp and one create.
+        """
+        changes = history.filtered(
+            lambda h: h.event_type == 'stage_change' and h.new_stage_id
+        ).sorted(lambda h: (h.timestamp, h.id))
+        if not changes:
+            return
+
+        Interval = self.sudo()
+        open_by_request = defaultdict(list)
+        for interval in Interval.search([
+            ('request_id', 'in', changes.request_id.ids),
+            ('left_at', '=', False),
+        ]):
+            open_by_request[interval.request_id.id].append(interval.id)
+
+        close_ids_by_timestamp = defaultdict(list)
+        new_vals_by_request = {}
+        new_vals_list = []
+        for change in changes:
+            request = change.request_id
+            if request.id in new_vals_by_request:
+                new_vals_by_request[request.id]['left_at'] = change.timestamp
+            else:
+                close_ids_by_timestamp[change.timestamp].extend(open_by_request.pop(request.id, []))
+
+            vals = {
+                'request_id': request.id,
+                'stage_id': change.new_stage_id.id,
+                'entered_at': change.timestamp,
+                'team_id': request.maintenance_team_id.id,
+                'category_id': request.category_id.id,
+                'priority': request.x_priority_level,
+                'company_id': request.company_id.id,
+            }
+            new_vals_by_request[request.id] = vals
+            new_vals_list.append(vals)
+
+        for timestamp, interval_ids in close_ids_by_timestamp.items():
+            if interval_ids:
+                Interval.browse(interval_ids).write({'left_at': timestamp})
+        Interval.create(new_vals_list)
+
+    @api.model
+    def _rebuild_from_history(self):
+        """
+        Rebuild all intervals from the request history (one INSERT ... SELECT
+        with a LEAD() window). Used by the 18.0.1.2.0 migration.
+        """
+        self.env.flush_all()
+        self.env.cr.execute("DELETE FROM technical_service_stage_interval")
+        self.env.cr.execute("""
+            INSERT INTO technical_service_stage_interval
+                   (request_id, stage_id, entered_at, left_at, duration,
+                    team_id, category_id, priority, company_id,
+                    create_uid, create_date, write_uid, write_date)
+            SELECT changes.request_id, changes.new_stage_id, changes.timestamp, changes.left_at,
+                   COALESCE(EXTRACT(EPOCH FROM changes.left_at - changes.timestamp) / 3600.0, 0.0),
+                   request.maintenance_team_id, request.category_id, request.x_priority_level, request.company_id,
+                   %(uid)s, now() at time zone 'UTC', %(uid)s, now() at time zone 'UTC'
+              FROM (
+                    SELECT request_id, new_stage_id, timestamp,
+                           LEAD(timestamp) OVER (PARTITION BY request_id ORDER BY timestamp, id) AS left_at
+                      FROM technical_service_request_history
+                     WHERE event_type = 'stage_change' AND new_stage_id IS NOT NULL
+                   ) changes
+              JOIN maintenance_request request ON request.id = changes.request_id
+        """, {'uid': self.env.uid})
+        self.invalidate_model()
+        return True
+
+    # ============================================
+    # PERCENTILES
+    # ============================================
+
+    @api.model
+    def get_dwell_percentiles(self, domain=None, groupby=('stage_id',), percentiles=(0.5, 0.9)):
+        """
+        Dwell time percentiles of closed intervals, computed by PostgreSQL
+        (percentile_cont) in a single grouped query
+
+        Args:
+            domain: search domain on intervals (record rules apply)
+            groupby: interval field names to group by
+            percentiles: fractions between 0 and 1
+
+        Returns:
+            list of dicts {<groupby field>: value, 'count': n, 'p50': hours, ...}
+        """
+        groupby = [fname for fname in groupby if self._fields[fname].store]
+        query = self._search(list(domain or []) + [('left_at', '!=', False)])
+        query.order = None
+        group_sql = [self._field_to_sql(self._table, fname, query) for fname in groupby]
+        duration_sql = self._field_to_sql(self._table, 'duration', query)
+        percentile_sql = [
+            SQL("percentile_cont(%s) WITHIN GROUP (ORDER BY %s)", fraction, duration_sql)
+            for fraction in percentiles
+        ]
+        if group_sql:
+            query.groupby = SQL(", ").join(group_sql)
+        self.env.cr.execute(query.select(*group_sql, SQL("COUNT(*)"), *percentile_sql))
+
+        keys = list(groupby) + ['count'] + ['p%d' % round(fraction * 100) for fraction in percentiles]
+        return [dict(zip(keys, row)) for row in self.env.cr.fetchall()]
+
+
+class TechnicalServiceStageDwellReport(models.Model):
+    """
+    Stage Dwell Time Report
+    Purpose: p50/p90 dwell time per stage, team, category, priority and month
+
+    SQL view with one row per closed interval. The percentile measures are
+    aggregated with percentile_cont over the intervals of each group
+    (_read_group_select), so every pivot cell, subtotal and total is the
+    exact percentile of its intervals, whatever the grouping.
+    """
+    _name = 'technical_service.stage.dwell.report'
+    _description = 'Stage Dwell Time Report'
+    _auto = False
+    _order = 'month desc'
+    _rec_name = 'stage_id'
+
+    month = fields.Date(string='Month', readonly=True)
+    stage_id = fields.Many2one('maintenance.stage', string='Stage', readonly=True)
+    team_id = fields.Many2one('maintenance.team', string='Team', readonly=True)
+    category_id = fields.Many2one('maintenance.equipment.category', string='Category', readonly=True)
+    priority = fields.Selection([
+        ('p4', 'P4 - Low'),
+        ('p3', 'P3 - Medium'),
+        ('p2', 'P2 - High'),
+        ('p1', 'P1 - Critical'),
+    ], string='Priority Level', readonly=True)
+    company_id = fields.Many2one('res.company', string='Company', readonly=True)
+    interval_count = fields.Integer(string='Intervals', readonly=True, aggregator='sum')
+    avg_duration = fields.Float(string='Average (Hours)', readonly=True, aggregator='avg')
+    # Aggregated as percentiles whatever the aggregator (see _read_group_select)
+    p50_duration = fields.Float(string='P50 (Hours)', readonly=True, aggregator='max')
+    p90_duration = fields.Float(string='P90 (Hours)', readonly=True, aggregator='max')
+
+    # Percentile measure -> fraction
+    _PERCENTILE_FIELDS = {'p50_duration': 0.5, 'p90_duration': 0.9}
+
+    def init(self):
+        tools.drop_view_if_exists(self.env.cr, self._table)
+        self.env.cr.execute("""
+            CREATE OR REPLACE VIEW %s AS (
+                SELECT id,
+                       date_trunc('month', entered_at)::date AS month,
+                       stage_id, team_id, category_id, priority, company_id,
+                       1 AS interval_count,
+                       duration AS avg_duration,
+                       duration AS p50_duration,
+                       duration AS p90_duration
+                  FROM technical_service_stage_interval
+                 WHERE left_at IS NOT NULL
+            )
+        """ % self._table)
+
+    def _read_group_select(self, aggregate_spec, query):
+        fname = aggregate_spec.split(':')[0]
+        if fname in self._PERCENTILE_FIELDS:
+            return SQL(
+                "percentile_cont(%s) WITHIN GROUP (ORDER BY %s)",
+                self._PERCENTILE_FIELDS[fname],
+                self._field_to_sql(self._table, fname, query),
+            )
+        return super()._read_group_select(aggregate_spec, query)
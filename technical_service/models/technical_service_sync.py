@@ -0,0 +1,308 @@
+# -*- coding: utf-8 -*-
+
+from datetime import timedelta
+
+from odoo import models, fields, api, _
+from odoo.exceptions import AccessError, ValidationError, UserError
+
+from .technical_service_work_order import WORK_ORDER_TRANSITIONS
+
+# Models synchronized to the field technician devices and the fields sent
+SYNC_MODELS = {
+    'technical_service.work_order': [
+        'name', 'description', 'priority', 'x_request_id', 'x_technician_id',
+        'x_work_type', 'x_scheduled_date', 'x_start_datetime', 'x_end_datetime',
+        'x_work_status', 'x_checklist_progress', 'x_work_performed',
+        'x_root_cause', 'x_recommendations', 'write_date',
+    ],
+    'technical_service.work_order.checklist': [
+        'work_order_id', 'sequence', 'name', 'description', 'is_done',
+        'done_date', 'notes', 'write_date',
+    ],
+    'technical_service.work_order.parts': [
+        'work_order_id', 'product_id', 'quantity', 'unit_price', 'subtotal',
+        'notes', 'write_date',
+    ],
+    'technical_service.work_order.timelog': [
+        'work_order_id', 'technician_id', 'start_time', 'end_time', 'duration',
+        'work_description', 'x_sync_uuid', 'write_date',
+    ],
+}
+
+# Pull windows overlap by this much: rows written by a transaction that
+# started before the previous pull but committed after it are sent again
+SYNC_CURSOR_OVERLAP = timedelta(minutes=2)
+
+# Tombstones are kept this long; older cursors get a full resync
+SYNC_TOMBSTONE_RETENTION = timedelta(days=30)
+
+# Maximum number of mutations accepted in one push
+SYNC_MAX_MUTATIONS = 500
+
+# Work order workflow mutations and the action implementing each of them
+# (statuses: WORK_ORDER_TRANSITIONS)
+SYNC_WORKFLOW_ACTIONS = {
+    'start': 'action_start_work',
+    'pause': 'action_pause_work',
+    'resume': 'action_resume_work',
+    'complete': 'action_complete_work',
+}
+
+
+class TechnicalServiceSyncTombstone(models.Model):
+    """
+    Sync Tombstone
+    Purpose: Remember deleted work order records for delta pulls
+
+    One row per deleted record of a synchronized model, so devices pulling
+    with an older cursor learn about deletions. Rows older than the
+    retention period are purged by a cron.
+    """
+    _name = 'technical_service.sync.tombstone'
+    _description = 'Sync Tombstone'
+    _order = 'deleted_at, id'
+    _log_access = False
+
+    res_model = fields.Char(string='Model', required=True, index=True)
+    res_id = fields.Integer(string='Record ID', required=True)
+    work_order_id = fields.Integer(string='Work Order ID', index=True)
+    deleted_at = fields.Datetime(string='Deleted At', required=True, index=True)
+
+    @api.model
+    def _record_deletion(self, records, work_order_ids):
+        """
+        Log tombstones of records about to be deleted (one create)
+
+        Args:
+            records: recordset of a synchronized model
+            work_order_ids: {record id: work order id} used to scope pulls
+        """
+        if not records:
+            return
+        now = self.env.cr.now()
+        self.sudo().create([{
+            'res_model': records._name,
+            'res_id': record_id,
+            'work_order_id': work_order_ids.get(record_id),
+            'deleted_at': now,
+        } for record_id in records.ids])
+
+    @api.model
+    def _cron_purge(self):
+        """Delete tombstones older than the retention period"""
+        cutoff = fields.Datetime.now() - SYNC_TOMBSTONE_RETENTION
+        self.env.cr.execute(
+            "DELETE FROM technical_service_sync_tombstone WHERE deleted_at < %s", [cutoff]
+        )
+        return True
+
+
+class TechnicalServiceSync(models.AbstractModel):
+    """
+    Field Technician Sync
+    Purpose: Offline-capable delta sync of work orders for mobile devices
+
+    pull(cursor): work orders of the technician, checklist lines, parts and
+    time logs changed since the cursor (write_date watermark), tombstones of
+    deleted records and the ids of the work orders still assigned.
+
+    push(mutations): batched workflow actions (start/pause/resume/complete),
+    checklist ticks and time logs applied in one round-trip. Each mutation
+    runs in its own savepoint and gets its own result; conflicts are
+    resolved deterministically (see _apply_mutation).
+    """
+    _name = 'technical_service.sync'
+    _description = 'Field Technician Sync'
+
+    # ============================================
+    # PULL
+    # ============================================
+
+    @api.model
+    def pull(self, cursor=None):
+        """
+        Delta pull for the current technician
+
+        Args:
+            cursor: value returned by the previous pull (None: full sync)
+
+        Returns:
+            dict with 'cursor', 'full', 'scope', 'records' {model: [values]}
+            and 'deleted' {model: [ids]}
+        """
+        now = self.env.cr.now()
+        since = fields.Datetime.to_datetime(cursor) if cursor else None
+        full = not since or since < now - SYNC_TOMBSTONE_RETENTION
+        if full:
+            since = None
+        else:
+            since -= SYNC_CURSOR_OVERLAP
+
+        WorkOrder = self.env['technical_service.work_order']
+        scope = WorkOrder.search(self._get_work_order_domain())
+        scope_ids = scope.ids
+
+        records = {}
+        for model_name, field_names in SYNC_MODELS.items():
+            Model = self.env[model_name]
+            if model_name == 'technical_service.work_order':
+                domain = [('id', 'in', scope_ids)]
+            else:
+                domain = [('work_order_id', 'in', scope_ids)]
+            if since:
+                domain.append(('write_date', '>=', since))
+            records[model_name] = Model.search_read(domain, field_names, order='id')
+
+        deleted = {}
+        if since:
+            for tombstone in self.env['technical_service.sync.tombstone'].sudo().search_read(
+                [('deleted_at', '>=', since)], ['res_model', 'res_id', 'work_order_id'],
+            ):
+                if tombstone['res_model'] == 'technical_service.work_order' \
+                        or tombstone['work_order_id'] in scope_ids:
+                    deleted.setdefault(tombstone['res_model'], []).append(tombstone['res_id'])
+
+        return {
+            'cursor': fields.Datetime.to_string(now),
+            'full': full,
+            'scope': scope_ids,
+            'records': records,
+            'deleted': deleted,
+        }
+
+    @api.model
+    def _get_work_order_domain(self):
+        """Work orders synchronized to the current user's devices"""
+        return [
+            ('x_technician_user_id', '=', self.env.uid),
+            ('x_work_status', 'not in', ('completed', 'cancelled')),
+        ]
+
+    # ============================================
+    # PUSH
+    # ============================================
+
+    @api.model
+    def push(self, mutations):
+        """
+        Apply a batch of device mutations
+
+        Mutations are applied in (client_time, position) order. Each one is a
+        dict with 'id' (client mutation id), 'type' and type specific keys:
+            start/pause/resume/complete: work_order_id
+            checklist: checklist_id, is_done, notes (optional), base_write_date
+            timelog: work_order_id, uuid, start_time, end_time, work_description
+
+        Returns:
+            list of {'id', 'status': 'applied'|'noop'|'conflict'|'error', 'error', 'server'}
+        """
+        if not isinstance(mutations, list):
+            raise UserError(_('Mutations must be a list'))
+        if len(mutations) > SYNC_MAX_MUTATIONS:
+            raise UserError(_('At most %s mutations can be sent in one call', SYNC_MAX_MUTATIONS))
+
+        ordered = sorted(
+            enumerate(mutations),
+            key=lambda item: (str(item[1].get('client_time') or '') if isinstance(item[1], dict) else '', item[0]),
+        )
+        results = [None] * len(mutations)
+        History = self.env['technical_service.request.history']
+        for index, mutation in ordered:
+            result = {'id': mutation.get('id') if isinstance(mutation, dict) else None, 'error': None}
+            try:
+                # History of a mutation is inserted inside its savepoint, or
+                # dropped with it when the mutation fails
+                with self.env.cr.savepoint(), History.buffered():
+                    result.update(self._apply_mutation(mutation))
+            except (UserError, ValidationError, AccessError) as error:
+                result.update(status='error', error=str(error.args[0]))
+            results[index] = result
+        return results
+
+    @api.model
+    def _apply_mutation(self, mutation):
+        """
+        Apply one mutation and resolve conflicts deterministically:
+
+        - workflow actions: applied if the work order is in a source status,
+          'noop' if it already is in the target status (retried mutation),
+          'conflict' otherwise (server state wins)
+        - checklist ticks: applied if the line did not change since the
+          client's base_write_date; on a concurrent change a tick (done)
+          still wins, an untick or a note edit is a 'conflict'
+        - time logs: append-only closed intervals, deduplicated on the client uuid
+        """
+        if not isinstance(mutation, dict):
+            raise ValidationError(_('Each mutation must be an object'))
+        mutation_type = mutation.get('type')
+
+        if mutation_type in SYNC_WORKFLOW_ACTIONS:
+            source_statuses, target_status = WORK_ORDER_TRANSITIONS[mutation_type]
+            # Status is checked under the row lock the action runs with
+            work_order = self._get_work_order(mutation.get('work_order_id'))._lock_work_orders()
+            if work_order.x_work_status == target_status:
+                return {'status': 'noop', 'server': self._server_values(work_order)}
+            if work_order.x_work_status not in source_statuses:
+                return {'status': 'conflict', 'server': self._server_values(work_order)}
+            getattr(work_order, SYNC_WORKFLOW_ACTIONS[mutation_type])()
+            return {'status': 'applied', 'server': self._server_values(work_order)}
+
+        if mutation_type == 'checklist':
+            line = self.env['technical_service.work_order.checklist'].browse(
+                mutation.get('checklist_id')
+            ).exists()
+            if not line:
+                raise ValidationError(_('Checklist line not found'))
+            self._get_work_order(line.work_order_id.id)
+            base = fields.Datetime.to_datetime(mutation.get('base_write_date'))
+            is_done = bool(mutation.get('is_done'))
+            if line.is_done == is_done and mutation.get('notes', line.notes) == line.notes:
+                return {'status': 'noop', 'server': self._server_values(line)}
+            # pull() sends write_date at second precision: compare at that precision
+            changed = not base or line.write_date.replace(microsecond=0) > base
+            if changed and not (is_done and 'notes' not in mutation):
+                return {'status': 'conflict', 'server': self._server_values(line)}
+            vals = {'is_done': is_done, 'done_date': fields.Datetime.now() if is_done else False}
+            if 'notes' in mutation:
+                vals['notes'] = mutation['notes']
+            line.write(vals)
+            return {'status': 'applied', 'server': self._server_values(line)}
+
+        if mutation_type == 'timelog':
+            work_order = self._get_work_order(mutation.get('work_order_id'))
+            uuid = mutation.get('uuid')
+            if not uuid:
+                raise ValidationError(_('Time logs need a client uuid'))
+            if not mutation.get('end_time'):
+                # Running timers only come from start/resume (one per work order)
+                raise ValidationError(_('Time logs sent by devices must have an end time'))
+            TimeLog = self.env['technical_service.work_order.timelog']
+            existing = TimeLog.search([('x_sync_uuid', '=', uuid)], limit=1)
+            if existing:
+                return {'status': 'noop', 'server': self._server_values(existing)}
+            timelog = TimeLog.create({
+                'work_order_id': work_order.id,
+                'technician_id': work_order.x_technician_id.id,
+                'start_time': fields.Datetime.to_datetime(mutation.get('start_time')),
+                'end_time': fields.Datetime.to_datetime(mutation.get('end_time')),
+                'work_description': mutation.get('work_description'),
+                'x_sync_uuid': uuid,
+            })
+            return {'status': 'applied', 'server': self._server_values(timelog)}
+
+        raise ValidationError(_('Unknown mutation type: %s', mutation_type))
+
+    @api.model
+    def _get_work_order(self, work_order_id):
+        """Work order of a mutation, which must be assigned to the current user"""
+        work_order = self.env['technical_service.work_order'].browse(work_order_id or []).exists()
+        if not work_order or len(work_order) != 1:
+            raise ValidationError(_('Work order not found'))
+        if work_order.x_technician_user_id.id != self.env.uid:
+            raise AccessError(_('This work order is not assigned to you'))
+        return work_order
+
+    @api.model
+    def _server_values(self, record):
+        """Current server values of a record, as sent by pull()"""
+        return record.read(SYNC_MODELS[record._name])[0]
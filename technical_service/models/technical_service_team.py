@@ -1,8 +1,26 @@
 # -*- coding: utf-8 -*-
 
+from datetime import datetime
+
 from odoo import models, fields, api, _
 from odoo.exceptions import ValidationError
 
+# Advisory lock namespace (pg_advisory_xact_lock(key, team id)) serializing dispatch per team
+DISPATCH_LOCK_KEY = 720417
+
+# Score weights of each assignment method
+#   skill:    request category in the member's skill categories
+#   coverage: request campus in the member's coverage areas
+#   shift:    member works the team's current shift (or is flexible)
+#   load:     penalty per open request of the member (live, incl. this pass)
+#   recency:  penalty for recently assigned members (round robin order)
+DISPATCH_STRATEGY_WEIGHTS = {
+    'round_robin': {'skill': 0.0, 'coverage': 0.0, 'shift': 5.0, 'load': 0.1, 'recency': 10.0},
+    'least_loaded': {'skill': 0.0, 'coverage': 0.0, 'shift': 5.0, 'load': 10.0, 'recency': 0.1},
+    'skill_based': {'skill': 100.0, 'coverage': 10.0, 'shift': 5.0, 'load': 1.0, 'recency': 0.1},
+    'location_based': {'skill': 10.0, 'coverage': 100.0, 'shift': 5.0, 'load': 1.0, 'recency': 0.1},
+}
+
 class TechnicalServiceTeam(models.Model):
     """
     Technical Service Team Management
@@ -109,6 +127,25 @@ class TechnicalServiceTeam(models.Model):
         compute='_compute_member_count'
     )
 
+    # Denormalized users for record rules (indexed, filtered on directly)
+    x_member_user_ids = fields.Many2many(
+        'res.users',
+        'technical_service_team_member_user_rel',
+        'team_id',
+        'user_id',
+        string='Member Users',
+        compute='_compute_member_user_ids',
+        store=True,
+        help='Users of the team members'
+    )
+    x_leader_user_id = fields.Many2one(
+        'res.users',
+        string='Team Leader User',
+        related='team_leader_user_id.user_id',
+        store=True,
+        index=True
+    )
+
     # Shift Information
     x_shift_type = fields.Selection([
         ('regular', 'Regular Hours'),
@@ -165,6 +202,10 @@ class TechnicalServiceTeam(models.Model):
         for team in self:
             team.x_member_count = len(team.x_member_ids)
 
+    @api.depends('x_member_ids.user_id')
+    def _compute_member_user_ids(self):
+        for team in self:
+            team.x_member_user_ids = team.x_member_ids.user_id
 
     @api.depends('parent_id', 'parent_id.hierarchy_path')
     def _compute_hierarchy_path(self):
@@ -190,33 +231,13 @@ class TechnicalServiceTeam(models.Model):
                 team.hierarchy_level = level
 
     def _compute_workload(self):
+        """Read the materialized workload counters (technical_service.workload)"""
+        counters_by_team, _counters_by_user = self.env['technical_service.workload']._get_counters(team_ids=self.ids)
         for team in self:
-            # Active requests
-            active_requests = self.env['maintenance.request'].search([
-                ('maintenance_team_id', '=', team.id),
-                ('stage_id.done', '=', False)
-            ])
-            team.x_active_requests = len(active_requests)
-
-            # Pending requests
-            pending_requests = active_requests.filtered(
-                lambda r: not r.user_id
-            )
-            team.x_pending_requests = len(pending_requests)
-
-            # Average resolution time
-            completed_requests = self.env['maintenance.request'].search([
-                ('maintenance_team_id', '=', team.id),
-                ('stage_id.done', '=', True),
-                ('x_resolution_time', '>', 0)
-            ], limit=100)  # Last 100 for performance
-
-            if completed_requests:
-                team.x_avg_resolution_time = sum(
-                    completed_requests.mapped('x_resolution_time')
-                ) / len(completed_requests)
-            else:
-                team.x_avg_resolution_time = 0.0
+            counters = counters_by_team.get(team.id, {})
+            team.x_active_requests = counters.get('active', 0)
+            team.x_pending_requests = counters.get('pending', 0)
+            team.x_avg_resolution_time = counters.get('avg_resolution_time', 0.0)
 
     @api.constrains('x_is_default_assignment_team')
     def _check_default_assignment_team(self):
@@ -239,53 +260,128 @@ class TechnicalServiceTeam(models.Model):
         if not self.x_auto_assign:
             return False
 
-        # Get available members
-        available_members = self.x_member_ids.filtered(
-            lambda m: m.x_is_available
-        )
-
-        if not available_members:
-            return False
+        return bool(self.env['maintenance.team'].dispatch_requests(request, team=self))
 
-        # Assignment based on method
-        if self.x_assignment_method == 'round_robin':
-            # Get least recently assigned member
-            member = available_members.sorted('x_last_assigned_date')[0]
-
-        elif self.x_assignment_method == 'least_loaded':
-            # Get member with least active requests
-            member = min(available_members, key=lambda m: m.x_active_request_count)
-
-        elif self.x_assignment_method == 'skill_based':
-            # Match skills with request category
-            skilled_members = available_members.filtered(
-                lambda m: request.category_id.id in m.x_skill_category_ids.ids
-            )
-            if skilled_members:
-                member = skilled_members[0]
-            else:
-                member = available_members[0]
-
-        elif self.x_assignment_method == 'location_based':
-            # Assign based on location proximity
-            location_members = available_members.filtered(
-                lambda m: request.x_campus_id.id in m.x_coverage_campus_ids.ids
-            )
-            if location_members:
-                member = location_members[0]
-            else:
-                member = available_members[0]
+    # ============================================
+    # DISPATCH ENGINE
+    # ============================================
 
-        else:
-            member = available_members[0]
+    @api.model
+    def dispatch_requests(self, requests, team=None):
+        """
+        Assign technicians to a batch of unassigned requests in one pass
+
+        Requests are grouped by team (teams with auto assignment only). For each
+        team the engine
+            1. takes a transaction-level advisory lock on the team, so concurrent
+               workers dispatching the same team run one after the other
+            2. locks the still unassigned requests (FOR UPDATE SKIP LOCKED), so a
+               request is never assigned twice
+            3. scores every available member for each request with the weights
+               of the team's assignment method (DISPATCH_STRATEGY_WEIGHTS) and
+               picks the best one, updating the member's load as it goes
+
+        Assignments are written with one write per technician.
+        If `team` is given, all requests are dispatched to its members.
+        Returns: dict {request id: res.users id} of the assignments made
+        """
+        team_id = team.id if team else False
+        requests = requests.filtered(lambda r: not r.technician_user_id and (team_id or r.maintenance_team_id))
+        if not requests:
+            return {}
+
+        requests_by_team = {}
+        for request in requests:
+            requests_by_team.setdefault(team_id or request.maintenance_team_id.id, []).append(request.id)
+
+        Request = self.env['maintenance.request']
+        Request.flush_model(['technician_user_id'])
+        teams = self.browse(sorted(requests_by_team))  # fixed lock order, no deadlocks
+        members = teams.x_member_ids.filtered(lambda m: m.x_is_available and m.user_id)
+        _counters_by_team, counters_by_user = self.env['technical_service.workload']._get_counters(
+            user_ids=members.user_id.ids
+        )
+        load_by_user = {user_id: counters['active'] for user_id, counters in counters_by_user.items()}
+
+        assignments = {}
+        for dispatch_team in teams:
+            if not dispatch_team.x_auto_assign:
+                continue
+            team_members = members.filtered(lambda m: m.team_id == dispatch_team)
+            if not team_members:
+                continue
+
+            self.env.cr.execute("SELECT pg_advisory_xact_lock(%s, %s)", [DISPATCH_LOCK_KEY, dispatch_team.id])
+            self.env.cr.execute("""
+                SELECT id FROM maintenance_request
+                 WHERE id IN %s AND technician_user_id IS NULL
+                 ORDER BY id
+                   FOR UPDATE SKIP LOCKED
+            """, [tuple(requests_by_team[dispatch_team.id])])
+            claimed = Request.browse([row[0] for row in self.env.cr.fetchall()])
+
+            assignments.update(dispatch_team._dispatch_team(claimed, team_members, load_by_user))
+
+        # One write per technician (history and workload are handled by write())
+        request_ids_by_user = {}
+        for request_id, user_id in assignments.items():
+            request_ids_by_user.setdefault(user_id, []).append(request_id)
+        for user_id, request_ids in request_ids_by_user.items():
+            Request.browse(request_ids).write({'technician_user_id': user_id})
+
+        assigned_members = members.filtered(lambda m: m.user_id.id in request_ids_by_user)
+        if assigned_members:
+            assigned_members.write({'x_last_assigned_date': fields.Datetime.now()})
+
+        return assignments
+
+    def _dispatch_team(self, requests, members, load_by_user):
+        """
+        Pick a member for each request of this team (pure scoring, no writes)
+        load_by_user is updated in place with the assignments made.
+        Returns: dict {request id: res.users id}
+        """
+        self.ensure_one()
+        weights = DISPATCH_STRATEGY_WEIGHTS.get(self.x_assignment_method, DISPATCH_STRATEGY_WEIGHTS['round_robin'])
+        current_shift = self.x_current_shift
+
+        # Static part of each member's score, computed once per member
+        ordered = members.sorted(lambda m: (m.x_last_assigned_date or datetime.min, m.id))
+        size = len(ordered) or 1
+        candidates = []
+        for rank, member in enumerate(ordered):
+            on_shift = not current_shift or member.x_shift in (current_shift, 'flexible')
+            candidates.append({
+                'user_id': member.user_id.id,
+                'skills': frozenset(member.x_skill_category_ids.ids),
+                'campuses': frozenset(member.x_coverage_campus_ids.ids),
+                'base': weights['shift'] if on_shift else 0.0,
+                'order': rank,
+            })
+        next_order = size
+
+        assignments = {}
+        for request in requests:
+            category_id = request.category_id.id
+            campus_id = request.x_campus_id.id
+            best, best_score = None, None
+            for candidate in candidates:
+                score = (
+                    candidate['base']
+                    + (weights['skill'] if category_id in candidate['skills'] else 0.0)
+                    + (weights['coverage'] if campus_id in candidate['campuses'] else 0.0)
+                    - weights['load'] * load_by_user.get(candidate['user_id'], 0)
+                    - weights['recency'] * candidate['order'] / size
+                )
+                if best_score is None or score > best_score:
+                    best, best_score = candidate, score
 
-        # Assign technician
-        if member:
-            request.technician_user_id = member.user_id
-            member.x_last_assigned_date = fields.Datetime.now()
-            return True
+            assignments[request.id] = best['user_id']
+            load_by_user[best['user_id']] = load_by_user.get(best['user_id'], 0) + 1
+            best['order'] = next_order
+            next_order += 1
 
-        return False
+        return assignments
 
 
 class TechnicalServiceTeamMember(models.Model):
@@ -498,22 +594,14 @@ class TechnicalServiceTeamMember(models.Model):
     # ============================================
 
     def _compute_workload(self):
+        """Read the materialized workload counters of the member's user"""
+        _counters_by_team, counters_by_user = self.env['technical_service.workload']._get_counters(
+            user_ids=self.user_id.ids
+        )
         for member in self:
-            # Active requests
-            active_requests = self.env['maintenance.request'].search([
-                ('technician_user_id', '=', member.user_id.id),
-                ('stage_id.done', '=', False)
-            ])
-            member.x_active_request_count = len(active_requests)
-
-            # Completed today
-            today_start = fields.Datetime.now().replace(hour=0, minute=0, second=0)
-            completed_today = self.env['maintenance.request'].search([
-                ('technician_user_id', '=', member.user_id.id),
-                ('close_date', '>=', today_start),
-                ('stage_id.done', '=', True)
-            ])
-            member.x_completed_today = len(completed_today)
+            counters = counters_by_user.get(member.user_id.id, {})
+            member.x_active_request_count = counters.get('active', 0)
+            member.x_completed_today = counters.get('completed_today', 0)
 
     @api.onchange('x_availability_status')
     def _onchange_availability_status(self):
@@ -546,4 +634,4 @@ class TechnicalServiceTeamMember(models.Model):
                     ('id', '!=', member.id)
                 ])
                 if other_leaders:
-                    raise ValidationError(_('Bir ekipte sadece bir takım lideri olabilir!'))
\ No newline at end of file
+                    raise ValidationError(_('Bir ekipte sadece bir takım lideri olabilir!'))
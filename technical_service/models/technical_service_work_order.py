@@ -2,8 +2,23 @@
 
 from odoo import models, fields, api, _
 from odoo.exceptions import ValidationError, UserError
+from odoo.tools import SQL
+from collections import defaultdict
 from datetime import datetime, timedelta
 
+# Largest side (px) of stored work order photos and signatures
+PHOTO_MAX_SIZE = 1920
+SIGNATURE_MAX_SIZE = 1024
+
+# Work status transitions: action -> (source statuses, target status)
+WORK_ORDER_TRANSITIONS = {
+    'start': (('pending',), 'in_progress'),
+    'pause': (('in_progress',), 'paused'),
+    'resume': (('paused',), 'in_progress'),
+    'complete': (('in_progress', 'paused'), 'completed'),
+}
+
+
 class TechnicalServiceWorkOrder(models.Model):
     """
     Work Order Model for Field Service Operations
@@ -139,25 +154,67 @@ class TechnicalServiceWorkOrder(models.Model):
     x_safety_checklist_completed = fields.Boolean(string='Safety Checklist Completed')
     x_risk_assessment = fields.Text(string='Risk Assessment')
 
-    # Signatures
-    x_technician_signature = fields.Binary(string='Technician Signature')
-    x_customer_signature = fields.Binary(string='Customer Signature')
+    # Signatures (stored as attachments, resized on write)
+    x_technician_signature = fields.Image(
+        string='Technician Signature',
+        max_width=SIGNATURE_MAX_SIZE,
+        max_height=SIGNATURE_MAX_SIZE
+    )
+    x_customer_signature = fields.Image(
+        string='Customer Signature',
+        max_width=SIGNATURE_MAX_SIZE,
+        max_height=SIGNATURE_MAX_SIZE
+    )
     x_signature_date = fields.Datetime(string='Signature Date')
 
-    # Photos
-    x_before_photo = fields.Binary(string='Before Photo')
-    x_after_photo = fields.Binary(string='After Photo')
+    # Photos (stored as attachments, deduplicated in the filestore)
+    # Originals are capped on write; list/kanban views only use the thumbnails
+    x_before_photo = fields.Image(
+        string='Before Photo',
+        max_width=PHOTO_MAX_SIZE,
+        max_height=PHOTO_MAX_SIZE
+    )
+    x_before_photo_128 = fields.Image(
+        string='Before Photo (Thumbnail)',
+        related='x_before_photo',
+        max_width=128,
+        max_height=128,
+        store=True
+    )
+    x_after_photo = fields.Image(
+        string='After Photo',
+        max_width=PHOTO_MAX_SIZE,
+        max_height=PHOTO_MAX_SIZE
+    )
+    x_after_photo_128 = fields.Image(
+        string='After Photo (Thumbnail)',
+        related='x_after_photo',
+        max_width=128,
+        max_height=128,
+        store=True
+    )
 
     @api.depends('x_checklist_line_ids.is_done')
     def _compute_checklist_progress(self):
-        """Calculate checklist completion percentage"""
+        """Calculate checklist completion percentage (one grouped query for saved work orders)"""
+        counts = defaultdict(lambda: [0, 0])  # work order id -> [total, done]
+        saved = self.filtered('id')
+        if saved:
+            for work_order, is_done, count in self.env['technical_service.work_order.checklist']._read_group(
+                [('work_order_id', 'in', saved.ids)], ['work_order_id', 'is_done'], ['__count'],
+            ):
+                counts[work_order.id][0] += count
+                if is_done:
+                    counts[work_order.id][1] += count
+
         for record in self:
-            if record.x_checklist_line_ids:
-                done_count = len(record.x_checklist_line_ids.filtered('is_done'))
-                total_count = len(record.x_checklist_line_ids)
-                record.x_checklist_progress = (done_count / total_count) * 100
+            if record.id:
+                total_count, done_count = counts[record.id]
             else:
-                record.x_checklist_progress = 0.0
+                # Unsaved work order (form onchange): lines only exist in memory
+                total_count = len(record.x_checklist_line_ids)
+                done_count = len(record.x_checklist_line_ids.filtered('is_done'))
+            record.x_checklist_progress = (done_count / total_count) * 100 if total_count else 0.0
 
     @api.depends('x_parts_line_ids.subtotal')
     def _compute_total_parts_cost(self):
@@ -167,9 +224,22 @@ class TechnicalServiceWorkOrder(models.Model):
 
     @api.depends('x_time_log_ids.duration')
     def _compute_actual_duration(self):
-        """Calculate total actual duration from time logs"""
+        """Calculate total actual duration from time logs (one grouped query for saved work orders)"""
+        durations = {}
+        saved = self.filtered('id')
+        if saved:
+            durations = {
+                work_order.id: duration
+                for work_order, duration in self.env['technical_service.work_order.timelog']._read_group(
+                    [('work_order_id', 'in', saved.ids)], ['work_order_id'], ['duration:sum'],
+                )
+            }
+
         for record in self:
-            record.x_actual_duration = sum(record.x_time_log_ids.mapped('duration'))
+            if record.id:
+                record.x_actual_duration = durations.get(record.id, 0.0)
+            else:
+                record.x_actual_duration = sum(record.x_time_log_ids.mapped('duration'))
 
     # ============================================
     # CREATE HOOK (Task 07 - Phase 2C)
@@ -180,170 +250,221 @@ class TechnicalServiceWorkOrder(models.Model):
         """
         Override create to:
         1. Create work order
-        2. Transition parent request to 'İş Emri Oluşturuldu' (Task 07 - Phase 2C)
-        3. Log work order creation in request history
+        2. Copy checklist templates into work orders created without checklist
+        3. Transition parent request to 'İş Emri Oluşturuldu' (Task 07 - Phase 2C)
+        4. Log work order creation in request history
         """
         records = super().create(vals_list)
 
-        for record in records:
-            # Task 07 - Phase 2C: Transition request to 'İş Emri Oluşturuldu'
-            if record.x_request_id:
-                request = record.x_request_id
-
-                # Only transition if currently in 'Ekip Atandı' or 'Yeni'
-                if request.stage_id.name in ['Yeni', 'Ekip Atandı']:
-                    request._transition_to_stage(
-                        'İş Emri Oluşturuldu',
-                        reason=_('Work order created: %s', record.name)
+        if not self.env.context.get('skip_checklist_templates'):
+            self.env['technical_service.checklist.template']._instantiate(records.filtered(
+                lambda wo: not wo.x_checklist_line_ids
+            ))
+
+        History = self.env['technical_service.request.history']
+        with History.buffered():
+            for record in records:
+                # Task 07 - Phase 2C: Transition request to 'İş Emri Oluşturuldu'
+                if record.x_request_id:
+                    request = record.x_request_id
+
+                    # Only transition if currently in 'Ekip Atandı' or 'Yeni'
+                    if request.x_stage_code in ('new', 'team_assigned'):
+                        request._transition_to_stage(
+                            'work_order_created',
+                            reason=_('Work order created: %s', record.name)
+                        )
+
+                    # Log work order event in request history
+                    History.log_work_order_event(
+                        request=request,
+                        work_order=record,
+                        status_text=_('Created'),
+                        note=_('Work order created with status: %s', dict(record._fields['x_work_status'].selection).get(record.x_work_status))
                     )
 
-                # Log work order event in request history
-                self.env['technical_service.request.history'].log_work_order_event(
-                    request=request,
-                    work_order=record,
-                    status_text=_('Created'),
-                    note=_('Work order created with status: %s', dict(record._fields['x_work_status'].selection).get(record.x_work_status))
-                )
-
         return records
 
+    def unlink(self):
+        # Deleted work orders are sent to mobile devices as tombstones
+        self.env['technical_service.sync.tombstone']._record_deletion(
+            self, {work_order.id: work_order.id for work_order in self}
+        )
+        return super().unlink()
+
     # ============================================
     # ACTION METHODS (Task 07 - Phase 2D)
     # ============================================
 
+    def action_apply_checklist_templates(self):
+        """Copy the applicable checklist templates into work orders that have no checklist yet"""
+        self.env['technical_service.checklist.template']._instantiate(
+            self.filtered(lambda wo: not wo.x_checklist_line_ids)
+        )
+        return True
+
     def action_start_work(self):
         """
-        Start work order and create time log
+        Start work orders and create their time logs
         Task 07 - Phase 2D: Transition request to 'Devam Ediyor'
         """
-        self.ensure_one()
-        if self.x_work_status != 'pending':
-            raise UserError(_('Work order must be in pending status to start.'))
-
+        self._check_transition('start')
+        now = fields.Datetime.now()
         self.write({
             'x_work_status': 'in_progress',
-            'x_start_datetime': fields.Datetime.now(),
+            'x_start_datetime': now,
         })
+        self._open_time_logs(now)
 
-        # Create time log entry
-        self.env['technical_service.work_order.timelog'].create({
-            'work_order_id': self.id,
-            'start_time': fields.Datetime.now(),
-            'technician_id': self.x_technician_id.id,
-        })
-
-        # Task 07 - Phase 2D: Transition request to 'Devam Ediyor'
-        if self.x_request_id:
-            request = self.x_request_id
-
-            # Transition to 'Devam Ediyor' if not already there
-            if request.stage_id.name != 'Devam Ediyor':
-                request._transition_to_stage(
-                    'Devam Ediyor',
-                    reason=_('Work started on work order: %s', self.name)
-                )
+        History = self.env['technical_service.request.history']
+        with History.buffered():
+            for request, work_orders in self.filtered('x_request_id').grouped('x_request_id').items():
+                # Task 07 - Phase 2D: Transition to 'Devam Ediyor' if not already there
+                if request.x_stage_code != 'in_progress':
+                    request._transition_to_stage(
+                        'in_progress',
+                        reason=_('Work started on work order: %s', ', '.join(work_orders.mapped('name')))
+                    )
 
-            # Log work order start
-            self.env['technical_service.request.history'].log_work_order_event(
-                request=request,
-                work_order=self,
-                status_text=_('Started'),
-                note=_('Work order started by %s', self.x_technician_id.name if self.x_technician_id else 'Unknown')
-            )
+                # Log work order start
+                for work_order in work_orders:
+                    History.log_work_order_event(
+                        request=request,
+                        work_order=work_order,
+                        status_text=_('Started'),
+                        note=_('Work order started by %s', work_order.x_technician_id.name or _('Unknown'))
+                    )
 
         return True
 
     def action_pause_work(self):
-        """Pause work order and stop time log"""
-        self.ensure_one()
-        if self.x_work_status != 'in_progress':
-            raise UserError(_('Can only pause work that is in progress.'))
-
-        self.x_work_status = 'paused'
-
-        # Stop current time log
-        current_log = self.x_time_log_ids.filtered(lambda l: not l.end_time)
-        if current_log:
-            current_log[0].end_time = fields.Datetime.now()
-
+        """Pause work orders and stop their time logs"""
+        self._check_transition('pause')
+        now = fields.Datetime.now()
+        self.write({'x_work_status': 'paused'})
+        self._close_time_logs(now)
         return True
 
     def action_resume_work(self):
-        """Resume paused work order"""
-        self.ensure_one()
-        if self.x_work_status != 'paused':
-            raise UserError(_('Can only resume paused work.'))
-
-        self.x_work_status = 'in_progress'
-
-        # Create new time log entry
-        self.env['technical_service.work_order.timelog'].create({
-            'work_order_id': self.id,
-            'start_time': fields.Datetime.now(),
-            'technician_id': self.x_technician_id.id,
-        })
-
+        """Resume paused work orders with a new time log"""
+        self._check_transition('resume')
+        now = fields.Datetime.now()
+        self.write({'x_work_status': 'in_progress'})
+        self._open_time_logs(now)
         return True
 
     def action_complete_work(self):
         """
-        Complete work order
+        Complete work orders
         Task 07 - Phase 2D: Check if all work orders done, stay in 'Devam Ediyor'
         (Will NOT auto-complete request - requires manual approval flow)
         """
-        self.ensure_one()
-        if self.x_work_status not in ['in_progress', 'paused']:
-            raise UserError(_('Work must be in progress or paused to complete.'))
-
-        # Stop any open time logs
-        open_logs = self.x_time_log_ids.filtered(lambda l: not l.end_time)
-        for log in open_logs:
-            log.end_time = fields.Datetime.now()
-
+        self._check_transition('complete')
+        now = fields.Datetime.now()
+        self._close_time_logs(now)
         self.write({
             'x_work_status': 'completed',
-            'x_end_datetime': fields.Datetime.now(),
+            'x_end_datetime': now,
         })
 
-        # Task 07 - Phase 2D: Log work order completion
-        if self.x_request_id:
-            request = self.x_request_id
-
-            # Log work order completion
-            self.env['technical_service.request.history'].log_work_order_event(
-                request=request,
-                work_order=self,
-                status_text=_('Completed'),
-                note=_('Work order completed. Duration: %.2f hours', self.x_actual_duration)
-            )
-
-            # Check if ALL work orders are completed
-            all_completed = all(
-                wo.x_work_status == 'completed'
-                for wo in request.x_work_order_ids
-            )
-
-            if all_completed:
-                # All work orders done - request stays in 'Devam Ediyor'
-                # User must manually send to 'Onayda' using the button
-                # This is intentional per Task 07 requirements
-
-                # Add a note to history
-                self.env['technical_service.request.history'].create({
-                    'request_id': request.id,
-                    'event_type': 'comment',
-                    'note': _('All work orders completed. Ready for approval submission.'),
-                    'is_automatic': True,
-                })
-
-                # Post message to chatter
-                request.message_post(
-                    body=_('✓ All work orders have been completed. The request is ready to be sent for approval.'),
-                    message_type='notification'
+        History = self.env['technical_service.request.history']
+        with History.buffered():
+            for request, work_orders in self.filtered('x_request_id').grouped('x_request_id').items():
+                # Task 07 - Phase 2D: Log work order completion
+                for work_order in work_orders:
+                    History.log_work_order_event(
+                        request=request,
+                        work_order=work_order,
+                        status_text=_('Completed'),
+                        note=_('Work order completed. Duration: %.2f hours', work_order.x_actual_duration)
+                    )
+
+                # Check if ALL work orders are completed
+                all_completed = all(
+                    wo.x_work_status == 'completed'
+                    for wo in request.x_work_order_ids
                 )
 
+                if all_completed:
+                    # All work orders done - request stays in 'Devam Ediyor'
+                    # User must manually send to 'Onayda' using the button
+                    # This is intentional per Task 07 requirements
+
+                    # Add a note to history
+                    History.create({
+                        'request_id': request.id,
+                        'event_type': 'comment',
+                        'note': _('All work orders completed. Ready for approval submission.'),
+                        'is_automatic': True,
+                    })
+
+                    # Post message to chatter
+                    request.message_post(
+                        body=_('✓ All work orders have been completed. The request is ready to be sent for approval.'),
+                        message_type='notification'
+                    )
+
         return True
 
+    # ============================================
+    # WORK STATUS STATE MACHINE
+    # ============================================
+
+    def _lock_work_orders(self):
+        """
+        Lock the work order rows until the end of the transaction
+        (SELECT ... FOR UPDATE NOWAIT, in id order)
+
+        A concurrent transition holding one of the rows makes this raise
+        LockNotAvailable (a serialization failure if it committed since our
+        snapshot); the framework then retries the whole call, which sees the
+        committed status. Returns: the work orders, with their status re-read
+        """
+        if not self.ids:
+            return self
+        self.flush_recordset(['x_work_status'])
+        self.env.cr.execute(SQL(
+            "SELECT id FROM %s WHERE id IN %s ORDER BY id FOR UPDATE NOWAIT",
+            SQL.identifier(self._table), tuple(self.ids),
+        ))
+        self.invalidate_recordset(['x_work_status'])
+        return self
+
+    def _check_transition(self, action):
+        """
+        Lock the work orders and check that all of them can make the
+        transition (see WORK_ORDER_TRANSITIONS); nothing is changed otherwise
+        """
+        source_statuses = WORK_ORDER_TRANSITIONS[action][0]
+        invalid = self._lock_work_orders().filtered(lambda wo: wo.x_work_status not in source_statuses)
+        if invalid:
+            messages = {
+                'start': _('Work order must be in pending status to start.'),
+                'pause': _('Can only pause work that is in progress.'),
+                'resume': _('Can only resume paused work.'),
+                'complete': _('Work must be in progress or paused to complete.'),
+            }
+            if len(self) > 1:
+                raise UserError('%s\n%s' % (messages[action], ', '.join(invalid.mapped('name'))))
+            raise UserError(messages[action])
+
+    def _open_time_logs(self, start_time):
+        """Start one time log per work order (one create)"""
+        return self.env['technical_service.work_order.timelog'].create([{
+            'work_order_id': work_order.id,
+            'start_time': start_time,
+            'technician_id': work_order.x_technician_id.id,
+        } for work_order in self])
+
+    def _close_time_logs(self, end_time):
+        """Stop the running time logs of the work orders (one write)"""
+        open_logs = self.env['technical_service.work_order.timelog'].search([
+            ('work_order_id', 'in', self.ids),
+            ('end_time', '=', False),
+        ])
+        open_logs.write({'end_time': end_time})
+        return open_logs
+
 
 class WorkOrderChecklist(models.Model):
     """Checklist items for work orders"""
@@ -351,7 +472,7 @@ class WorkOrderChecklist(models.Model):
     _description = 'Work Order Checklist'
     _order = 'sequence, id'
 
-    work_order_id = fields.Many2one('technical_service.work_order', string='Work Order', required=True, ondelete='cascade')
+    work_order_id = fields.Many2one('technical_service.work_order', string='Work Order', required=True, ondelete='cascade', index=True)
     sequence = fields.Integer(string='Sequence', default=10)
     name = fields.Char(string='Checklist Item', required=True)
     description = fields.Text(string='Description')
@@ -367,13 +488,20 @@ class WorkOrderChecklist(models.Model):
         else:
             self.done_date = False
 
+    def unlink(self):
+        # Deleted lines are sent to mobile devices as tombstones
+        self.env['technical_service.sync.tombstone']._record_deletion(
+            self, {line.id: line.work_order_id.id for line in self}
+        )
+        return super().unlink()
+
 
 class WorkOrderParts(models.Model):
     """Parts used in work orders"""
     _name = 'technical_service.work_order.parts'
     _description = 'Work Order Parts'
 
-    work_order_id = fields.Many2one('technical_service.work_order', string='Work Order', required=True, ondelete='cascade')
+    work_order_id = fields.Many2one('technical_service.work_order', string='Work Order', required=True, ondelete='cascade', index=True)
     product_id = fields.Many2one('product.product', string='Part/Product', required=True, domain=[('type', 'in', ['product', 'consu'])])
     quantity = fields.Float(string='Quantity', default=1.0, required=True)
     unit_price = fields.Float(string='Unit Price', related='product_id.standard_price', readonly=True)
@@ -386,6 +514,13 @@ class WorkOrderParts(models.Model):
         for record in self:
             record.subtotal = record.quantity * record.unit_price
 
+    def unlink(self):
+        # Deleted lines are sent to mobile devices as tombstones
+        self.env['technical_service.sync.tombstone']._record_deletion(
+            self, {line.id: line.work_order_id.id for line in self}
+        )
+        return super().unlink()
+
 
 class WorkOrderTimeLog(models.Model):
     """Time tracking for work orders"""
@@ -393,12 +528,31 @@ class WorkOrderTimeLog(models.Model):
     _description = 'Work Order Time Log'
     _order = 'start_time desc'
 
-    work_order_id = fields.Many2one('technical_service.work_order', string='Work Order', required=True, ondelete='cascade')
+    work_order_id = fields.Many2one('technical_service.work_order', string='Work Order', required=True, ondelete='cascade', index=True)
     technician_id = fields.Many2one('hr.employee', string='Technician', required=True)
     start_time = fields.Datetime(string='Start Time', required=True)
     end_time = fields.Datetime(string='End Time')
     duration = fields.Float(string='Duration (Hours)', compute='_compute_duration', store=True)
     work_description = fields.Text(string='Work Description')
+    x_sync_uuid = fields.Char(
+        string='Device UUID',
+        copy=False,
+        readonly=True,
+        index='btree_not_null',
+        help='Client id of a time log pushed by a mobile device (deduplicates retried syncs)'
+    )
+
+    _sql_constraints = [
+        ('sync_uuid_unique', 'UNIQUE(x_sync_uuid)', 'A time log with this device UUID already exists!'),
+    ]
+
+    def init(self):
+        # At most one running timer per work order, whatever the code path
+        self.env.cr.execute(SQL(
+            "CREATE UNIQUE INDEX IF NOT EXISTS %s ON %s (work_order_id) WHERE end_time IS NULL",
+            SQL.identifier('technical_service_work_order_timelog_open_unique'),
+            SQL.identifier(self._table),
+        ))
 
     @api.depends('start_time', 'end_time')
     def _compute_duration(self):
@@ -407,4 +561,11 @@ class WorkOrderTimeLog(models.Model):
                 delta = record.end_time - record.start_time
                 record.duration = delta.total_seconds() / 3600.0
             else:
-                record.duration = 0.0
\ No newline at end of file
+                record.duration = 0.0
+
+    def unlink(self):
+        # Deleted lines are sent to mobile devices as tombstones
+        self.env['technical_service.sync.tombstone']._record_deletion(
+            self, {line.id: line.work_order_id.id for line in self}
+        )
+        return super().unlink()
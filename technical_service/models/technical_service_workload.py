@@ -0,0 +1,324 @@
+# -*- coding: utf-8 -*-
+
+from collections import defaultdict
+from datetime import timedelta
+
+from odoo import models, fields, api
+
+# Key used in cr.precommit.data to collect the requests changed in the
+# transaction, with their counter contributions before the first change
+WORKLOAD_DIRTY_KEY = 'technical_service.workload.dirty'
+
+# maintenance.request fields the workload counters are computed from
+WORKLOAD_FIELDS = ('maintenance_team_id', 'technician_user_id', 'user_id', 'stage_id', 'close_date')
+
+# Window of the rolling average resolution time
+WORKLOAD_AVG_WINDOW = timedelta(days=30)
+
+# Stages a technician has not started working in yet
+WORKLOAD_NOT_STARTED_CODES = ('new', 'team_assigned', 'on_hold', 'work_order_created')
+
+
+class TechnicalServiceWorkload(models.Model):
+    """
+    Team / Technician Workload Counters
+    Purpose: Materialized workload of each team and technician
+
+    One row per team (user_id empty) and per technician (team_id empty).
+    Counters are maintained incrementally: the contribution of each request
+    is snapshotted before its first change in a transaction, and at the end
+    of the transaction the difference with its final contribution is added
+    to the rows with one INSERT ... ON CONFLICT DO UPDATE per key. Changes
+    that do not move any counter touch no row, and a missing row is created
+    by the upsert instead of failing the commit.
+
+    _rebuild() recomputes every row (scheduled daily, also rolls the
+    completed-today and average windows forward).
+    """
+    _name = 'technical_service.workload'
+    _description = 'Team / Technician Workload'
+    _rec_name = 'team_id'
+
+    team_id = fields.Many2one('maintenance.team', string='Team', index=True, ondelete='cascade')
+    user_id = fields.Many2one('res.users', string='Technician', index=True, ondelete='cascade')
+
+    x_active_count = fields.Integer(string='Active Requests', help='Open requests')
+    x_pending_count = fields.Integer(
+        string='Pending Requests',
+        help='Team: open requests without technician. Technician: open requests not started yet.'
+    )
+    x_completed_today = fields.Integer(string='Completed Today')
+    x_counters_date = fields.Date(string='Counters Date', help='Day x_completed_today refers to')
+    x_resolution_total = fields.Float(
+        string='Resolution Time Total (Hours)',
+        help='Resolution time of the requests closed in the last 30 days'
+    )
+    x_resolution_count = fields.Integer(
+        string='Resolved Requests',
+        help='Requests with a resolution time closed in the last 30 days'
+    )
+    x_avg_resolution_time = fields.Float(
+        string='Avg Resolution Time (Hours)',
+        help='Average resolution time of requests closed in the last 30 days'
+    )
+
+    _sql_constraints = [
+        ('team_unique', 'UNIQUE(team_id)', 'Workload row must be unique per team!'),
+        ('user_unique', 'UNIQUE(user_id)', 'Workload row must be unique per technician!'),
+        ('team_or_user', 'CHECK((team_id IS NULL) != (user_id IS NULL))',
+         'Workload row must belong to either a team or a technician!'),
+    ]
+
+    # ============================================
+    # READ API
+    # ============================================
+
+    @api.model
+    def _get_counters(self, team_ids=(), user_ids=()):
+        """
+        Counters of teams and technicians (single query)
+        Returns: ({team id: counters dict}, {user id: counters dict})
+        """
+        domain = []
+        if team_ids and user_ids:
+            domain = ['|', ('team_id', 'in', list(team_ids)), ('user_id', 'in', list(user_ids))]
+        elif team_ids:
+            domain = [('team_id', 'in', list(team_ids))]
+        elif user_ids:
+            domain = [('user_id', 'in', list(user_ids))]
+        else:
+            return {}, {}
+
+        today = fields.Date.today()
+        by_team, by_user = {}, {}
+        for row in self.sudo().search(domain):
+            counters = {
+                'active': row.x_active_count,
+                'pending': row.x_pending_count,
+                'completed_today': row.x_completed_today if row.x_counters_date == today else 0,
+                'avg_resolution_time': row.x_avg_resolution_time,
+            }
+            if row.team_id:
+                by_team[row.team_id.id] = counters
+            else:
+                by_user[row.user_id.id] = counters
+        return by_team, by_user
+
+    # ============================================
+    # INCREMENTAL MAINTENANCE
+    # ============================================
+
+    @api.model
+    def _track(self, requests, created=False):
+        """
+        Snapshot the counter contributions of requests about to change (or
+        just created: no contribution yet); the counters are updated with
+        the differences at the end of the transaction
+        """
+        data = self.env.cr.precommit.data
+        if WORKLOAD_DIRTY_KEY not in data:
+            data[WORKLOAD_DIRTY_KEY] = {}
+            self.env.cr.precommit.add(self._apply_dirty)
+        before = data[WORKLOAD_DIRTY_KEY]
+        new_ids = [request_id for request_id in requests.ids if request_id not in before]
+        if not new_ids:
+            return
+        if created:
+            before.update(dict.fromkeys(new_ids, {}))
+        else:
+            before.update(self._get_contributions(requests.browse(new_ids)))
+
+    @api.model
+    def _apply_dirty(self):
+        """Precommit hook: add the counter differences of the tracked requests"""
+        before = self.env.cr.precommit.data.pop(WORKLOAD_DIRTY_KEY, None)
+        if not before:
+            return
+        requests = self.env['maintenance.request'].browse(list(before)).exists()
+        after = self._get_contributions(requests)
+
+        deltas = defaultdict(lambda: [0, 0, 0, 0.0, 0])
+        for contributions, sign in ((before, -1), (after, 1)):
+            for request_contributions in contributions.values():
+                for key, values in request_contributions.items():
+                    delta = deltas[key]
+                    for index, value in enumerate(values):
+                        delta[index] += sign * value
+        self._upsert({key: delta for key, delta in deltas.items() if any(delta)}, increment=True)
+
+    @api.model
+    def _get_contributions(self, requests):
+        """
+        What each request adds to the counters of its team and technician
+        Returns: {request id: {('team_id'|'user_id', id):
+                  (active, pending, completed today, resolution hours, resolved)}}
+        """
+        today = fields.Date.today()
+        not_started_ids = {
+            stage_id for code, stage_id in self.env['maintenance.stage']._get_stage_registry().items()
+            if code in WORKLOAD_NOT_STARTED_CODES
+        }
+        contributions = {}
+        for request in requests.sudo():
+            is_open = bool(request.stage_id) and not request.stage_id.done
+            is_done = request.stage_id.done
+            closed_today = int(bool(is_done and request.close_date and request.close_date >= today))
+            resolution = (0.0, 0)
+            if is_done and request.x_resolution_time > 0 and request.close_date \
+                    and request.close_date >= today - WORKLOAD_AVG_WINDOW:
+                resolution = (request.x_resolution_time, 1)
+
+            request_contributions = {}
+            if request.maintenance_team_id:
+                request_contributions[('team_id', request.maintenance_team_id.id)] = (
+                    int(is_open), int(is_open and not request.user_id), closed_today, *resolution,
+                )
+            if request.technician_user_id:
+                request_contributions[('user_id', request.technician_user_id.id)] = (
+                    int(is_open), int(is_open and request.stage_id.id in not_started_ids), closed_today, *resolution,
+                )
+            contributions[request.id] = request_contributions
+        return contributions
+
+    @api.model
+    def _upsert(self, values, increment):
+        """
+        Write counter rows with one INSERT ... ON CONFLICT DO UPDATE per key
+
+        Args:
+            values: {('team_id'|'user_id', id): (active, pending, completed
+                    today, resolution hours, resolved)}
+            increment: add the values to the rows (deltas) instead of
+                       replacing them (absolute counters)
+        """
+        today = fields.Date.today()
+        for key in ('team_id', 'user_id'):
+            rows = sorted((record_id, row) for (row_key, record_id), row in values.items() if row_key == key)
+            if not rows:
+                continue
+            if increment:
+                assignments = """
+                    x_active_count = COALESCE(w.x_active_count, 0) + EXCLUDED.x_active_count,
+                    x_pending_count = COALESCE(w.x_pending_count, 0) + EXCLUDED.x_pending_count,
+                    x_completed_today = CASE WHEN w.x_counters_date = EXCLUDED.x_counters_date
+                                             THEN COALESCE(w.x_completed_today, 0) ELSE 0 END
+                                        + EXCLUDED.x_completed_today,
+                    x_resolution_total = COALESCE(w.x_resolution_total, 0) + EXCLUDED.x_resolution_total,
+                    x_resolution_count = COALESCE(w.x_resolution_count, 0) + EXCLUDED.x_resolution_count,
+                    x_avg_resolution_time = COALESCE(
+                        (COALESCE(w.x_resolution_total, 0) + EXCLUDED.x_resolution_total)
+                        / NULLIF(COALESCE(w.x_resolution_count, 0) + EXCLUDED.x_resolution_count, 0), 0),
+                """
+            else:
+                assignments = """
+                    x_active_count = EXCLUDED.x_active_count,
+                    x_pending_count = EXCLUDED.x_pending_count,
+                    x_completed_today = EXCLUDED.x_completed_today,
+                    x_resolution_total = EXCLUDED.x_resolution_total,
+                    x_resolution_count = EXCLUDED.x_resolution_count,
+                    x_avg_resolution_time = EXCLUDED.x_avg_resolution_time,
+                """
+            # key is 'team_id' or 'user_id', not user input
+            self.env.cr.execute(f"""
+                INSERT INTO technical_service_workload AS w
+                       ({key}, x_active_count, x_pending_count, x_completed_today, x_counters_date,
+                        x_resolution_total, x_resolution_count, x_avg_resolution_time,
+                        create_uid, create_date, write_uid, write_date)
+                SELECT row.record_id, row.active, row.pending, row.completed_today, %(today)s,
+                       row.resolution_total, row.resolution_count,
+                       COALESCE(row.resolution_total / NULLIF(row.resolution_count, 0), 0),
+                       %(uid)s, now() at time zone 'UTC', %(uid)s, now() at time zone 'UTC'
+                  FROM unnest(%(record_ids)s::int[], %(active)s::int[], %(pending)s::int[],
+                              %(completed_today)s::int[], %(resolution_total)s::float8[],
+                              %(resolution_count)s::int[])
+                       AS row(record_id, active, pending, completed_today, resolution_total, resolution_count)
+              ORDER BY row.record_id
+                    ON CONFLICT ({key}) DO UPDATE SET
+                       {assignments}
+                       x_counters_date = EXCLUDED.x_counters_date,
+                       write_uid = EXCLUDED.write_uid,
+                       write_date = EXCLUDED.write_date
+            """, {
+                'today': today,
+                'uid': self.env.uid,
+                'record_ids': [record_id for record_id, _row in rows],
+                'active': [row[0] for _record_id, row in rows],
+                'pending': [row[1] for _record_id, row in rows],
+                'completed_today': [row[2] for _record_id, row in rows],
+                'resolution_total': [row[3] for _record_id, row in rows],
+                'resolution_count': [row[4] for _record_id, row in rows],
+            })
+        self.invalidate_model()
+
+    @api.model
+    def _rebuild(self):
+        """Recompute the workload of every team and technician"""
+        Request = self.env['maintenance.request'].sudo()
+        team_ids = self.env['maintenance.team'].sudo().with_context(active_test=False).search([]).ids
+        user_ids = [
+            user.id for [user] in Request._read_group(
+                [('technician_user_id', '!=', False)], ['technician_user_id']
+            )
+        ]
+        self.sudo().search([
+            '|',
+                '&', ('team_id', '!=', False), ('team_id', 'not in', team_ids),
+                '&', ('user_id', '!=', False), ('user_id', 'not in', user_ids),
+        ]).unlink()
+        self._refresh(team_ids, user_ids)
+        return True
+
+    @api.model
+    def _refresh(self, team_ids, user_ids):
+        """Recompute the counters of the given teams and technicians with grouped queries"""
+        Request = self.env['maintenance.request'].sudo()
+        team_ids, user_ids = list(team_ids), list(user_ids)
+        today = fields.Date.today()
+        not_started_ids = [
+            stage_id for code, stage_id in self.env['maintenance.stage']._get_stage_registry().items()
+            if code in WORKLOAD_NOT_STARTED_CODES
+        ]
+
+        def counts(domain, groupby):
+            return {
+                group.id: count
+                for group, count in Request._read_group(domain, [groupby], ['__count'])
+            }
+
+        def resolutions(domain, groupby):
+            return {
+                group.id: (total or 0.0, count)
+                for group, total, count in Request._read_group(
+                    domain, [groupby], ['x_resolution_time:sum', '__count'],
+                )
+            }
+
+        open_domain = [('stage_id.done', '=', False)]
+        completed_today_domain = [('stage_id.done', '=', True), ('close_date', '>=', today)]
+        resolution_domain = [
+            ('stage_id.done', '=', True),
+            ('x_resolution_time', '>', 0),
+            ('close_date', '>=', today - WORKLOAD_AVG_WINDOW),
+        ]
+
+        values = {}
+        for key, ids, groupby, pending_domain in (
+            ('team_id', team_ids, 'maintenance_team_id', [('user_id', '=', False)]),
+            ('user_id', user_ids, 'technician_user_id', [('stage_id', 'in', not_started_ids)]),
+        ):
+            if not ids:
+                continue
+            scope = [(groupby, 'in', ids)]
+            active = counts(scope + open_domain, groupby)
+            pending = counts(scope + open_domain + pending_domain, groupby)
+            completed_today = counts(scope + completed_today_domain, groupby)
+            resolved = resolutions(scope + resolution_domain, groupby)
+            for record_id in ids:
+                values[(key, record_id)] = (
+                    active.get(record_id, 0),
+                    pending.get(record_id, 0),
+                    completed_today.get(record_id, 0),
+                    *resolved.get(record_id, (0.0, 0)),
+                )
+
+        self._upsert(values, increment=False)
@@ -0,0 +1,503 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Technical Service - Performans Ölçümleri (Benchmarks)
+Toplu işlemlerin SQL sorgu sayısını ve süresini ölçer
+
+Odoo shell içinden çalıştırılır (env değişkeni shell tarafından sağlanır):
+
+    odoo-bin shell -c /etc/odoo/odoo.conf -d odoo_tech_service \\
+        < technical_service/scripts/benchmark_performance.py
+
+Tüm ölçümler tek bir transaction içinde yapılır ve sonunda geri alınır
+(rollback), veritabanında kalıcı veri bırakmaz.
+"""
+
+import time
+from datetime import timedelta
+
+from odoo.addons.technical_service.models.technical_service_request import WORKFLOW_ROLE_GROUPS
+
+
+def measure(env, label, func):
+    """Run func() and print elapsed time and number of SQL statements"""
+    env.flush_all()
+    env.invalidate_all()
+    queries_before = env.cr.sql_log_count
+    start = time.perf_counter()
+
+    result = func()
+    env.flush_all()
+
+    elapsed = time.perf_counter() - start
+    queries = env.cr.sql_log_count - queries_before
+    print(f"  {label:<45} {elapsed:8.2f} s {queries:8d} SQL")
+    return result
+
+
+def create_requests(env, count, team=None):
+    """Create benchmark requests in a single batched create"""
+    Request = env['maintenance.request']
+    team = team or env['maintenance.team'].search([], limit=1)
+    return Request.create([{
+        'name': f'Benchmark Request {i}',
+        'maintenance_team_id': team.id,
+    } for i in range(count)])
+
+
+def bench_mass_assign(env, count=5000):
+    """
+    user-001: Dispatcher mass-assigning requests to a team.
+    The batched write path must stay within a bounded number of SQL
+    statements regardless of the recordset size.
+    """
+    print(f"\n[*] Mass assign: {count} requests")
+    teams = env['maintenance.team'].search([], limit=2)
+    if len(teams) < 2:
+        print("  ⚠️  At least two maintenance teams are required")
+        return
+
+    stage_new = env['maintenance.request']._get_stage_by_code('new')
+    requests = measure(env, 'create', lambda: create_requests(env, count, teams[0]))
+    if stage_new:
+        requests.write({'stage_id': stage_new.id})
+
+    measure(env, 'write maintenance_team_id (set-based)',
+            lambda: requests.write({'maintenance_team_id': teams[1].id}))
+
+
+def bench_permission_fields(env, count=500, login=None):
+    """
+    user-004: List view load of requests with the permission fields,
+    against the per-record role checks it replaced (baseline). Pass a
+    non-admin login: superusers skip the role checks on both sides.
+    """
+    print(f"\n[*] Permission fields: {count} requests")
+    Request = env['maintenance.request']
+    if login:
+        user = env['res.users'].search([('login', '=', login)], limit=1)
+        if user:
+            Request = Request.with_user(user)
+
+    fields_list = [
+        'name', 'stage_id', 'x_can_put_on_hold', 'x_can_send_for_approval',
+        'x_can_approve', 'x_can_reject', 'x_can_cancel', 'x_can_create_work_order',
+        'x_is_standard_user', 'x_can_edit_work_orders', 'x_can_assign_technician',
+    ]
+    if Request.sudo().search_count([]) < count:
+        create_requests(env, count)
+
+    measure(env, f'search_read {len(fields_list)} fields (list view)',
+            lambda: Request.search_read([], fields_list, limit=count))
+    requests = Request.search([], limit=count)
+    measure(env, 'baseline: per-record role checks (e2c9f6b)',
+            lambda: baseline_permission_checks(requests))
+
+
+def baseline_permission_checks(requests):
+    """
+    Role evaluation of the permission computes before user-004 (e2c9f6b):
+    per request, 15 has_group calls over the four computes plus a team
+    member search. Superusers skipped it, so use a non-admin login.
+    """
+    user = requests.env.user
+    if user._is_superuser():
+        print("  ⚠️  Superuser: no role checks to compare, pass a non-admin login")
+        return
+    groups = (
+        list(WORKFLOW_ROLE_GROUPS.values())  # workflow permissions
+        + [WORKFLOW_ROLE_GROUPS[role] for role in ('cto', 'dept_manager', 'dispatcher')]  # standard user
+        + [WORKFLOW_ROLE_GROUPS[role] for role in ('team_leader', 'senior_technician', 'technician')]  # work orders
+        + [WORKFLOW_ROLE_GROUPS[role] for role in ('cto', 'dept_manager', 'team_leader')]  # assign technician
+    )
+    TeamMember = requests.env['technical_service.team.member']
+    for _request in requests:
+        for group in groups:
+            user.has_group(group)
+        if user.employee_id:
+            TeamMember.search([('employee_id', '=', user.employee_id.id)]).mapped('team_id')
+
+
+def bench_sla_monitor(env, count=5000):
+    """
+    user-006: SLA monitor tick over requests whose deadline just passed.
+    Status flips are written per status group, not per request.
+    """
+    print(f"\n[*] SLA monitor: {count} requests")
+    Request = env['maintenance.request']
+    requests = create_requests(env, count)
+    past = env.cr.now() - timedelta(minutes=5)
+    requests.write({'x_resolution_deadline': past, 'x_sla_status': 'on_track'})
+    env['ir.config_parameter'].sudo().set_param(
+        'technical_service.sla_monitor_last_run', past - timedelta(minutes=5))
+
+    measure(env, '_cron_sla_monitor()', lambda: Request._cron_sla_monitor(batch_size=count))
+
+
+def bench_bulk_intake(env, count=10000):
+    """
+    user-008: Bulk ticket intake (email/API import).
+    Priority, SLA policy and deadlines are resolved before the INSERT.
+    """
+    print(f"\n[*] Bulk intake: {count} requests")
+    requests = measure(env, 'create (SLA-stamped)', lambda: create_requests(env, count))
+    stamped = requests.filtered('x_resolution_deadline')
+    print(f"  {len(stamped)} / {len(requests)} requests with SLA deadlines")
+
+
+def bench_team_workload(env):
+    """
+    user-009: Team dashboard / least-loaded routing.
+    Workload fields read the materialized counters (one query per recordset).
+    """
+    teams = env['maintenance.team'].search([])
+    members = env['technical_service.team.member'].search([])
+    print(f"\n[*] Team workload: {len(teams)} teams, {len(members)} members")
+
+    measure(env, 'rebuild workload counters',
+            lambda: env['technical_service.workload']._rebuild())
+    measure(env, 'read team workload fields',
+            lambda: teams.read(['x_active_requests', 'x_pending_requests', 'x_avg_resolution_time']))
+    measure(env, 'read member workload fields',
+            lambda: members.read(['x_active_request_count', 'x_completed_today']))
+
+
+def bench_dispatch(env, count=10000, technicians=500, team_count=10):
+    """
+    user-010: Batch dispatch of unassigned requests across technicians.
+    """
+    print(f"\n[*] Dispatch: {count} requests, {technicians} technicians, {team_count} teams")
+    env['ir.config_parameter'].sudo().set_param('technical_service.auto_dispatch', False)
+    methods = ['round_robin', 'least_loaded', 'skill_based', 'location_based']
+    teams = env['maintenance.team'].create([{
+        'name': f'Benchmark Team {i}',
+        'x_auto_assign': True,
+        'x_assignment_method': methods[i % len(methods)],
+    } for i in range(team_count)])
+    users = env['res.users'].with_context(no_reset_password=True).create([{
+        'name': f'Benchmark Technician {i}',
+        'login': f'benchmark_technician_{i}',
+    } for i in range(technicians)])
+    employees = env['hr.employee'].create([{
+        'name': user.name,
+        'user_id': user.id,
+    } for user in users])
+    env['technical_service.team.member'].create([{
+        'team_id': teams[i % team_count].id,
+        'employee_id': employee.id,
+    } for i, employee in enumerate(employees)])
+
+    requests = env['maintenance.request']
+    per_team = count // team_count
+    for team in teams:
+        requests |= create_requests(env, per_team, team)
+
+    assignments = measure(env, 'dispatch_requests()',
+                          lambda: env['maintenance.team'].dispatch_requests(requests))
+    print(f"  {len(assignments)} / {len(requests)} requests assigned")
+
+
+def bench_stage_duration_backfill(env, rows=1000000, request_count=10000):
+    """
+    user-011: Stage durations on 1M history rows.
+    Rows are generated with SQL; the window-function backfill is measured,
+    then the per-insert cost of new stage change rows.
+    """
+    print(f"\n[*] Stage duration backfill: {rows} history rows")
+    requests = create_requests(env, request_count)
+    stages = env['maintenance.stage'].search([], limit=2)
+    env.flush_all()
+    env.cr.execute("""
+        INSERT INTO technical_service_request_history
+               (request_id, timestamp, user_id, event_type, old_stage_id, new_stage_id, is_automatic)
+        SELECT req.id,
+               now() at time zone 'UTC' - (n || ' minutes')::interval,
+               %s, 'stage_change', %s, %s, true
+          FROM unnest(%s) AS req(id), generate_series(1, %s) AS n
+    """, [env.uid, stages[:1].id, stages[1:].id or stages[:1].id, requests.ids, rows // request_count])
+
+    History = env['technical_service.request.history']
+    measure(env, '_backfill_stage_durations() (SQL)', lambda: History._backfill_stage_durations())
+    measure(env, 'log 1000 stage changes (O(1) durations)', lambda: History.log_events_bulk([
+        History._prepare_stage_change_vals(request, stages[:1], stages[1:])
+        for request in requests[:1000]
+    ]))
+
+
+def bench_dwell_percentiles(env, rows=1000000, request_count=10000):
+    """
+    user-012: p50/p90 dwell time over a year of stage intervals.
+    """
+    print(f"\n[*] Dwell percentiles: {rows} stage intervals over a year")
+    requests = create_requests(env, request_count)
+    stages = env['maintenance.stage'].search([])
+    teams = env['maintenance.team'].search([])
+    env.flush_all()
+    env.cr.execute("""
+        INSERT INTO technical_service_stage_interval
+               (request_id, stage_id, team_id, priority, entered_at, left_at, duration)
+        SELECT req.ids[1 + n %% array_length(req.ids, 1)],
+               st.ids[1 + n %% array_length(st.ids, 1)],
+               tm.ids[1 + n %% array_length(tm.ids, 1)],
+               (ARRAY['p1', 'p2', 'p3', 'p4'])[1 + n %% 4],
+               now() at time zone 'UTC' - (n %% 525600 || ' minutes')::interval,
+               now() at time zone 'UTC' - (n %% 525600 || ' minutes')::interval + (n %% 4320 || ' minutes')::interval,
+               (n %% 4320) / 60.0
+          FROM (SELECT %s::int[] AS ids) req, (SELECT %s::int[] AS ids) st, (SELECT %s::int[] AS ids) tm,
+               generate_series(1, %s) AS n
+    """, [requests.ids, stages.ids, teams.ids or [None], rows])
+    env.cr.execute("ANALYZE technical_service_stage_interval")
+
+    Interval = env['technical_service.stage.interval']
+    measure(env, 'p50/p90 by stage (get_dwell_percentiles)',
+            lambda: Interval.get_dwell_percentiles(groupby=['stage_id']))
+    measure(env, 'p50/p90 by stage, team, priority',
+            lambda: Interval.get_dwell_percentiles(groupby=['stage_id', 'team_id', 'priority']))
+    measure(env, 'dwell report pivot (read_group)',
+            lambda: env['technical_service.stage.dwell.report'].read_group(
+                [], ['p50_duration:max', 'p90_duration:max'], ['stage_id', 'team_id'], lazy=False))
+
+
+def bench_history_description(env, count=10000):
+    """
+    user-013: History inserts and stage renames with the description
+    rendered on read (nothing to recompute on rename), against the stored
+    description it replaced (baseline).
+    """
+    print(f"\n[*] History description: {count} history rows")
+    History = env['technical_service.request.history']
+    requests = create_requests(env, count)
+    stages = env['maintenance.stage'].search([], limit=2)
+
+    measure(env, f'log {count} stage changes', lambda: History.log_events_bulk([
+        History._prepare_stage_change_vals(request, stages[:1], stages[1:])
+        for request in requests
+    ]))
+    measure(env, 'rename a stage', lambda: stages[1:].write({'name': stages[1:].name + ' (renamed)'}))
+    history = History.search([('request_id', 'in', requests.ids)])
+    measure(env, f'render {len(history)} descriptions', lambda: history.mapped('description'))
+
+    # Baseline (e2c9f6b): description stored, rendered row by row on insert
+    # and for every row of a renamed stage. Emulated with a scratch column
+    # (dropped by the final rollback).
+    env.cr.execute("ALTER TABLE technical_service_request_history ADD COLUMN bench_description text")
+
+    def store_descriptions(rows):
+        env.cr.execute("""
+            UPDATE technical_service_request_history h
+               SET bench_description = v.description
+              FROM (SELECT unnest(%s::int[]) AS id, unnest(%s::text[]) AS description) v
+             WHERE h.id = v.id
+        """, [rows.ids, [row._render_description() for row in rows]])
+
+    def log_and_store():
+        rows = History.log_events_bulk([
+            History._prepare_stage_change_vals(request, stages[:1], stages[1:])
+            for request in requests
+        ])
+        store_descriptions(rows)
+
+    def rename_and_store():
+        stages[1:].write({'name': stages[1:].name + ' (renamed again)'})
+        store_descriptions(History.search([
+            '|', ('old_stage_id', 'in', stages[1:].ids), ('new_stage_id', 'in', stages[1:].ids),
+        ]))
+
+    def read_stored():
+        env.cr.execute("""
+            SELECT id, bench_description
+              FROM technical_service_request_history
+             WHERE request_id IN %s
+        """, [tuple(requests.ids)])
+        return env.cr.fetchall()
+
+    measure(env, f'baseline: log {count} stage changes + store', log_and_store)
+    measure(env, 'baseline: rename a stage + recompute stored', rename_and_store)
+    measure(env, 'baseline: read stored descriptions', read_stored)
+
+
+def bench_history_archive(env, rows=500000, request_count=5000):
+    """
+    user-014: Moving old history to the archive tier and reading the
+    recent window of a request.
+    """
+    print(f"\n[*] History archive: {rows} old history rows")
+    requests = create_requests(env, request_count)
+    env.flush_all()
+    env.cr.execute("""
+        INSERT INTO technical_service_request_history (request_id, timestamp, user_id, event_type, is_automatic)
+        SELECT req.id, now() at time zone 'UTC' - interval '2 years' + (n || ' minutes')::interval,
+               %s, 'comment', true
+          FROM unnest(%s) AS req(id), generate_series(1, %s) AS n
+    """, [env.uid, requests.ids, rows // request_count])
+
+    Archive = env['technical_service.request.history.archive']
+    measure(env, '_cron_archive_history()', lambda: Archive._cron_archive_history(batch_size=rows))
+    measure(env, 'request form history window (20 rows)',
+            lambda: requests[0].x_history_ids[:20].read(['timestamp', 'event_type', 'user_id']))
+    measure(env, 'history report over both tiers (read_group)',
+            lambda: env['technical_service.request.history.report'].read_group(
+                [], ['__count'], ['event_type', 'is_archived'], lazy=False))
+
+
+def bench_department_scope(env, count=2000):
+    """
+    user-015: List refresh with the department scope (search_read + count).
+    The scope is a subquery of the request query.
+    """
+    print(f"\n[*] Department scope: {count} requests")
+    if env['maintenance.request'].search_count([]) < count:
+        create_requests(env, count)
+    Request = env['maintenance.request'].with_context(search_default_department=1)
+    measure(env, 'search_read (department scope)',
+            lambda: Request.search_read([], ['name', 'stage_id'], limit=80))
+    measure(env, 'search_count (department scope)', lambda: Request.search_count([]))
+    measure(env, 'read_group by stage (department scope)',
+            lambda: Request.read_group([], ['__count'], ['stage_id']))
+
+
+def bench_record_rules(env, count=200000):
+    """
+    user-016: List view of a senior technician over 200k requests.
+    Record rules filter on indexed columns (team users stored on the
+    team, stored stage code).
+    """
+    print(f"\n[*] Record rules: senior technician over {count} requests")
+    group = env.ref('technical_service_presentation.group_technical_senior_technician', raise_if_not_found=False)
+    user = group and group.users[:1]
+    if not user:
+        print("  ⚠️  No senior technician user found")
+        return
+    existing = env['maintenance.request'].search_count([])
+    if existing < count:
+        create_requests(env, count - existing)
+
+    Request = env['maintenance.request'].with_user(user)
+    measure(env, 'search_read 80 rows (list view)',
+            lambda: Request.search_read([], ['name', 'stage_id', 'technician_user_id'], limit=80))
+    measure(env, 'search_count (list pager)', lambda: Request.search_count([]))
+
+
+def bench_stage_transition(env, count=5000):
+    """
+    user-017: Bulk workflow transition of 5000 requests.
+    Stage and side fields are applied with one low-level write for the
+    recordset, stage change history is logged in bulk.
+    """
+    print(f"\n[*] Stage transition of {count} requests")
+    requests = create_requests(env, count)
+    measure(env, '_transition_to_stage (recordset)',
+            lambda: requests._transition_to_stage('on_hold', reason='Benchmark', is_auto=False))
+
+
+def bench_bulk_approve(env, count=1000):
+    """
+    user-018: Approve a backlog of 1000 requests from the list view.
+    Permissions are validated in one pass, transitions, history and
+    activity closing are applied in bulk.
+    """
+    print(f"\n[*] Bulk approval of {count} requests")
+    requests = create_requests(env, count)
+    requests._transition_to_stage('pending_approval', reason='Benchmark')
+    measure(env, 'action_approve (list selection)', lambda: requests.action_approve())
+
+
+def bench_api_intake(env, count=1000):
+    """
+    user-020: Intake API batch of 1000 requests, then the same batch again
+    (client retry: every payload is deduplicated on its idempotency key).
+    """
+    print(f"\n[*] Intake API batch of {count} requests")
+    Request = env['maintenance.request']
+    payloads = [{
+        'idempotency_key': f'benchmark-{i}',
+        'name': f'API Benchmark Request {i}',
+        'x_impact': 'medium',
+        'x_urgency': 'high',
+    } for i in range(count)]
+    measure(env, 'api_create_requests (new)', lambda: Request.api_create_requests(payloads))
+    measure(env, 'api_create_requests (retry)', lambda: Request.api_create_requests(payloads))
+
+
+def bench_checklist_templates(env, count=1000, items=10):
+    """
+    user-023: 1000 work orders created in one batch, each receiving the
+    items of a 10-line checklist template, then the progress of all of them.
+    """
+    print(f"\n[*] {count} work orders with a {items}-item checklist template")
+    env['technical_service.checklist.template'].create({
+        'name': 'Benchmark Template',
+        'x_work_type': 'repair',
+        'line_ids': [(0, 0, {'name': f'Benchmark Item {i}'}) for i in range(items)],
+    })
+    request = create_requests(env, 1)
+    work_orders = measure(env, 'work order create (templates)', lambda: env['technical_service.work_order'].create([{
+        'name': f'Benchmark Work Order {i}',
+        'x_request_id': request.id,
+        'x_work_type': 'repair',
+    } for i in range(count)]))
+    measure(env, 'checklist progress', lambda: work_orders.mapped('x_checklist_progress'))
+
+
+def bench_labor_ledger(env, count=1000, logs_per_order=5):
+    """
+    user-024: 5000 closed time logs rolled into the labor ledger (precommit
+    refresh of the dirty work orders), then a month of technician hours read
+    from the ledger.
+    """
+    print(f"\n[*] Labor ledger over {count * logs_per_order} time logs")
+    Ledger = env['technical_service.labor.ledger']
+    technician = env['hr.employee'].search([], limit=1)
+    request = create_requests(env, 1)
+    work_orders = env['technical_service.work_order'].with_context(skip_checklist_templates=True).create([{
+        'name': f'Benchmark Work Order {i}',
+        'x_request_id': request.id,
+        'x_technician_id': technician.id,
+    } for i in range(count)])
+    start = env.cr.now() - timedelta(days=30)
+    env['technical_service.work_order.timelog'].create([{
+        'work_order_id': work_order.id,
+        'technician_id': technician.id,
+        'start_time': start + timedelta(hours=7 * i),
+        'end_time': start + timedelta(hours=7 * i + 2),
+    } for work_order in work_orders for i in range(logs_per_order)])
+    measure(env, 'ledger refresh (precommit)', Ledger._refresh_dirty)
+    today = env.cr.now().date()
+    measure(env, 'technician hours (30 days)', lambda: Ledger._get_technician_hours(
+        technician.ids, today - timedelta(days=30), today,
+    ))
+
+
+BENCHMARKS = [
+    bench_mass_assign,
+    bench_permission_fields,
+    bench_sla_monitor,
+    bench_bulk_intake,
+    bench_team_workload,
+    bench_dispatch,
+    bench_stage_duration_backfill,
+    bench_dwell_percentiles,
+    bench_history_description,
+    bench_history_archive,
+    bench_department_scope,
+    bench_record_rules,
+    bench_stage_transition,
+    bench_bulk_approve,
+    bench_api_intake,
+    bench_checklist_templates,
+    bench_labor_ledger,
+]
+
+
+if 'env' in globals():
+    print("\n" + "=" * 60)
+    print("TECHNICAL SERVICE - PERFORMANS ÖLÇÜMLERİ")
+    print("=" * 60)
+
+    try:
+        for benchmark in BENCHMARKS:
+            benchmark(env)  # noqa: F821 - provided by odoo shell
+    finally:
+        env.cr.rollback()  # noqa: F821
+        print("\n✅ Ölçümler tamamlandı (transaction geri alındı)")
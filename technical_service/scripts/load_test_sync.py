@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Technical Service - Mobile Sync Load Test
+
+Simulates field technician devices syncing every minute against the sync
+endpoints (/technical_service/api/sync/pull and /push):
+    - each device pulls with its last cursor
+    - every few cycles it pushes a small batch of mutations (checklist
+      ticks and a time log) built from what it pulled
+
+Usage:
+    python3 load_test_sync.py --url http://localhost:8069 --api-key KEY [KEY ...]
+                              [--devices 1000] [--interval 60] [--duration 300]
+
+API keys belong to technician users; devices are spread over the given keys.
+Prints request rate, error count and latency percentiles per endpoint.
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+
+class Stats:
+    """Thread-safe latency / error collector"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = {}
+        self.errors = {}
+
+    def add(self, endpoint, seconds, ok):
+        with self.lock:
+            self.latencies.setdefault(endpoint, []).append(seconds)
+            if not ok:
+                self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+
+    def report(self, elapsed):
+        print("\n" + "=" * 60)
+        print(f"{'endpoint':<8} {'calls':>8} {'req/s':>8} {'errors':>7} {'p50':>8} {'p90':>8} {'p99':>8}")
+        for endpoint, values in sorted(self.latencies.items()):
+            values = sorted(values)
+
+            def pct(fraction):
+                return values[min(int(len(values) * fraction), len(values) - 1)] * 1000
+
+            print(f"{endpoint:<8} {len(values):>8} {len(values) / elapsed:>8.1f} "
+                  f"{self.errors.get(endpoint, 0):>7} {pct(0.5):>7.0f}ms {pct(0.9):>7.0f}ms {pct(0.99):>7.0f}ms")
+        print("=" * 60)
+
+
+class Device:
+    """One simulated mobile device"""
+
+    def __init__(self, url, api_key, stats):
+        self.url = url.rstrip('/')
+        self.api_key = api_key
+        self.stats = stats
+        self.cursor = None
+        self.checklist = {}   # line id -> (is_done, write_date)
+        self.work_orders = []
+        self.cycle = 0
+
+    def call(self, endpoint, payload):
+        body = json.dumps(payload).encode()
+        http_request = urllib.request.Request(
+            f"{self.url}/technical_service/api/sync/{endpoint}",
+            data=body,
+            headers={'Content-Type': 'application/json', 'Authorization': f'Bearer {self.api_key}'},
+            method='POST',
+        )
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(http_request, timeout=60) as response:
+                data = json.loads(response.read())
+            self.stats.add(endpoint, time.perf_counter() - start, True)
+            return data
+        except (urllib.error.URLError, ValueError, TimeoutError):
+            self.stats.add(endpoint, time.perf_counter() - start, False)
+            return None
+
+    def sync(self):
+        self.cycle += 1
+        data = self.call('pull', {'cursor': self.cursor})
+        if not data:
+            return
+        self.cursor = data['cursor']
+        self.work_orders = data['scope']
+        for line in data['records'].get('technical_service.work_order.checklist', []):
+            self.checklist[line['id']] = (line['is_done'], line['write_date'])
+        for line_id in data['deleted'].get('technical_service.work_order.checklist', []):
+            self.checklist.pop(line_id, None)
+
+        # Push a few offline changes every third cycle
+        if self.cycle % 3 or not self.work_orders:
+            return
+        now = datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+        mutations = []
+        for line_id, (is_done, write_date) in random.sample(
+                sorted(self.checklist.items()), min(3, len(self.checklist))):
+            mutations.append({
+                'id': str(uuid.uuid4()),
+                'type': 'checklist',
+                'checklist_id': line_id,
+                'is_done': not is_done,
+                'base_write_date': write_date,
+                'client_time': now,
+            })
+        mutations.append({
+            'id': str(uuid.uuid4()),
+            'type': 'timelog',
+            'work_order_id': random.choice(self.work_orders),
+            'uuid': str(uuid.uuid4()),
+            'start_time': now,
+            'end_time': now,
+            'work_description': 'Load test',
+            'client_time': now,
+        })
+        self.call('push', {'mutations': mutations})
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Mobile sync load test')
+    parser.add_argument('--url', default='http://localhost:8069')
+    parser.add_argument('--api-key', nargs='+', required=True, help='API keys of technician users')
+    parser.add_argument('--devices', type=int, default=1000)
+    parser.add_argument('--interval', type=float, default=60.0, help='Seconds between syncs of a device')
+    parser.add_argument('--duration', type=float, default=300.0, help='Test duration in seconds')
+    parser.add_argument('--workers', type=int, default=100, help='Concurrent HTTP connections')
+    args = parser.parse_args()
+
+    stats = Stats()
+    devices = [Device(args.url, args.api_key[i % len(args.api_key)], stats) for i in range(args.devices)]
+
+    print(f"[*] {args.devices} devices, one sync every {args.interval:.0f}s, {args.duration:.0f}s run")
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        while time.monotonic() - start < args.duration:
+            cycle_start = time.monotonic()
+            # Spread the devices' syncs evenly over the interval
+            step = args.interval / len(devices)
+            for index, device in enumerate(devices):
+                delay = cycle_start + index * step - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                executor.submit(device.sync)
+            remaining = args.interval - (time.monotonic() - cycle_start)
+            if remaining > 0:
+                time.sleep(remaining)
+
+    stats.report(time.monotonic() - start)
+
+
+if __name__ == '__main__':
+    main()
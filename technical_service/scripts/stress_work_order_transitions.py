@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Technical Service - İş Emri Durum Geçişleri Eşzamanlılık Testi
+Fires concurrent start/pause/resume/complete transitions on a small pool of
+work orders from several workers (one database cursor each, like parallel
+mobile taps) and asserts the time log invariants:
+
+    - at most one open time log (end_time empty) per work order
+    - in progress work orders have exactly one open time log, the other
+      statuses none
+
+Odoo shell içinden çalıştırılır (env değişkeni shell tarafından sağlanır):
+
+    odoo-bin shell -c /etc/odoo/odoo.conf -d odoo_tech_service \\
+        < technical_service/scripts/stress_work_order_transitions.py
+
+Test verisi commit edilir ve sonunda silinir.
+"""
+
+import random
+import threading
+import time
+from collections import Counter
+
+from psycopg2 import IntegrityError, errors
+
+from odoo import api, SUPERUSER_ID
+from odoo.exceptions import UserError
+
+WORK_ORDERS = 20
+WORKERS = 8
+TRANSITIONS_PER_WORKER = 200
+# Framework-style retries of a call that hit a locked/concurrently updated row
+MAX_RETRIES = 5
+
+ACTIONS = [
+    ('action_start_work', 3),
+    ('action_pause_work', 4),
+    ('action_resume_work', 4),
+    ('action_complete_work', 1),
+]
+
+
+def setup(env):
+    """Create the work order pool (committed, so every worker sees it)"""
+    technician = env['hr.employee'].search([], limit=1)
+    team = env['maintenance.team'].search([], limit=1)
+    request = env['maintenance.request'].create({
+        'name': 'Stress Test Request',
+        'maintenance_team_id': team.id,
+    })
+    work_orders = env['technical_service.work_order'].with_context(skip_checklist_templates=True).create([{
+        'name': f'Stress Test Work Order {i}',
+        'x_request_id': request.id,
+        'x_technician_id': technician.id,
+    } for i in range(WORK_ORDERS)])
+    env.cr.commit()
+    return request, work_orders.ids
+
+
+def worker(registry, work_order_ids, stats, lock):
+    """Fire random transitions, retrying concurrency errors like the RPC layer"""
+    methods, weights = zip(*ACTIONS)
+    for _i in range(TRANSITIONS_PER_WORKER):
+        work_order_id = random.choice(work_order_ids)
+        method = random.choices(methods, weights)[0]
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                with registry.cursor() as cr:
+                    env = api.Environment(cr, SUPERUSER_ID, {})
+                    getattr(env['technical_service.work_order'].browse(work_order_id), method)()
+                outcome = 'applied'
+            except UserError:
+                outcome = 'rejected'
+            except (errors.LockNotAvailable, errors.SerializationFailure, errors.DeadlockDetected):
+                if attempt < MAX_RETRIES:
+                    time.sleep(random.uniform(0.0, 0.05 * 2 ** attempt))
+                    continue
+                outcome = 'gave_up'
+            except IntegrityError:
+                # Only the unique open time log index can raise here
+                outcome = 'index_violation'
+            with lock:
+                stats[outcome] += 1
+                stats['retries'] += attempt
+            break
+
+
+def check(env, work_order_ids):
+    """Return the invariant violations (empty list: all good)"""
+    env.cr.execute("""
+        SELECT wo.id, wo.x_work_status, COUNT(log.id)
+          FROM technical_service_work_order wo
+     LEFT JOIN technical_service_work_order_timelog log
+            ON log.work_order_id = wo.id AND log.end_time IS NULL
+         WHERE wo.id IN %s
+      GROUP BY wo.id, wo.x_work_status
+    """, [tuple(work_order_ids)])
+    violations = []
+    for work_order_id, status, open_logs in env.cr.fetchall():
+        expected = 1 if status == 'in_progress' else 0
+        if open_logs != expected:
+            violations.append(f"work order {work_order_id} ({status}): {open_logs} open time logs")
+    return violations
+
+
+def cleanup(env, request, work_order_ids):
+    env['technical_service.work_order'].browse(work_order_ids).unlink()
+    request.unlink()
+    env.cr.commit()
+
+
+if 'env' in globals():
+    print("\n" + "=" * 60)
+    print("TECHNICAL SERVICE - İŞ EMRİ EŞZAMANLILIK TESTİ")
+    print("=" * 60)
+
+    request, work_order_ids = setup(env)  # noqa: F821 - provided by odoo shell
+    stats, lock = Counter(), threading.Lock()
+    threads = [
+        threading.Thread(target=worker, args=(env.registry, work_order_ids, stats, lock))  # noqa: F821
+        for _i in range(WORKERS)
+    ]
+    start = time.perf_counter()
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        env.invalidate_all()  # noqa: F821
+        violations = check(env, work_order_ids)  # noqa: F821
+        print(f"  {WORKERS} workers x {TRANSITIONS_PER_WORKER} transitions on {WORK_ORDERS} work orders"
+              f" in {elapsed:.1f} s")
+        for outcome in ('applied', 'rejected', 'retries', 'gave_up', 'index_violation'):
+            print(f"  {outcome:<20} {stats[outcome]:8d}")
+        for violation in violations:
+            print(f"  ❌ {violation}")
+        assert not violations, f"{len(violations)} work orders break the open time log invariant"
+        assert not stats['index_violation'], "transitions reached the unique open time log index"
+        print("\n✅ Her iş emrinde en fazla bir açık zaman kaydı var")
+    finally:
+        cleanup(env, request, work_order_ids)  # noqa: F821
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+
+from odoo.exceptions import UserError
+from odoo.tests import TransactionCase, new_test_user, tagged
+
+
+@tagged('post_install', '-at_install')
+class TestSyncPush(TransactionCase):
+    """Each pushed mutation keeps its history with its own savepoint"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.technician = new_test_user(
+            cls.env, login='sync_technician',
+            groups='base.group_user,maintenance.group_equipment_manager',
+        )
+        employee = cls.env['hr.employee'].create({
+            'name': 'Sync Technician',
+            'user_id': cls.technician.id,
+        })
+        team = cls.env['maintenance.team'].search([], limit=1)
+        cls.request = cls.env['maintenance.request'].with_user(cls.technician).create({
+            'name': 'Sync Request',
+            'maintenance_team_id': team.id,
+        })
+        cls.work_order = cls.env['technical_service.work_order'].with_context(
+            skip_checklist_templates=True,
+        ).create({
+            'name': 'Sync Work Order',
+            'x_request_id': cls.request.id,
+            'x_technician_id': employee.id,
+        })
+        cls.Sync = cls.env['technical_service.sync'].with_user(cls.technician)
+
+    def _history_state(self):
+        self.env.invalidate_all()
+        return {
+            'history': self.env['technical_service.request.history'].search_count(
+                [('request_id', '=', self.request.id)]),
+            'intervals': self.env['technical_service.stage.interval'].search_count(
+                [('request_id', '=', self.request.id)]),
+            'stage': self.request.x_stage_code,
+            'entered_at': self.request.x_stage_entered_at,
+            'status': self.work_order.x_work_status,
+        }
+
+    def test_failed_mutation_drops_its_history(self):
+        History = self.env.registry['technical_service.request.history']
+        log_work_order_event = History.log_work_order_event
+
+        def log_then_fail(self, *args, **kwargs):
+            log_work_order_event(self, *args, **kwargs)
+            raise UserError('Rejected after logging')
+
+        before = self._history_state()
+        self.patch(History, 'log_work_order_event', log_then_fail)
+        results = self.Sync.push([{'id': 'm1', 'type': 'start', 'work_order_id': self.work_order.id}])
+
+        self.assertEqual(results[0]['status'], 'error')
+        self.assertEqual(self._history_state(), before)
+
+    def test_applied_mutation_logs_its_history(self):
+        before = self._history_state()
+        results = self.Sync.push([{'id': 'm1', 'type': 'start', 'work_order_id': self.work_order.id}])
+
+        self.assertEqual(results[0]['status'], 'applied')
+        after = self._history_state()
+        self.assertEqual(after['status'], 'in_progress')
+        self.assertEqual(after['stage'], 'in_progress')
+        self.assertGreater(after['history'], before['history'])
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+
+"""
+Property tests of the SLA business calendar against naive minute-stepping
+references. The calendar module is pure Python (pytz only), so these run
+with plain pytest, without an Odoo server:
+
+    python -m pytest technical_service/tests/unit
+"""
+
+import importlib.util
+import random
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import pytest
+import pytz
+
+# Load the module file directly: importing the addon package needs Odoo
+_spec = importlib.util.spec_from_file_location(
+    'technical_service_sla_calendar',
+    Path(__file__).resolve().parents[2] / 'models' / 'technical_service_sla_calendar.py',
+)
+sla_calendar = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(sla_calendar)
+SLABusinessCalendar = sla_calendar.SLABusinessCalendar
+
+MINUTE = timedelta(minutes=1)
+
+# UTC, no DST, northern and southern hemisphere DST (2am/3am transitions)
+TIMEZONES = ['UTC', 'Europe/Istanbul', 'America/New_York', 'Europe/Berlin', 'Australia/Sydney']
+
+# Periods containing DST transitions of the zones above
+PERIODS = [date(2025, 3, 1), date(2025, 3, 25), date(2025, 10, 20), date(2025, 4, 1), date(2024, 12, 20)]
+
+
+def _is_business_local(local, hours_start, hours_end, include_weekends, holidays):
+    """Business minute test on a naive local datetime, straight from the definition"""
+    if not include_weekends and local.weekday() >= 5:
+        return False
+    if local.date() in holidays:
+        return False
+    minutes = local.hour * 60 + local.minute
+    return hours_start * 60 <= minutes < hours_end * 60
+
+
+def reference_local(start_utc, hours, hours_start, hours_end, include_weekends, holidays, tz):
+    """
+    Step local wall-clock minutes from start_utc until `hours` business hours
+    were consumed (the calendar's documented semantics: business hours are
+    counted on the policy's local clock)
+    """
+    zone = pytz.timezone(tz)
+    current = pytz.utc.localize(start_utc).astimezone(zone).replace(tzinfo=None)
+    remaining = int(round(hours * 60))
+    while remaining:
+        if _is_business_local(current, hours_start, hours_end, include_weekends, holidays):
+            remaining -= 1
+        current += MINUTE
+    return zone.localize(current, is_dst=False).astimezone(pytz.utc).replace(tzinfo=None)
+
+
+def reference_utc(start_utc, hours, hours_start, hours_end, include_weekends, holidays, tz):
+    """Step real (UTC) minutes: elapsed time, independent of the local clock"""
+    zone = pytz.timezone(tz)
+    current = start_utc
+    remaining = int(round(hours * 60))
+    while remaining:
+        local = pytz.utc.localize(current).astimezone(zone).replace(tzinfo=None)
+        if _is_business_local(local, hours_start, hours_end, include_weekends, holidays):
+            remaining -= 1
+        current += MINUTE
+    return current
+
+
+def _random_case(rng, min_hours_start=0.0):
+    """Random policy, holidays and start around one of the DST periods"""
+    hours_start = rng.choice([min_hours_start, min_hours_start, rng.randrange(int(min_hours_start * 4), 48) / 4])
+    hours_end = rng.choice([24.0, 24.0, rng.randrange(int(hours_start * 4) + 1, 97) / 4])
+    include_weekends = rng.random() < 0.4
+    period = rng.choice(PERIODS)
+    holidays = {period + timedelta(days=rng.randrange(-3, 25)) for _i in range(rng.randrange(0, 8))}
+    start_utc = datetime.combine(period, datetime.min.time()) + timedelta(
+        days=rng.randrange(0, 10), minutes=rng.randrange(0, 24 * 60),
+    )
+    hours = rng.randrange(1, 4 * 40) / 4
+    return hours_start, hours_end, include_weekends, holidays, start_utc, hours
+
+
+@pytest.mark.parametrize('tz', TIMEZONES)
+def test_add_hours_matches_local_minute_stepping(tz):
+    rng = random.Random(f'local-{tz}')
+    for _i in range(60):
+        hours_start, hours_end, include_weekends, holidays, start_utc, hours = _random_case(rng)
+        calendar = SLABusinessCalendar(hours_start, hours_end, include_weekends, holidays, tz)
+        expected = reference_local(start_utc, hours, hours_start, hours_end, include_weekends, holidays, tz)
+        assert calendar.add_hours(start_utc, hours) == expected, (
+            tz, hours_start, hours_end, include_weekends, sorted(holidays), start_utc, hours,
+        )
+
+
+@pytest.mark.parametrize('tz', TIMEZONES)
+def test_add_hours_matches_elapsed_time_outside_transitions(tz):
+    """Business hours clear of the 2am/3am DST shifts: local and real time agree"""
+    rng = random.Random(f'utc-{tz}')
+    for _i in range(60):
+        hours_start, hours_end, include_weekends, holidays, start_utc, hours = _random_case(rng, 4.0)
+        calendar = SLABusinessCalendar(hours_start, hours_end, include_weekends, holidays, tz)
+        expected = reference_utc(start_utc, hours, hours_start, hours_end, include_weekends, holidays, tz)
+        assert calendar.add_hours(start_utc, hours) == expected, (
+            tz, hours_start, hours_end, include_weekends, sorted(holidays), start_utc, hours,
+        )
+
+
+@pytest.mark.parametrize('tz', TIMEZONES)
+def test_is_business_time_matches_definition(tz):
+    rng = random.Random(f'is-business-{tz}')
+    zone = pytz.timezone(tz)
+    for _i in range(300):
+        hours_start, hours_end, include_weekends, holidays, start_utc, _hours = _random_case(rng)
+        calendar = SLABusinessCalendar(hours_start, hours_end, include_weekends, holidays, tz)
+        local = pytz.utc.localize(start_utc).astimezone(zone).replace(tzinfo=None)
+        assert calendar.is_business_time(start_utc) == _is_business_local(
+            local, hours_start, hours_end, include_weekends, holidays,
+        )
+
+
+def test_deadline_at_day_end_before_holiday():
+    """A deadline at 24:00 stays on its day when the next day is a holiday"""
+    holidays = [date(2025, 5, 23), date(2025, 5, 25), date(2025, 5, 26), date(2025, 5, 28)]
+    calendar = SLABusinessCalendar(0.0, 24.0, False, holidays, 'America/New_York')
+    assert calendar.add_hours(datetime(2025, 5, 24, 7, 15), 24) == datetime(2025, 5, 28, 4, 0)
+
+
+def test_empty_calendar():
+    calendar = SLABusinessCalendar(9.0, 9.0, False, (), 'UTC')
+    assert calendar.is_empty
+    assert calendar.add_hours(datetime(2025, 1, 6, 10, 0), 4) is False
+    assert not calendar.is_business_time(datetime(2025, 1, 6, 10, 0))
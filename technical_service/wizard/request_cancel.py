@@ -20,6 +20,13 @@ class RequestCancelWizard(models.TransientModel):
         default=lambda self: self.env.context.get('active_id')
     )
 
+    request_ids = fields.Many2many(
+        'maintenance.request',
+        string='Service Requests',
+        readonly=True,
+        help='Requests selected for a bulk action (list view)'
+    )
+
     cancel_reason = fields.Text(
         string='Cancellation Reason',
         required=True,
@@ -54,29 +61,35 @@ class RequestCancelWizard(models.TransientModel):
         Task 07 - Phase 4B: Stage-based cancel approval
         - Owner can cancel directly → 'İptal Edildi'
         - Non-owner (Dispatcher/Team Leader) must request approval → 'Onayda' stage
+        Bulk: both paths are applied to the selection, requests without
+        permission are skipped and reported
         """
         self.ensure_one()
 
-        if not self.request_id:
+        requests = self.request_ids or self.request_id
+        if not requests:
             raise UserError(_('No request specified'))
 
-        request = self.request_id
-
-        # Check permission
-        if not request.x_can_cancel:
-            raise UserError(_(
-                'You do not have permission to cancel this request.\n'
-                'Requests can only be cancelled when in "Yeni" (New) or "Ekip Atandı" (Team Assigned) stages.'
-            ))
+        # Check permission (whole selection in one pass)
+        requests, errors = requests._check_workflow_action('cancel')
 
+        # Owners cancel immediately, other roles need the owner's approval
         current_user = self.env.user
-        is_owner = request.create_uid == current_user
+        owned = requests.filtered(lambda r: r.create_uid == current_user)
+        to_approve = requests - owned
 
-        # If requires approval and user is not owner
-        if self.requires_approval and not is_owner:
+        History = self.env['technical_service.request.history']
+        with History.buffered():
             # PHASE 4B: Send to "Onayda" stage for owner approval
-            self._request_cancel_approval()
+            self._request_cancel_approval(to_approve)
+            self._execute_cancel(owned)
+
+        if len(self.request_ids) > 1:
+            return self.request_ids._workflow_action_notification(
+                _('Cancel Requests'), requests, errors, close=True
+            )
 
+        if to_approve:
             # Show notification to user
             message = _('Cancellation request sent. Request moved to "Onayda" stage for owner approval.')
             return {
@@ -90,82 +103,80 @@ class RequestCancelWizard(models.TransientModel):
                     'next': {'type': 'ir.actions.act_window_close'},
                 }
             }
-        else:
-            # Owner cancelling - cancel immediately
-            self._execute_cancel()
-            return {'type': 'ir.actions.act_window_close'}
+        return {'type': 'ir.actions.act_window_close'}
 
-    def _request_cancel_approval(self):
+    def _request_cancel_approval(self, requests):
         """
         Send cancellation approval request to owner
         Task 07 - Phase 4B: Move request to "Onayda" stage
         """
-        request = self.request_id
-
-        # Store current stage to return to if rejected
-        request.write({'x_previous_stage_id': request.stage_id.id})
-
-        # Mark as pending cancellation
-        request.write({
-            'x_pending_cancel': True,
-            'x_cancel_reason': self.cancel_reason,
-        })
-
-        # Transition to 'Onayda' stage
-        request._transition_to_stage(
-            'Onayda',
-            reason=_('Cancellation requested by %s', self.env.user.name),
-            is_auto=False
-        )
+        if not requests:
+            return
+
+        # Transition to 'Onayda' stage, storing the current stage to return to
+        # if rejected and marking the requests as pending cancellation
+        for previous_stage, stage_requests in requests.grouped('stage_id').items():
+            stage_requests._transition_to_stage(
+                'pending_approval',
+                reason=_('Cancellation requested by %s', self.env.user.name),
+                is_auto=False,
+                vals={
+                    'x_previous_stage_id': previous_stage.id,
+                    'x_pending_cancel': True,
+                    'x_cancel_reason': self.cancel_reason,
+                }
+            )
 
         # Post to chatter
-        request.message_post(
-            body=_('⚠️ Cancellation requested by %s<br/>'
-                   'Reason: %s<br/>'
-                   'Request moved to "Onayda" stage. Owner must approve or reject.',
-                   self.env.user.name, self.cancel_reason),
-            message_type='notification',
-            subtype_xmlid='mail.mt_note',
-            partner_ids=[request.create_uid.partner_id.id]
-        )
+        for request in requests:
+            request.message_post(
+                body=_('⚠️ Cancellation requested by %s<br/>'
+                       'Reason: %s<br/>'
+                       'Request moved to "Onayda" stage. Owner must approve or reject.',
+                       self.env.user.name, self.cancel_reason),
+                message_type='notification',
+                subtype_xmlid='mail.mt_note',
+                partner_ids=[request.create_uid.partner_id.id]
+            )
 
         # Log in history
-        self.env['technical_service.request.history'].create({
+        note = _('Cancellation requested by %s. Waiting for owner approval in "Onayda" stage.',
+                 self.env.user.name)
+        self.env['technical_service.request.history'].log_events_bulk([{
             'request_id': request.id,
             'event_type': 'comment',
-            'note': _('Cancellation requested by %s. Waiting for owner approval in "Onayda" stage.',
-                      self.env.user.name),
+            'note': note,
             'is_automatic': False,
-        })
+        } for request in requests])
 
-    def _execute_cancel(self):
+    def _execute_cancel(self, requests):
         """Execute the cancellation"""
-        request = self.request_id
+        if not requests:
+            return
+        History = self.env['technical_service.request.history']
 
         # Transition to 'İptal Edildi'
-        request._transition_to_stage(
-            'İptal Edildi',
+        requests._transition_to_stage(
+            'cancelled',
             reason=self.cancel_reason,
             is_auto=False
         )
 
         # Cancel all pending work orders
-        pending_wos = request.x_work_order_ids.filtered(
+        requests.x_work_order_ids.filtered(
             lambda wo: wo.x_work_status in ['pending', 'in_progress', 'paused']
-        )
-        for wo in pending_wos:
-            wo.write({'x_work_status': 'cancelled'})
+        ).write({'x_work_status': 'cancelled'})
 
         # Log cancellation
-        self.env['technical_service.request.history'].log_approval(
-            request=request,
-            status='cancelled',
-            reason=self.cancel_reason
-        )
+        History.log_events_bulk([
+            History._prepare_approval_vals(request, 'cancelled', reason=self.cancel_reason)
+            for request in requests
+        ])
 
         # Post to chatter
-        request.message_post(
-            body=_('Request cancelled by %s<br/>Reason: %s', self.env.user.name, self.cancel_reason),
-            message_type='notification',
-            subtype_xmlid='mail.mt_note'
-        )
+        for request in requests:
+            request.message_post(
+                body=_('Request cancelled by %s<br/>Reason: %s', self.env.user.name, self.cancel_reason),
+                message_type='notification',
+                subtype_xmlid='mail.mt_note'
+            )
@@ -19,6 +19,13 @@ class RequestPutOnHoldWizard(models.TransientModel):
         default=lambda self: self.env.context.get('active_id')
     )
 
+    request_ids = fields.Many2many(
+        'maintenance.request',
+        string='Service Requests',
+        readonly=True,
+        help='Requests selected for a bulk action (list view)'
+    )
+
     reason = fields.Text(
         string='Reason for Hold',
         required=True,
@@ -32,46 +39,48 @@ class RequestPutOnHoldWizard(models.TransientModel):
 
     def action_confirm_hold(self):
         """
-        Confirm putting the request on hold
+        Confirm putting the request(s) on hold
         Transitions to 'Beklemede' stage
         TASK 07 - PHASE 4C: Added permission check
+        Bulk: requests without permission are skipped and reported
         """
         self.ensure_one()
 
-        if not self.request_id:
+        requests = self.request_ids or self.request_id
+        if not requests:
             raise UserError(_('No request specified'))
 
-        request = self.request_id
-
-        # PHASE 4C: Permission check
-        if not request.x_can_put_on_hold:
-            raise UserError(_(
-                'You do not have permission to put this request on hold.\n'
-                'Only Team Leaders, Senior Technicians, and Technicians can perform this action.'
-            ))
+        # PHASE 4C: Permission check (whole selection in one pass)
+        requests, errors = requests._check_workflow_action('put_on_hold')
 
-        # Transition to 'Beklemede'
-        request._transition_to_stage(
-            'Beklemede',
-            reason=self.reason,
-            is_auto=False
-        )
+        History = self.env['technical_service.request.history']
+        with History.buffered():
+            # Transition to 'Beklemede'
+            requests._transition_to_stage(
+                'on_hold',
+                reason=self.reason,
+                is_auto=False
+            )
 
-        # Log hold event
-        self.env['technical_service.request.history'].log_hold(
-            request=request,
-            reason=self.reason
-        )
+            # Log hold event
+            History.log_events_bulk([
+                History._prepare_hold_vals(request, self.reason) for request in requests
+            ])
 
         # Post to chatter
         message = _('Request put on hold.<br/>Reason: %s', self.reason)
         if self.expected_resume_date:
             message += _('<br/>Expected resume date: %s', self.expected_resume_date)
-        
-        request.message_post(
-            body=message,
-            message_type='notification',
-            subtype_xmlid='mail.mt_note'
-        )
 
+        for request in requests:
+            request.message_post(
+                body=message,
+                message_type='notification',
+                subtype_xmlid='mail.mt_note'
+            )
+
+        if len(self.request_ids) > 1:
+            return self.request_ids._workflow_action_notification(
+                _('Put On Hold'), requests, errors, close=True
+            )
         return {'type': 'ir.actions.act_window_close'}
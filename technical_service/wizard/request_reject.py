@@ -20,6 +20,19 @@ class RequestRejectWizard(models.TransientModel):
         default=lambda self: self.env.context.get('active_id')
     )
 
+    request_ids = fields.Many2many(
+        'maintenance.request',
+        string='Service Requests',
+        readonly=True,
+        help='Requests selected for a bulk action (list view)'
+    )
+
+    is_bulk = fields.Boolean(
+        string='Bulk Rejection',
+        compute='_compute_is_bulk',
+        help='True if several requests are rejected at once'
+    )
+
     rejection_reason = fields.Text(
         string='Rejection Reason',
         required=True,
@@ -56,10 +69,16 @@ class RequestRejectWizard(models.TransientModel):
         for wizard in self:
             wizard.is_cancel_rejection = wizard.request_id.x_pending_cancel if wizard.request_id else False
 
-    @api.onchange('is_cancel_rejection')
+    @api.depends('request_ids')
+    def _compute_is_bulk(self):
+        """Several requests: new request fields are optional (copied from each request)"""
+        for wizard in self:
+            wizard.is_bulk = len(wizard.request_ids) > 1
+
+    @api.onchange('is_cancel_rejection', 'is_bulk')
     def _onchange_is_cancel_rejection(self):
-        """Make new request fields required only for completion rejection"""
-        if not self.is_cancel_rejection:
+        """Make new request fields required only for (single) completion rejection"""
+        if not self.is_cancel_rejection and not self.is_bulk:
             # Completion rejection - new request fields required
             self._fields['new_request_name'].required = True
             self._fields['new_request_description'].required = True
@@ -74,27 +93,69 @@ class RequestRejectWizard(models.TransientModel):
         Task 07 - Phase 3D & Phase 4B
         - If x_pending_cancel=True: Reject cancel request → return to previous stage
         - Otherwise: Reject completion → create new request and mark as 'Reddedildi'
+        Bulk: both paths are applied to the selection, requests that cannot be
+        rejected are skipped and reported
         """
         self.ensure_one()
 
-        if not self.request_id:
+        requests = self.request_ids or self.request_id
+        if not requests:
             raise UserError(_('No request specified'))
 
-        request = self.request_id
-
         # Check permission (should be department manager or CTO)
-        if not request.x_can_reject:
-            raise UserError(_('You do not have permission to reject this request'))
-
-        # Phase 4B: Check if this is a cancel rejection
-        if request.x_pending_cancel:
-            # CANCEL REJECTION: Return to previous stage
-            return self._reject_cancel_request()
-
-        # 1. Create new request with corrected information
-        new_request_vals = {
-            'name': self.new_request_name,
-            'description': self.new_request_description,
+        requests, errors = requests._check_workflow_action('reject')
+
+        # Phase 4B: Cancel rejections return to the stage stored when cancel was requested
+        cancel_requests = requests.filtered('x_pending_cancel')
+        missing_stage = cancel_requests.filtered(lambda r: not r.x_previous_stage_id)
+        if missing_stage:
+            message = _('Cannot reject: Previous stage information is missing')
+            if not self.is_bulk:
+                raise UserError(message)
+            errors.update(dict.fromkeys(missing_stage.ids, message))
+            cancel_requests -= missing_stage
+            requests -= missing_stage
+        complete_requests = requests - cancel_requests
+
+        History = self.env['technical_service.request.history']
+        with History.buffered():
+            self._reject_cancel_requests(cancel_requests)
+            new_requests = self._reject_completed_requests(complete_requests)
+
+        if self.is_bulk:
+            return self.request_ids._workflow_action_notification(
+                _('Reject Requests'), requests, errors, close=True
+            )
+
+        if not new_requests:
+            # Close wizard
+            return {'type': 'ir.actions.act_window_close'}
+
+        # Return action to open new request
+        return {
+            'type': 'ir.actions.act_window',
+            'name': _('New Request Created'),
+            'res_model': 'maintenance.request',
+            'res_id': new_requests.id,
+            'view_mode': 'form',
+            'target': 'current',
+        }
+
+    def _reject_completed_requests(self, requests):
+        """
+        Reject completions: create the corrected requests and mark the
+        originals as 'Reddedildi'
+        In bulk mode, empty new request fields are copied from each rejected request.
+        Returns: new requests (same order as `requests`)
+        """
+        Request = self.env['maintenance.request']
+        if not requests:
+            return Request
+
+        # 1. Create new requests with corrected information
+        new_requests = Request.create([{
+            'name': self.new_request_name or request.name,
+            'description': self.new_request_description or request.description,
             'maintenance_team_id': request.maintenance_team_id.id,
             'x_service_category': request.x_service_category,
             'x_it_category': request.x_it_category,
@@ -106,113 +167,107 @@ class RequestRejectWizard(models.TransientModel):
             'x_impact': request.x_impact,
             'x_urgency': request.x_urgency,
             'employee_id': request.create_uid.employee_id.id if request.create_uid.employee_id else False,
-        }
-
-        new_request = self.env['maintenance.request'].create(new_request_vals)
+        } for request in requests])
+        new_by_request = dict(zip(requests.ids, new_requests))
 
         # 2. Copy attachments if requested
         if self.copy_attachments:
             attachments = self.env['ir.attachment'].search([
                 ('res_model', '=', 'maintenance.request'),
-                ('res_id', '=', request.id)
+                ('res_id', 'in', requests.ids)
             ])
             for attachment in attachments:
-                attachment.copy({'res_id': new_request.id})
+                attachment.copy({'res_id': new_by_request[attachment.res_id].id})
 
-        # 3. Transition original request to 'Reddedildi'
-        request._transition_to_stage(
-            'Reddedildi',
+        # 3. Transition original requests to 'Reddedildi'
+        requests._transition_to_stage(
+            'rejected',
             reason=self.rejection_reason,
             is_auto=False
         )
 
         # 4. Log rejection
-        self.env['technical_service.request.history'].log_approval(
-            request=request,
-            status='rejected',
-            reason=self.rejection_reason
-        )
+        History = self.env['technical_service.request.history']
+        History.log_events_bulk([
+            History._prepare_approval_vals(request, 'rejected', reason=self.rejection_reason)
+            for request in requests
+        ])
 
         # 5. Post to both requests' chatter
-        request.message_post(
-            body=_('Request rejected.<br/>Reason: %s<br/>New request created: %s (#%s)',
-                   self.rejection_reason, new_request.name, new_request.x_request_number),
-            message_type='notification',
-            subtype_xmlid='mail.mt_note'
-        )
+        for request in requests:
+            new_request = new_by_request[request.id]
+            request.message_post(
+                body=_('Request rejected.<br/>Reason: %s<br/>New request created: %s (#%s)',
+                       self.rejection_reason, new_request.name, new_request.x_request_number),
+                message_type='notification',
+                subtype_xmlid='mail.mt_note'
+            )
 
-        new_request.message_post(
-            body=_('This request was created to replace rejected request: %s (#%s)<br/>Original rejection reason: %s',
-                   request.name, request.x_request_number, self.rejection_reason),
-            message_type='notification',
-            subtype_xmlid='mail.mt_note'
-        )
+            new_request.message_post(
+                body=_('This request was created to replace rejected request: %s (#%s)<br/>Original rejection reason: %s',
+                       request.name, request.x_request_number, self.rejection_reason),
+                message_type='notification',
+                subtype_xmlid='mail.mt_note'
+            )
 
-        # 6. Return action to open new request
-        return {
-            'type': 'ir.actions.act_window',
-            'name': _('New Request Created'),
-            'res_model': 'maintenance.request',
-            'res_id': new_request.id,
-            'view_mode': 'form',
-            'target': 'current',
-        }
+        return new_requests
 
-    def _reject_cancel_request(self):
+    def _reject_cancel_requests(self, requests):
         """
-        Reject a cancel request
+        Reject cancel requests
         Task 07 - Phase 4B
-        Return the request to its previous stage before cancellation was requested
+        Return the requests to their previous stage before cancellation was requested
         """
-        request = self.request_id
+        if not requests:
+            return
 
         # Get the previous stage (stored when cancel was requested)
-        if not request.x_previous_stage_id:
-            raise UserError(_('Cannot reject: Previous stage information is missing'))
+        previous_stages = {request.id: request.x_previous_stage_id for request in requests}
 
-        # Transition back to previous stage
-        request.write({'stage_id': request.x_previous_stage_id.id})
+        # Transition back to previous stage and clear cancel tracking fields
+        for previous_stage, stage_requests in requests.grouped('x_previous_stage_id').items():
+            stage_requests._apply_stage(
+                previous_stage,
+                reason=_('Cancel request rejected'),
+                is_auto=False,
+                vals={
+                    'x_pending_cancel': False,
+                    'x_cancel_reason': False,
+                    'x_previous_stage_id': False,
+                }
+            )
 
         # Log the rejection
-        self.env['technical_service.request.history'].create({
+        self.env['technical_service.request.history'].log_events_bulk([{
             'request_id': request.id,
             'event_type': 'comment',
             'note': _('Cancel request rejected by %s. Returned to "%s" stage.<br/>Reason: %s',
                       self.env.user.name,
-                      request.x_previous_stage_id.name,
+                      previous_stages[request.id].name,
                       self.rejection_reason),
             'is_automatic': False,
-        })
-
-        # Post to chatter
-        request.message_post(
-            body=_('❌ Cancel request rejected by %s<br/>'
-                   'Request returned to "%s" stage.<br/>'
-                   'Rejection reason: %s',
-                   self.env.user.name,
-                   request.x_previous_stage_id.name,
-                   self.rejection_reason),
-            message_type='notification',
-            subtype_xmlid='mail.mt_note'
-        )
+        } for request in requests])
 
-        # Notify the person who requested cancellation
-        if request.create_uid:
+        for request in requests:
+            # Post to chatter
             request.message_post(
-                body=_('Your cancellation request has been rejected.<br/>'
-                       'The service request will continue. Rejection reason: %s',
+                body=_('❌ Cancel request rejected by %s<br/>'
+                       'Request returned to "%s" stage.<br/>'
+                       'Rejection reason: %s',
+                       self.env.user.name,
+                       previous_stages[request.id].name,
                        self.rejection_reason),
                 message_type='notification',
-                subtype_xmlid='mail.mt_note',
-                partner_ids=[request.create_uid.partner_id.id]
+                subtype_xmlid='mail.mt_note'
             )
 
-        # Clear cancel tracking fields
-        request.write({
-            'x_pending_cancel': False,
-            'x_cancel_reason': False,
-            'x_previous_stage_id': False,
-        })
-
-        # Close wizard
-        return {'type': 'ir.actions.act_window_close'}
+            # Notify the person who requested cancellation
+            if request.create_uid:
+                request.message_post(
+                    body=_('Your cancellation request has been rejected.<br/>'
+                           'The service request will continue. Rejection reason: %s',
+                           self.rejection_reason),
+                    message_type='notification',
+                    subtype_xmlid='mail.mt_note',
+                    partner_ids=[request.create_uid.partner_id.id]
+                )